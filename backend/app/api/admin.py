@@ -0,0 +1,143 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import get_db, engine, replica_engine
+from ..core.db_pool import pool_metrics, replica_pool_metrics, pool_status
+from ..core.replica import read_router
+from ..core.profiler import sampling_profiler, folded, ProfileBusy
+from ..core.security import get_current_user
+from ..core.query_shapes import query_shapes, propose_indexes
+from ..models.user import User
+from ..models.farmer import Farmer
+from ..models.inventory import Inventory
+
+router = APIRouter()
+
+# Endpoint name used when recording shapes -> table its filters apply to
+SHAPED_TABLES = {
+    "farmers": Farmer.__table__,
+    "inventory": Inventory.__table__,
+}
+
+
+def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.role != "Admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access diagnostics"
+        )
+    return current_user
+
+
+@router.get("/query-shapes")
+async def get_query_shapes(
+    min_share: float = 0.01,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Filter combinations the list endpoints were called with (this worker,
+    since start) and the indexes that would serve the unindexed ones
+    """
+    inspector = inspect(db.get_bind())
+    report = {}
+    for endpoint in query_shapes.endpoints():
+        shapes = query_shapes.shapes(endpoint)
+        table = SHAPED_TABLES.get(endpoint)
+        existing = [index["column_names"] for index in inspector.get_indexes(table.name)] if table is not None else []
+        report[endpoint] = {
+            "requests": sum(shapes.values()),
+            "shapes": [
+                {"filters": sorted(shape), "count": count}
+                for shape, count in shapes.most_common()
+            ],
+            "proposed_indexes": propose_indexes(table, shapes, existing, min_share) if table is not None else []
+        }
+    return report
+
+
+@router.delete("/query-shapes", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_shapes(current_user: User = Depends(require_admin)):
+    """
+    Start counting filter shapes afresh (e.g. after adding indexes)
+    """
+    query_shapes.reset()
+
+
+@router.get("/db-pool")
+async def get_db_pool(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Connection pool gauges and counters for this worker, and how many
+    workers the server's max_connections allows at this pool size
+    """
+    max_connections = int(db.execute(text("SHOW max_connections")).scalar())
+    per_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    return {
+        "pool": pool_status(engine),
+        **pool_metrics.snapshot(),
+        "settings": {
+            "pre_ping": settings.DB_POOL_PRE_PING,
+            "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+        },
+        "server": {
+            "max_connections": max_connections,
+            "connections_per_worker": per_worker,
+            "max_workers": max_connections // per_worker,
+        },
+    }
+
+
+@router.get("/replica")
+async def get_replica_status(current_user: User = Depends(require_admin)):
+    """
+    Read replica lag, routing decisions and pool for this worker
+    """
+    status_report = read_router.status()
+    if replica_engine is not None:
+        status_report["pool"] = {"pool": pool_status(replica_engine), **replica_pool_metrics.snapshot()}
+    return status_report
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=settings.PROFILE_MAX_SECONDS),
+    route: Optional[str] = None,
+    requests: int = Query(1, ge=1, le=100),
+    interval_ms: float = Query(settings.PROFILE_INTERVAL_MS, ge=1, le=1000),
+    include_idle: bool = False,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Sample the stacks of the worker handling this call and return them as
+    folded stacks (flamegraph.pl / speedscope input). Without route, samples
+    every thread for the given seconds; with a route template (e.g.
+    /api/inventory/stats/dashboard), samples the next requests matching it,
+    waiting at most the given seconds
+    """
+    try:
+        if route:
+            stacks = await sampling_profiler.profile_requests(
+                route, requests, seconds, interval_ms / 1000, include_idle
+            )
+        else:
+            stacks = await sampling_profiler.profile_for(seconds, interval_ms / 1000, include_idle)
+    except ProfileBusy:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already running on this worker"
+        )
+
+    filename = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded"
+    return PlainTextResponse(folded(stacks), headers={
+        "X-Profile-Samples": str(sampling_profiler.samples),
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    })
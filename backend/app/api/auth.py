@@ -7,7 +7,6 @@ from ..core.database import get_db
 from ..core.security import create_access_token, verify_password, get_password_hash, get_current_user
 from ..models.user import User
 from ..schemas.user import UserLogin, Token, UserCreate, UserResponse
-from ..crud import user as user_crud
 
 router = APIRouter()
 security = HTTPBearer()
@@ -1,12 +1,49 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import or_, and_, func, cast, Float
+from typing import Optional
 from ..core.database import get_db
 from ..core.security import get_current_user
+from ..core.pagination import encode_cursor, decode_cursor
 from ..models.user import User
+from ..models.message import Message, ChatGroupMember
+from ..schemas.message import MessageResponse, MessageListResponse, MessageSearchHit, MessageSearchResponse
 
 router = APIRouter()
 
 
+def restrict_to_member_groups(query, db: Session, current_user: User):
+    """
+    Limit a message query to groups the user belongs to (admins see all)
+    """
+    if current_user.role == "Admin":
+        return query
+    member_groups = db.query(ChatGroupMember.group_id).filter(
+        ChatGroupMember.user_id == current_user.user_id
+    )
+    return query.filter(Message.group_id.in_(member_groups))
+
+
+def paginate_messages(query, cursor: Optional[str], limit: int) -> MessageListResponse:
+    """
+    Newest-first keyset pagination on message_id
+    """
+    if cursor:
+        query = query.filter(Message.message_id < decode_cursor(cursor, id=int)["id"])
+
+    messages = query.order_by(Message.message_id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = encode_cursor({"id": messages[-1].message_id})
+
+    return MessageListResponse(
+        messages=[MessageResponse.from_orm(message) for message in messages],
+        next_cursor=next_cursor
+    )
+
+
 @router.get("/messages")
 async def get_messages(
     db: Session = Depends(get_db),
@@ -26,4 +63,110 @@ async def send_message(
     """
     Send message - placeholder endpoint
     """
-    return {"message": "Send message endpoint - to be implemented"}
\ No newline at end of file
+    return {"message": "Send message endpoint - to be implemented"}
+
+
+@router.get("/messages/search", response_model=MessageSearchResponse)
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text (web search syntax)"),
+    group_id: Optional[int] = Query(None, description="Filter by chat group"),
+    farmer_beneficiary_id: Optional[str] = Query(None, description="Filter by linked farmer"),
+    task_id: Optional[int] = Query(None, description="Filter by linked task"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Full-text search over message content, ranked by relevance
+    """
+    ts_query = func.websearch_to_tsquery('simple', q)
+    # ts_rank_cd returns real; compared with the cursor's double precision value it never
+    # equals itself, so ties at a page boundary would be skipped. Rank in double throughout.
+    rank = cast(func.ts_rank_cd(Message.search_vector, ts_query), Float(53))
+    headline = func.ts_headline(
+        'simple', Message.content, ts_query, 'MaxFragments=2, MaxWords=20, MinWords=5'
+    )
+
+    # The GIN index on search_vector serves the match
+    query = db.query(Message, rank.label("rank"), headline.label("headline")).filter(
+        Message.search_vector.op('@@')(ts_query),
+        Message.is_deleted == False
+    )
+
+    # Non-admins only see groups they belong to
+    query = restrict_to_member_groups(query, db, current_user)
+
+    # Apply filters
+    if group_id:
+        query = query.filter(Message.group_id == group_id)
+    if farmer_beneficiary_id:
+        query = query.filter(Message.farmer_beneficiary_id == farmer_beneficiary_id)
+    if task_id:
+        query = query.filter(Message.task_id == task_id)
+
+    # Keyset pagination on (rank, message_id)
+    if cursor:
+        position = decode_cursor(cursor, rank=(int, float), id=int)
+        query = query.filter(or_(
+            rank < position["rank"],
+            and_(rank == position["rank"], Message.message_id < position["id"])
+        ))
+
+    rows = query.order_by(rank.desc(), Message.message_id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_message, last_rank, _ = rows[-1]
+        next_cursor = encode_cursor({"rank": last_rank, "id": last_message.message_id})
+
+    return MessageSearchResponse(
+        messages=[
+            MessageSearchHit(**MessageResponse.from_orm(message).dict(), rank=message_rank, headline=message_headline)
+            for message, message_rank, message_headline in rows
+        ],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/messages/mentions/me", response_model=MessageListResponse)
+async def get_my_mentions(
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get messages mentioning the current user, newest first
+    """
+    # mentions @> ARRAY[user_id] is served by the GIN index on mentions
+    query = db.query(Message).filter(
+        Message.mentions.contains([current_user.user_id]),
+        Message.is_deleted == False
+    )
+    query = restrict_to_member_groups(query, db, current_user)
+    return paginate_messages(query, cursor, limit)
+
+
+@router.get("/messages/tagged/{tag}", response_model=MessageListResponse)
+async def get_messages_by_tag(
+    tag: str,
+    group_id: Optional[int] = Query(None, description="Filter by chat group"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get messages carrying a tag, newest first
+    """
+    # tags @> ARRAY[tag] is served by the GIN index on tags
+    query = db.query(Message).filter(
+        Message.tags.contains([tag]),
+        Message.is_deleted == False
+    )
+    if group_id:
+        query = query.filter(Message.group_id == group_id)
+    query = restrict_to_member_groups(query, db, current_user)
+    return paginate_messages(query, cursor, limit)
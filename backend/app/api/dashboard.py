@@ -1,17 +1,19 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from ..core.database import get_db
+from ..core.replica import get_read_db
 from ..core.security import get_current_user
 from ..models.user import User
 from ..models.farmer import Farmer
+from ..models.task import TaskStatus
+from ..services.tasks import get_task_count
 
 router = APIRouter()
 
 
 @router.get("/stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -33,10 +35,13 @@ async def get_dashboard_stats(
         func.date(Farmer.dispatch_date) == func.current_date()
     ).count()
     
+    # Maintained incrementally by task writes, so no COUNT over tasks
+    pending_tasks = get_task_count(db, TaskStatus.PENDING)
+    
     return {
         "totalFarmers": total_farmers,
         "completedInstallations": completed_installations,
         "pendingInstallations": pending_installations,
         "dispatchedToday": dispatched_today,
-        "pendingTasks": 0  # Placeholder until tasks are implemented
+        "pendingTasks": pending_tasks
     }
\ No newline at end of file
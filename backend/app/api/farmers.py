@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, func
 from typing import Optional, List
 import math
+from pathlib import Path
 
 from ..core.database import get_db
+from ..core.replica import get_read_db
 from ..core.security import get_current_user
+from ..core.responses import model_response
+from ..core.http_cache import make_etag, query_fingerprint, is_fresh, is_settled, not_modified, validator_headers
+from ..core.fieldsets import parse_fields, select_columns, sparse_model, sparse_list_model
+from ..core.query_shapes import query_shapes
 from ..models.user import User
 from ..models.farmer import Farmer
 from ..schemas.farmer import (
@@ -13,15 +19,22 @@ from ..schemas.farmer import (
     FarmerUpdate, 
     FarmerResponse, 
     FarmerListResponse,
-    FarmerFilter
+    FarmerFilter,
+    FarmerBulkStatusUpdate
 )
 from ..core.config import settings
+from ..services.task_generation import farmer_snapshot, generate_tasks_for_transitions, SNAPSHOT_FIELDS
+from ..services.task_scheduler import task_scheduler
+from ..services.sync import record_deletion
+from ..services import blob_store
+from ..services.images import IMAGE_EXTENSIONS, append_photo_ref, parse_photo_refs, generate_variants, variants_missing
 
 router = APIRouter()
 
 
 @router.get("/", response_model=FarmerListResponse)
 async def get_farmers(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="Page size"),
     scheme: Optional[str] = Query(None, description="Filter by scheme"),
@@ -34,12 +47,14 @@ async def get_farmers(
     icr_status: Optional[str] = Query(None, description="Filter by ICR status"),
     installer_user_id: Optional[int] = Query(None, description="Filter by installer"),
     search: Optional[str] = Query(None, description="Search in name, phone, beneficiary_id"),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. beneficiary_id,beneficiary_name"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get paginated list of farmers with filtering
     """
+    selected = parse_fields(fields, FarmerResponse, always=("beneficiary_id",))
     query = db.query(Farmer)
     
     # Apply filters
@@ -71,8 +86,40 @@ async def get_farmers(
         )
         query = query.filter(search_filter)
     
-    # Get total count
-    total = query.count()
+    # Count the filter combination so indexes follow real usage (GET /api/admin/query-shapes)
+    query_shapes.record("farmers", {
+        "scheme": scheme,
+        "circle_name": circle_name,
+        "taluka_name": taluka_name,
+        "village_name": village_name,
+        "jsr_status": jsr_status,
+        "dispatch_status": dispatch_status,
+        "installation_status": installation_status,
+        "icr_status": icr_status,
+        "installer_user_id": installer_user_id,
+        "search": search
+    })
+    
+    # Total and newest change in one aggregate; together with the query string
+    # they validate the page, so an unchanged list is a 304 before any row is read.
+    # While the newest change is recent, a transaction still running could commit
+    # rows that move neither, so the page is sent without validators.
+    total, last_modified, db_now = query.with_entities(
+        func.count(), func.max(Farmer.updated_at), func.now()
+    ).one()
+    etag = None
+    if is_settled(last_modified, db_now):
+        etag = make_etag("farmers", total, last_modified, query_fingerprint(request))
+        # ETag only: a deleted row (or one updated out of the filter) lowers the
+        # count but leaves max(updated_at), so a date alone would validate a stale list
+        if is_fresh(request, etag, None):
+            return not_modified(etag, None)
+    
+    # Sparse fieldset: read only the requested columns
+    list_model = FarmerListResponse
+    if selected:
+        query = query.with_entities(*select_columns(Farmer, selected))
+        list_model = sparse_list_model(FarmerListResponse, "farmers", sparse_model(FarmerResponse, selected))
     
     # Apply pagination
     offset = (page - 1) * page_size
@@ -81,19 +128,21 @@ async def get_farmers(
     # Calculate pagination info
     total_pages = math.ceil(total / page_size)
     
-    return FarmerListResponse(
-        farmers=[FarmerResponse.from_orm(farmer) for farmer in farmers],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # Validate rows straight from the ORM objects and serialize once
+    return model_response(list_model.model_validate({
+        "farmers": farmers,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages
+    }, from_attributes=True), headers=validator_headers(etag, None))
 
 
 @router.get("/{beneficiary_id}", response_model=FarmerResponse)
 async def get_farmer(
     beneficiary_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -107,7 +156,12 @@ async def get_farmer(
             detail="Farmer not found"
         )
     
-    return FarmerResponse.from_orm(farmer)
+    # The client's copy is current: skip serialization entirely
+    etag = make_etag("farmer", farmer.beneficiary_id, farmer.updated_at)
+    if is_fresh(request, etag, farmer.updated_at):
+        return not_modified(etag, farmer.updated_at)
+    
+    return model_response(FarmerResponse.from_orm(farmer), headers=validator_headers(etag, farmer.updated_at))
 
 
 @router.post("/", response_model=FarmerResponse)
@@ -158,10 +212,129 @@ async def update_farmer(
         )
     
     # Update farmer with provided data
+    before = farmer_snapshot(farmer)
+    previous_photos = parse_photo_refs(farmer.photos)
     update_data = farmer_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(farmer, field, value)
     
+    # Photos removed from the list give up their blob reference
+    orphaned = []
+    if 'photos' in update_data:
+        orphaned = blob_store.retarget(db, previous_photos, parse_photo_refs(farmer.photos))
+    
+    # Create follow-up tasks for pipeline transitions in the same transaction
+    tasks = generate_tasks_for_transitions(db, [(before, farmer_snapshot(farmer))], current_user.user_id)
+    
+    db.commit()
+    db.refresh(farmer)
+    blob_store.remove_orphans(db, orphaned)
+    task_scheduler.track_many(tasks)
+    
+    return FarmerResponse.from_orm(farmer)
+
+
+@router.put("/bulk/status")
+async def bulk_update_farmer_status(
+    update: FarmerBulkStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Update pipeline status for many farmers and generate their tasks in one transaction (admin only)
+    """
+    if current_user.role != "Admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can bulk update farmers"
+        )
+    
+    update_data = update.dict(exclude_unset=True, exclude={"beneficiary_ids"})
+    if not update_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No status fields to update"
+        )
+    
+    beneficiary_ids = list(dict.fromkeys(update.beneficiary_ids))
+    
+    # Read the current state once, then update every row with a single UPDATE
+    columns = [getattr(Farmer, field) for field in SNAPSHOT_FIELDS]
+    before_rows = [
+        dict(row._mapping) for row in db.query(*columns).filter(
+            Farmer.beneficiary_id.in_(beneficiary_ids)
+        )
+    ]
+    
+    updated = db.query(Farmer).filter(
+        Farmer.beneficiary_id.in_(beneficiary_ids)
+    ).update(update_data, synchronize_session=False)
+    
+    transitions = [
+        (before, {**before, **{k: v for k, v in update_data.items() if k in SNAPSHOT_FIELDS}})
+        for before in before_rows
+    ]
+    tasks = generate_tasks_for_transitions(db, transitions, current_user.user_id)
+    
+    db.commit()
+    task_scheduler.track_many(tasks)
+    
+    found = {row["beneficiary_id"] for row in before_rows}
+    return {
+        "message": "Bulk status update completed",
+        "updated_count": updated,
+        "tasks_created": len(tasks),
+        "not_found": [beneficiary_id for beneficiary_id in beneficiary_ids if beneficiary_id not in found]
+    }
+
+
+@router.post("/{beneficiary_id}/photos", response_model=FarmerResponse)
+async def upload_farmer_photo(
+    beneficiary_id: str,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload an installation photo; thumbnail and medium variants are generated alongside it
+    """
+    farmer = db.query(Farmer).filter(Farmer.beneficiary_id == beneficiary_id).first()
+    
+    if not farmer:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Farmer not found"
+        )
+    
+    suffix = Path(file.filename or "").suffix.lower()
+    if suffix not in IMAGE_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only JPG, PNG and WebP images are allowed"
+        )
+    
+    # Stored by content hash: a photo uploaded before is only a new reference
+    blob, created = await blob_store.store_upload(db, file, settings.MAX_FILE_SIZE)
+    
+    # Resize in the process pool so the event loop keeps serving requests; content
+    # stored earlier without variants (e.g. as a document) gets them now
+    original_path = blob_store.blob_path(blob.sha256, blob.extension)
+    if created or variants_missing(original_path):
+        try:
+            await generate_variants(original_path)
+        except Exception:
+            if created:
+                blob_store.remove_files(blob_store.blob_files(blob))
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is not a readable image"
+            )
+    
+    url = blob_store.blob_url(blob)
+    if url not in parse_photo_refs(farmer.photos):
+        blob_store.add_reference(db, blob)
+        farmer.photos = append_photo_ref(farmer.photos, url)
+    farmer.rendered_photos = append_photo_ref(farmer.rendered_photos, url)
     db.commit()
     db.refresh(farmer)
     
@@ -191,15 +364,18 @@ async def delete_farmer(
             detail="Farmer not found"
         )
     
+    orphaned = blob_store.release_urls(db, parse_photo_refs(farmer.photos))
+    record_deletion(db, "farmer", beneficiary_id)
     db.delete(farmer)
     db.commit()
+    blob_store.remove_orphans(db, orphaned)
     
     return {"message": "Farmer deleted successfully"}
 
 
 @router.get("/stats/summary")
 async def get_farmers_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
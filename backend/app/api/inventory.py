@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import or_, func, desc
 from typing import Optional, List
-import pandas as pd
 import tempfile
 import os
 import math
 from pathlib import Path
 
 from ..core.database import get_db
+from ..core.replica import get_read_db
 from ..core.security import get_current_user
 from ..core.config import settings
+from ..core.responses import model_response
+from ..core.http_cache import make_etag, query_fingerprint, is_fresh, is_settled, not_modified, validator_headers
+from ..core.fieldsets import parse_fields, select_columns, sparse_model, sparse_list_model
+from ..core.query_shapes import query_shapes
+from ..services import blob_store
+from ..services.sync import record_deletion
+from ..services.storage import save_upload_file
 from ..models.user import User
 from ..models.inventory import (
     Inventory, 
@@ -37,13 +44,13 @@ from ..schemas.inventory import (
 
 router = APIRouter()
 
-# Static template files directory
+# Static template files directory (created when a template is first generated)
 TEMPLATES_DIR = Path("static/templates")
-TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
 
 
 @router.get("/", response_model=InventoryListResponse)
 async def get_inventory(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
     category: Optional[str] = Query(None, description="Filter by category"),
@@ -52,12 +59,14 @@ async def get_inventory(
     status: Optional[str] = Query(None, description="Filter by status"),
     low_stock_only: Optional[bool] = Query(False, description="Show only low stock items"),
     search: Optional[str] = Query(None, description="Search in description, part_number"),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,type,quantity,is_low_stock"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get paginated inventory list with filtering
     """
+    selected = parse_fields(fields, InventoryResponse, always=("id",), computed=("is_low_stock",))
     query = db.query(Inventory)
     
     # Apply filters
@@ -81,36 +90,61 @@ async def get_inventory(
         )
         query = query.filter(search_filter)
     
-    # Get total count
-    total = query.count()
+    # Count the filter combination so indexes follow real usage (GET /api/admin/query-shapes)
+    query_shapes.record("inventory", {
+        "category": category,
+        "type": type,
+        "specification": specification,
+        "status": status,
+        "low_stock_only": low_stock_only,
+        "search": search
+    })
+    
+    # Total and newest change in one aggregate; together with the query string
+    # they validate the page, so an unchanged list is a 304 before any row is read.
+    # While the newest change is recent, a transaction still running could commit
+    # rows that move neither, so the page is sent without validators.
+    total, last_modified, db_now = query.with_entities(
+        func.count(), func.max(Inventory.updated_at), func.now()
+    ).one()
+    etag = None
+    if is_settled(last_modified, db_now):
+        etag = make_etag("inventory", total, last_modified, query_fingerprint(request))
+        # ETag only: a deleted row (or one updated out of the filter) lowers the
+        # count but leaves max(updated_at), so a date alone would validate a stale list
+        if is_fresh(request, etag, None):
+            return not_modified(etag, None)
+    
+    # Sparse fieldset: read only the requested columns (is_low_stock is computed in SQL)
+    list_model = InventoryListResponse
+    if selected:
+        query = query.with_entities(*select_columns(
+            Inventory, selected, {"is_low_stock": Inventory.quantity <= Inventory.min_stock_level}
+        ))
+        list_model = sparse_list_model(InventoryListResponse, "items", sparse_model(InventoryResponse, selected))
     
     # Apply pagination
     offset = (page - 1) * page_size
     items = query.offset(offset).limit(page_size).all()
     
-    # Add low stock flag
-    inventory_responses = []
-    for item in items:
-        item_dict = InventoryResponse.from_orm(item).dict()
-        item_dict['is_low_stock'] = item.quantity <= item.min_stock_level
-        inventory_responses.append(InventoryResponse(**item_dict))
-    
     # Calculate pagination info
     total_pages = math.ceil(total / page_size)
     
-    return InventoryListResponse(
-        items=inventory_responses,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # Validate rows straight from the ORM objects (is_low_stock is computed) and serialize once
+    return model_response(list_model.model_validate({
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages
+    }, from_attributes=True), headers=validator_headers(etag, None))
 
 
 @router.get("/{item_id}", response_model=InventoryResponse)
 async def get_inventory_item(
     item_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -124,9 +158,12 @@ async def get_inventory_item(
             detail="Inventory item not found"
         )
     
-    response = InventoryResponse.from_orm(item)
-    response.is_low_stock = item.quantity <= item.min_stock_level
-    return response
+    # The client's copy is current: skip serialization entirely
+    etag = make_etag("inventory", item.id, item.updated_at)
+    if is_fresh(request, etag, item.updated_at):
+        return not_modified(etag, item.updated_at)
+    
+    return model_response(InventoryResponse.from_orm(item), headers=validator_headers(etag, item.updated_at))
 
 
 @router.post("/", response_model=InventoryResponse)
@@ -172,9 +209,7 @@ async def create_inventory_item(
         db.add(transaction)
         db.commit()
     
-    response = InventoryResponse.from_orm(new_item)
-    response.is_low_stock = new_item.quantity <= new_item.min_stock_level
-    return response
+    return InventoryResponse.from_orm(new_item)
 
 
 @router.post("/bulk", response_model=dict)
@@ -270,11 +305,13 @@ async def upload_inventory_file(
             detail="Only CSV, XLSX, and XLS files are allowed"
         )
     
-    # Save file temporarily
+    # Stream the file to a temporary path instead of reading it into memory
     with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as temp_file:
-        content = await file.read()
-        temp_file.write(content)
         temp_file_path = temp_file.name
+    await save_upload_file(file, Path(temp_file_path), settings.MAX_FILE_SIZE)
+    
+    # pandas is heavy to import; only the upload path pays for it
+    import pandas as pd
     
     try:
         # Read file based on format
@@ -354,12 +391,22 @@ async def update_inventory_item(
     previous_quantity = item.quantity
     
     # Update item with provided data
+    previous_document = item.document_url
     update_data = item_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(item, field, value)
     
+    orphaned = []
+    if 'document_url' in update_data:
+        orphaned = blob_store.retarget(
+            db,
+            [previous_document] if previous_document else [],
+            [item.document_url] if item.document_url else []
+        )
+    
     db.commit()
     db.refresh(item)
+    blob_store.remove_orphans(db, orphaned)
     
     # Create transaction record if quantity changed
     if 'quantity' in update_data and item.quantity != previous_quantity:
@@ -379,9 +426,7 @@ async def update_inventory_item(
         db.add(transaction)
         db.commit()
     
-    response = InventoryResponse.from_orm(item)
-    response.is_low_stock = item.quantity <= item.min_stock_level
-    return response
+    return InventoryResponse.from_orm(item)
 
 
 @router.delete("/{item_id}")
@@ -407,8 +452,11 @@ async def delete_inventory_item(
             detail="Inventory item not found"
         )
     
+    orphaned = blob_store.release_urls(db, [item.document_url or ""])
+    record_deletion(db, "inventory", item_id)
     db.delete(item)
     db.commit()
+    blob_store.remove_orphans(db, orphaned)
     
     return {"message": "Inventory item deleted successfully"}
 
@@ -434,13 +482,21 @@ async def dispatch_inventory_to_farmer(
     total_value = 0
     dispatch_items = []
     
+    # Load (and lock) every requested item in one query rather than one per item.
+    # Locks are taken in id order so dispatches sharing items can't deadlock.
+    inventory_ids = {item_data['inventory_id'] for item_data in dispatch_data.items}
+    inventories = {
+        inventory.id: inventory
+        for inventory in db.query(Inventory).filter(Inventory.id.in_(inventory_ids)).order_by(Inventory.id).with_for_update()
+    }
+    
     for item_data in dispatch_data.items:
         inventory_id = item_data['inventory_id']
         quantity = item_data['quantity']
         unit_cost = item_data.get('unit_cost', 0)
         
         # Get inventory item
-        inventory = db.query(Inventory).filter(Inventory.id == inventory_id).first()
+        inventory = inventories.get(inventory_id)
         if not inventory:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -496,14 +552,18 @@ async def dispatch_inventory_to_farmer(
     dispatch.status = "dispatched"
     
     db.commit()
-    db.refresh(dispatch)
+    
+    # Items and their inventory in two queries, not a lazy load per item
+    dispatch = db.query(FarmerDispatch).options(
+        selectinload(FarmerDispatch.items).joinedload(FarmerDispatchItem.inventory)
+    ).filter(FarmerDispatch.id == dispatch.id).one()
     
     return FarmerDispatchResponse.from_orm(dispatch)
 
 
 @router.get("/stats/dashboard", response_model=InventoryStats)
 async def get_inventory_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -665,7 +725,11 @@ def create_excel_template(file_path: Path):
         }
     ]
     
+    # pandas and openpyxl are heavy to import; only template generation pays for them
+    import pandas as pd
+    
     # Create Excel file with sample data
+    file_path.parent.mkdir(parents=True, exist_ok=True)
     df = pd.DataFrame(sample_data)
     
     with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
@@ -707,6 +771,7 @@ def create_csv_template(file_path: Path):
     ]
     
     import csv
+    file_path.parent.mkdir(parents=True, exist_ok=True)
     with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
         # Write header
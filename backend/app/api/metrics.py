@@ -0,0 +1,95 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import Response
+
+from ..core.config import settings
+from ..core.database import engine, replica_engine
+from ..core.db_pool import pool_metrics, replica_pool_metrics, pool_status
+from ..core.metrics import CONTENT_TYPE, MetricsWriter, socket_metrics, write_request_metrics
+from ..core.presence import presence
+from ..core.query_stats import query_totals
+from ..core.realtime import sio, socket_counts
+from ..services import images
+from ..services.task_scheduler import task_scheduler
+
+router = APIRouter()
+
+
+def write_pool_metrics(writer: MetricsWriter) -> None:
+    pools = [("primary", engine, pool_metrics)]
+    if replica_engine is not None:
+        pools.append(("replica", replica_engine, replica_pool_metrics))
+
+    readings = [({"pool": name}, pool_status(pool_engine), metrics.read()) for name, pool_engine, metrics in pools]
+    writer.gauge("db_pool_size", "Connections the pool keeps open", [
+        (labels, gauges["size"]) for labels, gauges, _ in readings
+    ])
+    writer.gauge("db_pool_checked_out", "Connections in use", [
+        (labels, gauges["checked_out"]) for labels, gauges, _ in readings
+    ])
+    writer.gauge("db_pool_overflow_in_use", "Connections open beyond the pool size", [
+        (labels, gauges["overflow_in_use"]) for labels, gauges, _ in readings
+    ])
+    for counter, help_text in (
+        ("checkouts", "Connections handed out by the pool"),
+        ("timeouts", "Checkouts that gave up after the pool timeout"),
+        ("connections_opened", "New database connections"),
+        ("invalidated", "Connections discarded as broken"),
+    ):
+        writer.counter(f"db_pool_{counter}", help_text, [
+            (labels, counters[counter]) for labels, _, (counters, _, _) in readings
+        ])
+    writer.histogram("db_pool_wait_seconds", "Time to get a connection from the pool", [
+        (labels, wait) for labels, _, (_, wait, _) in readings
+    ])
+    writer.histogram("db_pool_hold_seconds", "Time a connection stays checked out", [
+        (labels, hold) for labels, _, (_, _, hold) in readings
+    ])
+
+
+def write_query_metrics(writer: MetricsWriter) -> None:
+    writer.counter("db_queries", "SQL statements run by HTTP requests", [(None, query_totals.count)])
+    writer.counter("db_query_seconds", "Time HTTP requests spent in SQL", [(None, query_totals.seconds)])
+    writer.histogram("db_queries_per_request", "SQL statements per HTTP request", [(None, query_totals.per_request)])
+
+
+def write_socket_metrics(writer: MetricsWriter) -> None:
+    counts = socket_counts(sio)
+    writer.gauge("socketio_clients", "Connected Socket.IO clients", [(None, counts["clients"])])
+    writer.gauge("socketio_rooms", "Named Socket.IO rooms with members", [(None, counts["rooms"])])
+    writer.gauge("socketio_online_users", "Authenticated users with an open socket", [(None, presence.online_count())])
+    writer.counter("socketio_emits", "Socket.IO events emitted, by event", [
+        ({"event": event}, count) for event, count in list(socket_metrics.emitted.items())
+    ])
+
+
+def write_job_metrics(writer: MetricsWriter) -> None:
+    writer.gauge("background_queue_depth", "Work waiting in background queues", [
+        ({"queue": "task_deadlines"}, task_scheduler.pending_count()),
+        ({"queue": "image_variants"}, images.jobs_in_flight()),
+        ({"queue": "presence_flush"}, presence.pending_count()),
+    ])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    """
+    Prometheus metrics for this worker process (scrape every worker, or run one per target)
+    """
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+
+    writer = MetricsWriter()
+    write_request_metrics(writer)
+    write_query_metrics(writer)
+    write_pool_metrics(writer)
+    write_socket_metrics(writer)
+    write_job_metrics(writer)
+    return Response(writer.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,256 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from typing import Optional
+
+from ..core.database import get_db
+from ..core.security import get_current_user
+from ..core.config import settings
+from ..core.responses import model_response
+from ..models.user import User
+from ..models.farmer import Farmer
+from ..models.task import Task
+from ..models.inventory import Inventory
+from ..schemas.farmer import FarmerResponse
+from ..schemas.task import TaskResponse
+from ..schemas.sync import (
+    FarmerSyncResponse,
+    TaskSyncResponse,
+    InventorySyncResponse,
+    SyncDeletion,
+    SyncPushRequest,
+    SyncPushResponse,
+    SyncApplied,
+    SyncConflict,
+    SyncConflictReason
+)
+from ..services import blob_store
+from ..services.images import parse_photo_refs
+from ..services.sync import (
+    decode_sync_token,
+    encode_sync_token,
+    next_position,
+    read_page,
+    read_tombstones,
+    sync_cutoff
+)
+from ..services.task_generation import farmer_snapshot, generate_tasks_for_transitions
+from ..services.task_scheduler import task_scheduler
+from ..services.tasks import apply_task_update
+from .tasks import can_access_task
+
+router = APIRouter()
+
+
+def sync_page(db: Session, query, timestamp_column, key_column, key_name: str, entity_type: str,
+              since: Optional[str], limit: int, response_model, tombstone_user_id: Optional[int] = None):
+    """
+    One page of changed rows and tombstones after the token's positions
+    """
+    cutoff = sync_cutoff(db)
+    rows_position, tombstones_position = decode_sync_token(since)
+    if since is None:
+        # A full download has nothing to delete locally; only track deletes from now on
+        tombstones_position = [cutoff.isoformat(), None]
+
+    rows, rows_more = read_page(query, timestamp_column, key_column, rows_position, limit)
+    tombstones, tombstones_more = read_tombstones(db, entity_type, tombstones_position, limit, tombstone_user_id)
+
+    # Mid-stream pages continue after the last row; caught-up streams restart at the cutoff
+    last_row = rows[-1] if rows_more else None
+    last_tombstone = tombstones[-1] if tombstones_more else None
+    next_token = encode_sync_token(
+        next_position(
+            last_row.updated_at if last_row else None,
+            getattr(last_row, key_name) if last_row else None,
+            rows_more,
+            cutoff
+        ),
+        next_position(
+            last_tombstone.deleted_at if last_tombstone else None,
+            last_tombstone.id if last_tombstone else None,
+            tombstones_more,
+            cutoff
+        )
+    )
+
+    return model_response(response_model.model_validate({
+        "changed": rows,
+        "deleted": [
+            SyncDeletion(id=tombstone.entity_id, deleted_at=tombstone.deleted_at) for tombstone in tombstones
+        ],
+        "next_token": next_token,
+        "has_more": rows_more or tombstones_more
+    }, from_attributes=True))
+
+
+@router.get("/farmers", response_model=FarmerSyncResponse)
+async def sync_farmers(
+    since: Optional[str] = Query(None, description="next_token from the previous sync; omit for a full download"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get farmers changed or deleted since a sync token
+    """
+    return sync_page(
+        db, db.query(Farmer), Farmer.updated_at, Farmer.beneficiary_id, "beneficiary_id", "farmer",
+        since, limit, FarmerSyncResponse
+    )
+
+
+@router.get("/tasks", response_model=TaskSyncResponse)
+async def sync_tasks(
+    since: Optional[str] = Query(None, description="next_token from the previous sync; omit for a full download"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get tasks changed or deleted since a sync token (non-admins: tasks assigned to or by them)
+    """
+    query = db.query(Task)
+    tombstone_user_id = None
+    if current_user.role != "Admin":
+        query = query.filter(or_(
+            Task.assigned_to_user_id == current_user.user_id,
+            Task.assigned_by_user_id == current_user.user_id
+        ))
+        # Also tasks reassigned away from this user
+        tombstone_user_id = current_user.user_id
+
+    return sync_page(
+        db, query, Task.updated_at, Task.task_id, "task_id", "task",
+        since, limit, TaskSyncResponse, tombstone_user_id
+    )
+
+
+@router.get("/inventory", response_model=InventorySyncResponse)
+async def sync_inventory(
+    since: Optional[str] = Query(None, description="next_token from the previous sync; omit for a full download"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get inventory items changed or deleted since a sync token
+    """
+    return sync_page(
+        db, db.query(Inventory), Inventory.updated_at, Inventory.id, "id", "inventory",
+        since, limit, InventorySyncResponse
+    )
+
+
+@router.post("/push", response_model=SyncPushResponse)
+async def push_changes(
+    batch: SyncPushRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Apply edits queued offline in one transaction.
+
+    An edit applies only if the row is unchanged since the copy it was made
+    on (base_updated_at); otherwise it is returned as a conflict with the
+    server copy, and the rest of the batch still applies.
+    """
+    applied_farmers, applied_tasks, conflicts = [], [], []
+    transitions, orphaned = [], []
+
+    # Lock every target row with one query per entity, in key order so
+    # concurrent pushes touching the same rows can't deadlock
+    farmer_ids = [edit.beneficiary_id for edit in batch.farmers]
+    farmers = {
+        farmer.beneficiary_id: farmer
+        for farmer in db.query(Farmer).filter(Farmer.beneficiary_id.in_(farmer_ids))
+        .order_by(Farmer.beneficiary_id).with_for_update()
+    } if farmer_ids else {}
+
+    for edit in batch.farmers:
+        farmer = farmers.get(edit.beneficiary_id)
+        if farmer is None:
+            conflicts.append(SyncConflict(entity="farmer", id=edit.beneficiary_id, reason=SyncConflictReason.DELETED))
+            continue
+        if farmer.updated_at != edit.base_updated_at:
+            conflicts.append(SyncConflict(
+                entity="farmer",
+                id=edit.beneficiary_id,
+                reason=SyncConflictReason.MODIFIED,
+                server=FarmerResponse.from_orm(farmer).model_dump(mode="json")
+            ))
+            continue
+
+        before = farmer_snapshot(farmer)
+        previous_photos = parse_photo_refs(farmer.photos)
+        update_data = edit.changes.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(farmer, field, value)
+        if 'photos' in update_data:
+            orphaned.extend(blob_store.retarget(db, previous_photos, parse_photo_refs(farmer.photos)))
+        transitions.append((before, farmer_snapshot(farmer)))
+        applied_farmers.append(edit.beneficiary_id)
+
+    task_ids = [edit.task_id for edit in batch.tasks]
+    tasks = {
+        task.task_id: task
+        for task in db.query(Task).filter(Task.task_id.in_(task_ids)).order_by(Task.task_id).with_for_update()
+    } if task_ids else {}
+    assignee_ids = {edit.changes.assigned_to_user_id for edit in batch.tasks} - {None}
+    assignees = set(db.scalars(
+        select(User.user_id).where(User.user_id.in_(assignee_ids))
+    )) if assignee_ids else set()
+
+    for edit in batch.tasks:
+        task = tasks.get(edit.task_id)
+        if task is None:
+            conflicts.append(SyncConflict(entity="task", id=str(edit.task_id), reason=SyncConflictReason.DELETED))
+            continue
+        if not can_access_task(task, current_user):
+            conflicts.append(SyncConflict(entity="task", id=str(edit.task_id), reason=SyncConflictReason.FORBIDDEN))
+            continue
+        if task.updated_at != edit.base_updated_at:
+            conflicts.append(SyncConflict(
+                entity="task",
+                id=str(edit.task_id),
+                reason=SyncConflictReason.MODIFIED,
+                server=TaskResponse.from_orm(task).model_dump(mode="json")
+            ))
+            continue
+        if edit.changes.assigned_to_user_id not in assignees | {None}:
+            conflicts.append(SyncConflict(entity="task", id=str(edit.task_id), reason=SyncConflictReason.INVALID))
+            continue
+
+        apply_task_update(db, task, edit.changes.dict(exclude_unset=True))
+        applied_tasks.append(task)
+
+    # Follow-up tasks for farmer pipeline transitions, batched like bulk status updates
+    created_tasks = generate_tasks_for_transitions(db, transitions, current_user.user_id)
+
+    db.flush()
+    # Read back updated_at: an edit that changed nothing issued no UPDATE and keeps its old one
+    farmer_versions = dict(db.execute(
+        select(Farmer.beneficiary_id, Farmer.updated_at).where(Farmer.beneficiary_id.in_(applied_farmers))
+    ).all()) if applied_farmers else {}
+    applied_task_ids = [task.task_id for task in applied_tasks]
+    task_versions = dict(db.execute(
+        select(Task.task_id, Task.updated_at).where(Task.task_id.in_(applied_task_ids))
+    ).all()) if applied_task_ids else {}
+    db.commit()
+    blob_store.remove_orphans(db, orphaned)
+    task_scheduler.track_many(applied_tasks + created_tasks)
+
+    applied = [
+        SyncApplied(entity="farmer", id=beneficiary_id, updated_at=farmer_versions[beneficiary_id])
+        for beneficiary_id in applied_farmers
+    ]
+    applied += [
+        SyncApplied(entity="task", id=str(task_id), updated_at=task_versions[task_id])
+        for task_id in applied_task_ids
+    ]
+
+    return SyncPushResponse(
+        applied=applied,
+        conflicts=conflicts,
+        tasks_created=len(created_tasks)
+    )
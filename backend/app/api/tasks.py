@@ -1,29 +1,265 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import or_, and_
+from typing import Optional
+from datetime import date
 from ..core.database import get_db
 from ..core.security import get_current_user
+from ..core.pagination import encode_cursor, decode_cursor, invalid_cursor
+from ..core.responses import model_response
 from ..models.user import User
+from ..models.task import Task, TaskStatus
+from ..schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse
+from ..services.tasks import apply_task_update, adjust_task_counters, record_status_change, status_key
+from ..services.task_scheduler import task_scheduler
+from ..services.sync import record_deletion
 
 router = APIRouter()
 
 
-@router.get("/")
+def get_task_or_404(db: Session, task_id: int) -> Task:
+    task = db.query(Task).filter(Task.task_id == task_id).first()
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    return task
+
+
+def can_access_task(task: Task, user: User) -> bool:
+    return user.role == "Admin" or user.user_id in (task.assigned_to_user_id, task.assigned_by_user_id)
+
+
+@router.get("/", response_model=TaskListResponse)
 async def get_tasks(
+    status_filter: Optional[TaskStatus] = Query(None, alias="status", description="Filter by status"),
+    assigned_to_user_id: Optional[int] = Query(None, description="Filter by assignee"),
+    farmer_beneficiary_id: Optional[str] = Query(None, description="Filter by farmer"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get tasks, newest first (non-admins see tasks assigned to or by them)
+    """
+    query = db.query(Task)
+
+    if current_user.role != "Admin":
+        query = query.filter(or_(
+            Task.assigned_to_user_id == current_user.user_id,
+            Task.assigned_by_user_id == current_user.user_id
+        ))
+
+    # Apply filters
+    if status_filter:
+        query = query.filter(Task.status == status_filter)
+    if assigned_to_user_id:
+        query = query.filter(Task.assigned_to_user_id == assigned_to_user_id)
+    if farmer_beneficiary_id:
+        query = query.filter(Task.farmer_beneficiary_id == farmer_beneficiary_id)
+
+    if cursor:
+        query = query.filter(Task.task_id < decode_cursor(cursor, id=int)["id"])
+
+    tasks = query.order_by(Task.task_id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor({"id": tasks[-1].task_id})
+
+    return model_response(TaskListResponse.model_validate(
+        {"tasks": tasks, "next_cursor": next_cursor}, from_attributes=True
+    ))
+
+
+@router.get("/my-queue", response_model=TaskListResponse)
+async def get_my_queue(
+    status_filter: TaskStatus = Query(TaskStatus.PENDING, alias="status", description="Queue status"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the current user's tasks in a status, earliest due date first
+    """
+    # Equality on (assignee, status) plus ORDER BY (due_date, task_id) walks
+    # idx_tasks_assignee_status_due in order; undated tasks sort last
+    query = db.query(Task).filter(
+        Task.assigned_to_user_id == current_user.user_id,
+        Task.status == TaskStatus(status_key(status_filter))
+    )
+
+    if cursor:
+        position = decode_cursor(cursor, due=(str, type(None)), id=int)
+        if position["due"] is None:
+            query = query.filter(Task.due_date.is_(None), Task.task_id > position["id"])
+        else:
+            try:
+                due = date.fromisoformat(position["due"])
+            except ValueError:
+                raise invalid_cursor()
+            query = query.filter(or_(
+                Task.due_date > due,
+                and_(Task.due_date == due, Task.task_id > position["id"]),
+                Task.due_date.is_(None)
+            ))
+
+    tasks = query.order_by(Task.due_date.asc().nulls_last(), Task.task_id.asc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        next_cursor = encode_cursor({
+            "due": last.due_date.isoformat() if last.due_date else None,
+            "id": last.task_id
+        })
+
+    return model_response(TaskListResponse.model_validate(
+        {"tasks": tasks, "next_cursor": next_cursor}, from_attributes=True
+    ))
+
+
+@router.get("/tagged/{tag}", response_model=TaskListResponse)
+async def get_tasks_by_tag(
+    tag: str,
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100, description="Page size"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get tasks carrying a tag, newest first
+    """
+    # tags @> ARRAY[tag] is served by the GIN index on tags
+    query = db.query(Task).filter(Task.tags.contains([tag]))
+    if current_user.role != "Admin":
+        query = query.filter(Task.assigned_to_user_id == current_user.user_id)
+
+    if cursor:
+        query = query.filter(Task.task_id < decode_cursor(cursor, id=int)["id"])
+
+    tasks = query.order_by(Task.task_id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor({"id": tasks[-1].task_id})
+
+    return model_response(TaskListResponse.model_validate(
+        {"tasks": tasks, "next_cursor": next_cursor}, from_attributes=True
+    ))
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get tasks - placeholder endpoint
+    Get task by ID
     """
-    return {"message": "Tasks endpoint - to be implemented", "user": current_user.name}
+    task = get_task_or_404(db, task_id)
+
+    if not can_access_task(task, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this task"
+        )
 
+    return TaskResponse.from_orm(task)
 
-@router.post("/")
+
+@router.post("/", response_model=TaskResponse)
 async def create_task(
+    task_data: TaskCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create a new task
+    """
+    assignee = db.query(User).filter(User.user_id == task_data.assigned_to_user_id).first()
+    if not assignee:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Assignee not found"
+        )
+
+    task = Task(
+        **task_data.dict(),
+        assigned_by_user_id=current_user.user_id,
+        status=TaskStatus.PENDING
+    )
+    db.add(task)
+    adjust_task_counters(db, {TaskStatus.PENDING.value: 1})
+    db.commit()
+    db.refresh(task)
+    task_scheduler.track(task)
+
+    return TaskResponse.from_orm(task)
+
+
+@router.put("/{task_id}", response_model=TaskResponse)
+async def update_task(
+    task_id: int,
+    task_data: TaskUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Update task information (assignee, assigner or admin)
+    """
+    task = get_task_or_404(db, task_id)
+
+    if not can_access_task(task, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this task"
+        )
+
+    if task_data.assigned_to_user_id is not None and not db.query(User).filter(
+        User.user_id == task_data.assigned_to_user_id
+    ).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Assignee not found"
+        )
+
+    apply_task_update(db, task, task_data.dict(exclude_unset=True))
+    db.commit()
+    db.refresh(task)
+    task_scheduler.track(task)
+
+    return TaskResponse.from_orm(task)
+
+
+@router.delete("/{task_id}")
+async def delete_task(
+    task_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Create task - placeholder endpoint
+    Delete a task (assigner or admin)
     """
-    return {"message": "Create task endpoint - to be implemented"}
\ No newline at end of file
+    task = get_task_or_404(db, task_id)
+
+    if current_user.role != "Admin" and current_user.user_id != task.assigned_by_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the assigner or an admin can delete tasks"
+        )
+
+    record_status_change(db, task.status, None)
+    record_deletion(db, "task", task_id)
+    db.delete(task)
+    db.commit()
+    task_scheduler.forget(task_id)
+
+    return {"message": "Task deleted successfully"}
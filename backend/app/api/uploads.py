@@ -0,0 +1,232 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Request
+from sqlalchemy.orm import Session
+from pathlib import Path
+import asyncio
+
+from ..core.database import get_db
+from ..core.security import get_current_user
+from ..core.config import settings
+from ..models.user import User
+from ..models.farmer import Farmer
+from ..models.inventory import Inventory
+from ..schemas.upload import (
+    UploadPurpose,
+    ChunkedUploadInit,
+    ChunkRange,
+    ChunkedUploadStatus,
+    ChunkedUploadResult
+)
+from ..services import blob_store, chunked_uploads
+from ..services.images import IMAGE_EXTENSIONS, append_photo_ref, parse_photo_refs, generate_variants, variants_missing
+
+router = APIRouter()
+
+
+def get_target(db: Session, purpose: UploadPurpose, target_id: str):
+    """
+    Load the farmer or inventory item an upload will be attached to
+    """
+    if purpose == UploadPurpose.FARMER_PHOTO:
+        target = db.query(Farmer).filter(Farmer.beneficiary_id == target_id).first()
+    else:
+        target = None
+        if target_id.isdigit():
+            target = db.query(Inventory).filter(Inventory.id == int(target_id)).first()
+
+    if not target:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload target not found"
+        )
+    return target
+
+
+def upload_status(manifest: dict) -> ChunkedUploadStatus:
+    received = chunked_uploads.received_chunks(manifest["upload_id"])
+    return ChunkedUploadStatus(
+        upload_id=manifest["upload_id"],
+        filename=manifest["filename"],
+        size=manifest["size"],
+        chunk_size=manifest["chunk_size"],
+        total_chunks=chunked_uploads.total_chunks(manifest),
+        received_chunks=[
+            ChunkRange(start=start, end=end) for start, end in chunked_uploads.index_ranges(received)
+        ],
+        missing_chunks=[
+            ChunkRange(start=start, end=end) for start, end in chunked_uploads.missing_ranges(manifest, received)
+        ],
+        purpose=manifest["purpose"],
+        target_id=manifest["target_id"]
+    )
+
+
+@router.post("/init", response_model=ChunkedUploadStatus)
+async def init_upload(
+    upload: ChunkedUploadInit,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a resumable upload for an inventory document or farmer photo
+    """
+    suffix = Path(upload.filename).suffix.lower()
+    allowed = IMAGE_EXTENSIONS if upload.purpose == UploadPurpose.FARMER_PHOTO else settings.ALLOWED_EXTENSIONS
+    if suffix not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed: {', '.join(allowed)}"
+        )
+
+    if upload.size > settings.MAX_CHUNKED_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {settings.MAX_CHUNKED_UPLOAD_SIZE // (1024 * 1024)}MB limit"
+        )
+
+    chunk_size = upload.chunk_size or settings.UPLOAD_CHUNK_SIZE
+    if chunk_size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk size cannot exceed {settings.MAX_FILE_SIZE} bytes"
+        )
+    if chunk_size < min(settings.UPLOAD_MIN_CHUNK_SIZE, upload.size):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk size must be at least {settings.UPLOAD_MIN_CHUNK_SIZE} bytes"
+        )
+    if -(-upload.size // chunk_size) > settings.UPLOAD_MAX_CHUNKS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Upload would have more than {settings.UPLOAD_MAX_CHUNKS} chunks; use a larger chunk size"
+        )
+
+    get_target(db, upload.purpose, upload.target_id)
+
+    await asyncio.to_thread(chunked_uploads.cleanup_stale_uploads)
+    manifest = await asyncio.to_thread(
+        chunked_uploads.create_upload,
+        current_user.user_id,
+        upload.filename,
+        upload.size,
+        chunk_size,
+        upload.sha256,
+        upload.purpose.value,
+        upload.target_id
+    )
+    return upload_status(manifest)
+
+
+@router.get("/{upload_id}", response_model=ChunkedUploadStatus)
+async def get_upload_status(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get received and missing chunks, so a client can resume after a disconnect
+    """
+    manifest = chunked_uploads.load_upload(upload_id, current_user.user_id)
+    return upload_status(manifest)
+
+
+@router.put("/{upload_id}/chunks/{index}")
+async def put_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    x_chunk_sha256: str = Header(..., min_length=64, max_length=64, description="SHA-256 of this chunk"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload one chunk as the raw request body; re-sending a chunk is safe
+    """
+    manifest = chunked_uploads.load_upload(upload_id, current_user.user_id)
+    await chunked_uploads.write_chunk(manifest, index, request.stream(), x_chunk_sha256)
+
+    return {
+        "upload_id": upload_id,
+        "index": index,
+        "received": len(chunked_uploads.received_chunks(upload_id)),
+        "total_chunks": chunked_uploads.total_chunks(manifest)
+    }
+
+
+@router.post("/{upload_id}/complete", response_model=ChunkedUploadResult)
+async def complete_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Verify all chunks and attach the file to its farmer or inventory item.
+    Repeating it (e.g. a retry after a lost response) returns the same result.
+    """
+    # One complete at a time per upload; chunk copies wait for it too
+    async with chunked_uploads.upload_lock(upload_id):
+        done = chunked_uploads.load_result(upload_id, current_user.user_id)
+        if done is not None:
+            return ChunkedUploadResult(**done)
+        return await attach_upload(upload_id, db, current_user)
+
+
+async def attach_upload(upload_id: str, db: Session, current_user: User) -> ChunkedUploadResult:
+    manifest = chunked_uploads.load_upload(upload_id, current_user.user_id)
+    purpose = UploadPurpose(manifest["purpose"])
+    target = get_target(db, purpose, manifest["target_id"])
+
+    assembled, sha256 = await chunked_uploads.assemble_upload(manifest)
+
+    # Identical content already in the store is just another reference
+    suffix = Path(manifest["filename"]).suffix.lower()
+    blob, created = blob_store.stage_file(db, assembled, sha256, suffix)
+    url = blob_store.blob_url(blob)
+    orphaned = []
+
+    if purpose == UploadPurpose.FARMER_PHOTO:
+        # Also when the content was stored before without variants (e.g. as a document)
+        original_path = blob_store.blob_path(blob.sha256, blob.extension)
+        if created or variants_missing(original_path):
+            try:
+                await generate_variants(original_path)
+            except Exception:
+                if created:
+                    blob_store.remove_files(blob_store.blob_files(blob))
+                chunked_uploads.remove_upload(upload_id)
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File is not a readable image"
+                )
+        # Attaching the same photo twice keeps a single reference
+        if url not in parse_photo_refs(target.photos):
+            blob_store.add_reference(db, blob)
+            target.photos = append_photo_ref(target.photos, url)
+        target.rendered_photos = append_photo_ref(target.rendered_photos, url)
+    elif target.document_url != url:
+        blob_store.add_reference(db, blob)
+        orphaned = blob_store.release_urls(db, [target.document_url or ""])
+        target.document_url = url
+
+    db.commit()
+    blob_store.remove_orphans(db, orphaned)
+
+    result = ChunkedUploadResult(
+        upload_id=upload_id,
+        url=url,
+        purpose=purpose,
+        target_id=manifest["target_id"]
+    )
+    chunked_uploads.finish_upload(upload_id, current_user.user_id, result.model_dump(mode="json"))
+    return result
+
+
+@router.delete("/{upload_id}")
+async def abort_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Abandon an upload and free its disk space
+    """
+    async with chunked_uploads.upload_lock(upload_id):
+        chunked_uploads.load_upload(upload_id, current_user.user_id)
+        chunked_uploads.remove_upload(upload_id)
+    return {"message": "Upload aborted"}
@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from ..core.database import get_db
-from ..core.security import get_current_user
+from ..core.security import get_current_user, get_current_user_id
+from ..core.presence import presence
 from ..models.user import User
 from ..schemas.user import UserResponse, UserUpdate
 
@@ -28,6 +29,20 @@ async def get_users(
     return [UserResponse.from_orm(user) for user in users]
 
 
+@router.get("/online")
+async def get_online_users(
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Get users currently connected over Socket.IO (answered from memory)
+    """
+    online_user_ids = presence.online_user_ids()
+    return {
+        "user_ids": online_user_ids,
+        "count": len(online_user_ids)
+    }
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
@@ -0,0 +1,225 @@
+import time
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+SKIPPED_STATUS_CODES = (204, 206, 304)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header, honouring q-values;
+    brotli wins ties when it is installed
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip()] = quality
+
+    wildcard = weights.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_weight = None, 0.0
+    for coding in candidates:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressionBudget:
+    """
+    Seconds spent compressing per rolling window, per process. Past half the
+    budget responses use the fastest level; past the budget they go out
+    uncompressed until the window rolls over.
+    """
+
+    __slots__ = ("limit", "window", "_window_start", "_spent")
+
+    def __init__(self, cpu_fraction: float, window_seconds: float):
+        self.limit = cpu_fraction * window_seconds
+        self.window = window_seconds
+        self._window_start = time.monotonic()
+        self._spent = 0.0
+
+    def _roll(self) -> None:
+        now = time.monotonic()
+        if now - self._window_start >= self.window:
+            self._window_start = now
+            self._spent = 0.0
+
+    def level(self) -> str:
+        """Compression level for a response starting now: normal, fast or off"""
+        self._roll()
+        if self._spent >= self.limit:
+            return "off"
+        return "fast" if self._spent >= self.limit / 2 else "normal"
+
+    def charge(self, seconds: float) -> None:
+        self._roll()
+        self._spent += seconds
+
+
+class Compressor:
+    """Incremental gzip or brotli encoder that charges its time to the budget"""
+
+    def __init__(self, encoding: str, fast: bool, budget: CompressionBudget):
+        self.budget = budget
+        if encoding == "br":
+            encoder = brotli.Compressor(quality=1 if fast else settings.COMPRESSION_BROTLI_QUALITY)
+            self._compress, self._finish = encoder.process, encoder.finish
+        else:
+            # wbits 16+ writes a gzip header and trailer
+            encoder = zlib.compressobj(
+                1 if fast else settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+            self._compress, self._finish = encoder.compress, encoder.flush
+
+    def compress(self, data: bytes) -> bytes:
+        started = time.perf_counter()
+        output = self._compress(data)
+        self.budget.charge(time.perf_counter() - started)
+        return output
+
+    def finish(self) -> bytes:
+        started = time.perf_counter()
+        output = self._finish()
+        self.budget.charge(time.perf_counter() - started)
+        return output
+
+
+def is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Compress HTTP responses with brotli or gzip, as negotiated by Accept-Encoding.
+
+    Bodies under COMPRESSION_MIN_SIZE are sent as-is; streaming responses
+    (e.g. exports) are compressed chunk by chunk without buffering.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = None, budget: CompressionBudget = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.budget = budget or CompressionBudget(
+            settings.COMPRESSION_CPU_BUDGET, settings.COMPRESSION_BUDGET_WINDOW_SECONDS
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Per-response state: decides on the first body message, then streams"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers until the first body chunk shows the response size
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            await self.downstream(message)
+            return
+
+        if self.start_message is not None:
+            await self.start(message)
+            return
+
+        if self.passthrough:
+            await self.downstream(message)
+            return
+
+        body = self.compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        if not more_body:
+            body += self.compressor.finish()
+        if body or not more_body:
+            await self.downstream({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def start(self, message: Message) -> None:
+        start_message, self.start_message = self.start_message, None
+        headers = MutableHeaders(raw=start_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        size_known = not more_body or "content-length" in headers
+        size = len(body) if not more_body else int(headers.get("content-length", 0) or 0)
+        level = self.middleware.budget.level()
+        if (
+            start_message["status"] in SKIPPED_STATUS_CODES
+            or not is_compressible(headers)
+            or (size_known and size < self.middleware.minimum_size)
+            or level == "off"
+        ):
+            self.passthrough = True
+            await self.downstream(start_message)
+            await self.downstream(message)
+            return
+
+        self.compressor = Compressor(self.encoding, level == "fast", self.middleware.budget)
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # The encoded bytes are a different representation of the resource
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+
+        compressed = self.compressor.compress(body)
+        if more_body:
+            # Streaming: length unknown up front, so send chunked
+            del headers["content-length"]
+            await self.downstream(start_message)
+            if compressed:
+                await self.downstream({"type": "http.response.body", "body": compressed, "more_body": True})
+            return
+
+        compressed += self.compressor.finish()
+        headers["content-length"] = str(len(compressed))
+        await self.downstream(start_message)
+        await self.downstream({"type": "http.response.body", "body": compressed, "more_body": False})
@@ -2,16 +2,41 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .db_pool import PoolMetrics, instrumented_pool_class, instrument_engine, ping_when_idle, pool_metrics, replica_pool_metrics
+
+
+def make_engine(url: str, metrics: PoolMetrics):
+    """Engine with the configured, instrumented connection pool"""
+    engine = create_engine(
+        url,
+        poolclass=instrumented_pool_class(metrics),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING == "always",
+        # Applied by the server to every statement on these connections
+        connect_args={"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    )
+    instrument_engine(engine, metrics)
+    if settings.DB_POOL_PRE_PING == "idle":
+        ping_when_idle(engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    return engine
+
 
 # Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300
-)
+engine = make_engine(settings.DATABASE_URL, pool_metrics)
+
+# Read replica for read-only routes (see core/replica.py); None sends all reads to the primary
+replica_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = make_engine(settings.DATABASE_REPLICA_URL, replica_pool_metrics).execution_options(
+        postgresql_readonly=True
+    )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine or engine)
 
 # Create Base class
 Base = declarative_base()
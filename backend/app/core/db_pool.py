@@ -0,0 +1,196 @@
+import threading
+import time
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the wait/hold histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Prometheus-style histogram; callers hold the lock when observing from threads.
+
+    observe() bumps a single bucket (found by bisection) so it stays cheap on
+    hot paths; counts are made cumulative when read.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot: above the largest bound (+Inf)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+        self.counts[bisect_left(self.buckets, value)] += 1
+
+    def copy(self) -> "Histogram":
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.count, histogram.sum, histogram.max = self.count, self.sum, self.max
+        return histogram
+
+    def cumulative(self) -> List[int]:
+        """Observations <= each bound, in bucket order (excluding +Inf, which is count)"""
+        return list(accumulate(self.counts[:-1]))
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "buckets": {str(bound): count for bound, count in zip(self.buckets, self.cumulative())},
+        }
+
+
+class PoolMetrics:
+    """
+    Counters for the connection pool, updated from pool events in whichever
+    thread checks a connection out, so updates take a lock
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wait = Histogram()  # Time to get a connection: queueing for a free one, or opening one
+        self.hold = Histogram()  # Time a connection stays checked out
+        self.checkouts = 0
+        self.timeouts = 0  # Checkouts that gave up after pool_timeout
+        self.connections_opened = 0
+        self.invalidated = 0
+        self.peak_checked_out = 0
+
+    def observe_wait(self, seconds: float, checked_out: int) -> None:
+        with self._lock:
+            self.wait.observe(seconds)
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def observe_hold(self, seconds: float) -> None:
+        with self._lock:
+            self.hold.observe(seconds)
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def read(self) -> Tuple[Dict[str, int], Histogram, Histogram]:
+        """Consistent copy of the counters and the wait/hold histograms"""
+        with self._lock:
+            counters = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+                "invalidated": self.invalidated,
+            }
+            return counters, self.wait.copy(), self.hold.copy()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+                "invalidated": self.invalidated,
+                "peak_checked_out": self.peak_checked_out,
+                "wait_seconds": self.wait.snapshot(),
+                "hold_seconds": self.hold.snapshot(),
+            }
+
+
+pool_metrics = PoolMetrics()
+replica_pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including the wait for a free connection"""
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.count("timeouts")
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started, self.checkedout())
+        return connection
+
+
+def instrumented_pool_class(metrics: PoolMetrics) -> type:
+    """Pool class recording into its own metrics (a class attribute survives pool.recreate())"""
+    return type("InstrumentedQueuePool", (InstrumentedQueuePool,), {"metrics": metrics})
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics = pool_metrics) -> None:
+    """Record connection opens, invalidations and hold times for the engine's pool"""
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.count("connections_opened")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidated")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.observe_hold(time.perf_counter() - checked_out_at)
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+
+def ping_when_idle(engine: Engine, idle_seconds: float) -> None:
+    """
+    Pre-ping only connections that sat in the pool longer than idle_seconds.
+
+    pool_pre_ping costs a round trip on every checkout; connections reused
+    within moments of being returned are almost never dead. A failed ping
+    raises DisconnectionError, so the pool discards the connection and
+    retries with a fresh one.
+    """
+
+    @event.listens_for(engine, "checkout")
+    def ping_idle_connection(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            raise exc.DisconnectionError() from e
+
+
+def pool_status(engine: Engine) -> Dict:
+    """Current gauges of a QueuePool: size, checked out/in and overflow in use"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # overflow() counts from -size while the pool fills up
+        "overflow_in_use": max(0, pool.overflow()),
+    }
@@ -0,0 +1,70 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+def parse_fields(
+    fields: Optional[str],
+    model: Type[BaseModel],
+    always: Tuple[str, ...] = (),
+    computed: Tuple[str, ...] = ()
+) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a "fields=a,b" query value against a response model's fields.
+
+    Returns None when no fieldset was requested. Key fields in `always` are
+    added so rows stay identifiable; `computed` lists the computed fields the
+    endpoint can produce in SQL.
+    """
+    if not fields:
+        return None
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    # Fields excluded from the response (internal columns) can't be requested either
+    allowed = {name for name, field in model.model_fields.items() if not field.exclude} | set(computed)
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}"
+        )
+    # Dedupe, keeping the requested order
+    return tuple(dict.fromkeys([*always, *requested]))
+
+
+def select_columns(entity, fields: Tuple[str, ...], expressions: Optional[Dict] = None) -> List:
+    """Columns for Query.with_entities, so only the requested fields are read"""
+    expressions = expressions or {}
+    return [
+        expressions[name].label(name) if name in expressions else getattr(entity, name)
+        for name in fields
+    ]
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Response model with just `fields`, built once per distinct fieldset"""
+    definitions = {}
+    for name in fields:
+        if name in model.model_fields:
+            annotation = model.model_fields[name].annotation
+        else:
+            annotation = model.model_computed_fields[name].return_type
+        definitions[name] = (Optional[annotation], None)
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions
+    )
+
+
+@lru_cache(maxsize=256)
+def sparse_list_model(list_model: Type[BaseModel], items_field: str, item_model: Type[BaseModel]) -> Type[BaseModel]:
+    """A paginated list model whose items use a sparse item model"""
+    return create_model(
+        f"{item_model.__name__}List",
+        __base__=list_model,
+        **{items_field: (List[item_model], ...)}
+    )
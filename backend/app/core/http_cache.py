@@ -0,0 +1,80 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from .config import settings
+
+# Authenticated data: browsers may keep it but must revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the values that identify one version of a representation"""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def query_fingerprint(request: Request) -> str:
+    """Order-independent form of the query string (filters, page, fields)"""
+    return "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+
+
+def as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_settled(last_modified: Optional[datetime], now: datetime) -> bool:
+    """
+    Whether a list's newest change is older than SYNC_SAFETY_LAG_SECONDS.
+
+    updated_at is a transaction's start time, so a transaction still running
+    can commit rows that move neither the count nor max(updated_at). Until the
+    newest change is older than the longest expected transaction (the lag delta
+    sync uses), those two values don't prove the list is unchanged.
+    """
+    return last_modified is None or last_modified <= now - timedelta(seconds=settings.SYNC_SAFETY_LAG_SECONDS)
+
+
+def validator_headers(etag: Optional[str], last_modified: Optional[datetime]) -> Dict[str, str]:
+    """Cache headers; without an ETag the response carries no validators, so it is refetched in full"""
+    headers = {"Cache-Control": CACHE_CONTROL}
+    if etag is None:
+        return headers
+    headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_fresh(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    True when the client's copy is current. If-None-Match wins over
+    If-Modified-Since; weak validators (e.g. after compression) still match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        tags = (tag.strip() for tag in if_none_match.split(","))
+        return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
@@ -0,0 +1,183 @@
+import time
+from typing import Awaitable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .db_pool import Histogram
+
+# Upper bounds (seconds) of the request latency buckets
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RouteSeries:
+    """Latency histogram and response counts by status for one method and route template"""
+
+    __slots__ = ("latency", "responses")
+
+    def __init__(self):
+        self.latency = Histogram(REQUEST_BUCKETS)  # seconds
+        self.responses: Dict[int, int] = {}  # status -> count
+
+
+class RequestMetrics:
+    """
+    Latency and response counts per route template, and in-flight requests
+    for this worker.
+
+    Updated only from the event loop, so no locking. Series are created the
+    first time a route is hit; afterwards a request costs one dict lookup,
+    a histogram bucket increment and a counter increment.
+    """
+
+    __slots__ = ("in_flight", "series")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.series: Dict[Tuple[str, str], RouteSeries] = {}  # (method, route) -> series
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        series = self.series.get((method, route))
+        if series is None:
+            series = self.series[(method, route)] = RouteSeries()
+        series.latency.observe(seconds)
+        responses = series.responses
+        responses[status_code] = responses.get(status_code, 0) + 1
+
+
+class SocketMetrics:
+    """Socket.IO events emitted by this worker, by event name"""
+
+    __slots__ = ("emitted",)
+
+    def __init__(self):
+        self.emitted: Dict[str, int] = {}
+
+    def count_emit(self, event: str) -> None:
+        self.emitted[event] = self.emitted.get(event, 0) + 1
+
+
+request_metrics = RequestMetrics()
+socket_metrics = SocketMetrics()
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The matched route's path template (/api/farmers/{farmer_id}), so series
+    don't multiply per ID; unrouted paths share one label
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path_format
+    if scope["path"].startswith(f"/{settings.UPLOAD_DIR}/"):
+        return f"/{settings.UPLOAD_DIR}"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status and in-flight count of every HTTP request for /metrics.
+
+    Latency runs until the last body chunk is sent, so streaming and
+    compression time count. Must wrap the routing (the route is read from
+    the scope after the app returns).
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status_code = 500  # If the app fails before starting a response
+        started = time.perf_counter()
+
+        # A plain function handing back send's awaitable, so no extra coroutine per message
+        def send_with_status(message: Message) -> Awaitable[None]:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            return send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(scope["method"], route_template(scope), status_code, time.perf_counter() - started)
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Optional[Dict]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsWriter:
+    """Builds a Prometheus text exposition, one metric family at a time"""
+
+    def __init__(self, prefix: str = "moriarty_"):
+        self.prefix = prefix
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> str:
+        name = self.prefix + name
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        return name
+
+    def sample(self, name: str, value, labels: Optional[Dict] = None) -> None:
+        self.lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+
+    def gauge(self, name: str, help_text: str, samples: Iterable[Tuple[Optional[Dict], float]]) -> None:
+        name = self.family(name, "gauge", help_text)
+        for labels, value in samples:
+            self.sample(name, value, labels)
+
+    def counter(self, name: str, help_text: str, samples: Iterable[Tuple[Optional[Dict], float]]) -> None:
+        name = self.family(name + "_total", "counter", help_text)
+        for labels, value in samples:
+            self.sample(name, value, labels)
+
+    def histogram(self, name: str, help_text: str, samples: Iterable[Tuple[Optional[Dict], Histogram]]) -> None:
+        name = self.family(name, "histogram", help_text)
+        for labels, histogram in samples:
+            labels = labels or {}
+            for bound, count in zip(histogram.buckets, histogram.cumulative()):
+                self.sample(f"{name}_bucket", count, {**labels, "le": bound})
+            self.sample(f"{name}_bucket", histogram.count, {**labels, "le": "+Inf"})
+            self.sample(f"{name}_sum", histogram.sum, labels)
+            self.sample(f"{name}_count", histogram.count, labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def write_request_metrics(writer: MetricsWriter, metrics: RequestMetrics = request_metrics) -> None:
+    writer.gauge("http_requests_in_flight", "HTTP requests being handled", [(None, metrics.in_flight)])
+    series = list(metrics.series.items())
+    writer.counter("http_requests", "HTTP responses by route template and status", [
+        ({"method": method, "route": route, "status": status_code}, count)
+        for (method, route), route_series in series
+        for status_code, count in list(route_series.responses.items())
+    ])
+    writer.histogram("http_request_duration_seconds", "HTTP request latency by route template", [
+        ({"method": method, "route": route}, route_series.latency)
+        for (method, route), route_series in series
+    ])
@@ -0,0 +1,42 @@
+import base64
+import json
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode keyset pagination values as an opaque URL-safe cursor"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def decode_cursor(cursor: str, **fields) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor. Keyword arguments name the
+    keys it must carry and their accepted types, e.g. id=int; anything else
+    is a 400 rather than an error in the query.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+
+    if not isinstance(values, dict):
+        raise invalid_cursor()
+    for key, types in fields.items():
+        if key not in values:
+            raise invalid_cursor()
+        value = values[key]
+        # JSON true/false would pass as int
+        if isinstance(value, bool) or not isinstance(value, types):
+            raise invalid_cursor()
+    return values
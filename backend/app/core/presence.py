@@ -0,0 +1,148 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import update
+
+from .database import SessionLocal
+
+
+class PresenceRegistry:
+    """
+    In-memory registry of users connected over Socket.IO.
+
+    Heartbeats only touch a dict entry; last-seen timestamps are written to
+    users.last_seen_at in batches. The registry is only touched on the event
+    loop: drain() there, then write() the drained batch from a worker thread.
+    """
+
+    __slots__ = ("_sids", "_connections", "_last_seen", "_dirty", "_snapshot")
+
+    def __init__(self):
+        self._sids: Dict[str, int] = {}  # sid -> user_id
+        self._connections: Dict[int, int] = {}  # user_id -> open socket count
+        self._last_seen: Dict[int, float] = {}  # user_id -> epoch seconds
+        self._dirty: Set[int] = set()  # user_ids seen since the last flush
+        self._snapshot: Optional[Tuple[int, ...]] = None
+
+    def connect(self, sid: str, user_id: int) -> None:
+        """Register a socket for a user and mark the user as seen"""
+        self._sids[sid] = user_id
+        count = self._connections.get(user_id, 0)
+        self._connections[user_id] = count + 1
+        if count == 0:
+            self._snapshot = None
+        self.touch(user_id)
+
+    def disconnect(self, sid: str) -> Optional[int]:
+        """Drop a socket; returns the user ID it belonged to, if any"""
+        user_id = self._sids.pop(sid, None)
+        if user_id is None:
+            return None
+
+        remaining = self._connections.get(user_id, 1) - 1
+        if remaining > 0:
+            self._connections[user_id] = remaining
+        else:
+            self._connections.pop(user_id, None)
+            self._snapshot = None
+        self.touch(user_id)
+        return user_id
+
+    def touch(self, user_id: int) -> None:
+        """Record activity for a user without touching the database"""
+        self._last_seen[user_id] = time.time()
+        self._dirty.add(user_id)
+
+    def touch_sid(self, sid: str) -> None:
+        """Record activity for the user owning a socket"""
+        user_id = self._sids.get(sid)
+        if user_id is not None:
+            self.touch(user_id)
+
+    def user_for_sid(self, sid: str) -> Optional[int]:
+        return self._sids.get(sid)
+
+    def is_online(self, user_id: int) -> bool:
+        return user_id in self._connections
+
+    def online_count(self) -> int:
+        return len(self._connections)
+
+    def online_user_ids(self) -> Tuple[int, ...]:
+        """Online user IDs; rebuilt only when someone comes or goes"""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._connections)
+        return self._snapshot
+
+    def last_seen(self, user_id: int) -> Optional[float]:
+        return self._last_seen.get(user_id)
+
+    def pending_count(self) -> int:
+        """Users whose last-seen time waits for the next flush"""
+        return len(self._dirty)
+
+    def drain(self) -> List[Tuple[int, float]]:
+        """Take the (user_id, last_seen) pairs that changed since the last drain"""
+        dirty, self._dirty = self._dirty, set()
+        return [(user_id, self._last_seen[user_id]) for user_id in dirty]
+
+    def requeue(self, pending: List[Tuple[int, float]]) -> None:
+        """Mark a batch that failed to write as pending again"""
+        self._dirty.update(user_id for user_id, _ in pending)
+
+    @staticmethod
+    def write(pending: List[Tuple[int, float]]) -> int:
+        """Write drained (user_id, last_seen) pairs to users.last_seen_at in one batch"""
+        from ..models.user import User
+
+        if not pending:
+            return 0
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(User),
+                [
+                    {
+                        "user_id": user_id,
+                        "last_seen_at": datetime.fromtimestamp(seen, tz=timezone.utc)
+                    }
+                    for user_id, seen in pending
+                ]
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        return len(pending)
+
+
+async def flush(registry: "PresenceRegistry") -> int:
+    """Drain on the loop, write from a thread; a failed batch is retried next time"""
+    pending = registry.drain()
+    try:
+        return await asyncio.to_thread(registry.write, pending)
+    except Exception:
+        registry.requeue(pending)
+        raise
+
+
+async def run_flush_loop(registry: "PresenceRegistry", interval: float) -> None:
+    """Periodically flush presence to the database until cancelled"""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await flush(registry)
+            except Exception as e:
+                print(f"Presence flush failed: {e}")
+    finally:
+        await flush(registry)
+
+
+presence = PresenceRegistry()
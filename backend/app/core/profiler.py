@@ -0,0 +1,197 @@
+import asyncio
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Optional, Set
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# (path suffix, function) a thread sits in when it has nothing to do; samples
+# blocked there are dropped unless include_idle is set
+IDLE_WAITS = {
+    ("selectors.py", "select"),  # Event loop waiting for I/O
+    (os.path.join("concurrent", "futures", "thread.py"), "_worker"),  # Executor thread waiting for work
+    (os.path.join("anyio", "_backends", "_asyncio.py"), "run"),  # Threadpool (sync endpoint) thread waiting for work
+}
+# Frames skipped from the top of a stack before checking IDLE_WAITS
+WAIT_MODULES = ("threading.py", "queue.py")
+
+
+def route_pattern(template: str) -> "re.Pattern":
+    """Regex for a route template: /api/uploads/{upload_id} matches /api/uploads/abc"""
+    parts = re.split(r"(\{[^}]+\})", template.rstrip("/") or "/")
+    return re.compile("".join("[^/]+" if part.startswith("{") else re.escape(part) for part in parts) + "/?")
+
+
+class ProfileBusy(Exception):
+    """Raised when a profile is requested while another one is running"""
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for the live worker.
+
+    A background thread snapshots every thread's Python stack every interval
+    and counts identical stacks, producing folded stacks ("thread;outer;inner
+    count" per line) that flamegraph.pl and speedscope read directly. Nothing
+    runs while no profile is active: the middleware checks one attribute.
+
+    In request mode, samples are taken only while a matching request is in
+    flight. On the event loop thread only samples where the request's task is
+    running count; threadpool threads (sync endpoints, to_thread work) are
+    sampled whole, so concurrent requests can leak into the profile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running = False
+        self.route: Optional["re.Pattern"] = None  # Set while profiling requests
+        self._remaining = 0  # Matching requests still to claim
+        self._pending = 0  # Claimed requests not finished
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._finished: Optional[asyncio.Event] = None
+        self._filenames: Dict[str, str] = {}
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def _begin(self) -> None:
+        with self._lock:
+            if self.running:
+                raise ProfileBusy()
+            self.running = True
+        self.stacks = Counter()
+        self.samples = 0
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+
+    async def _sample_while(self, waiter, interval: float, include_idle: bool) -> None:
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample_loop, args=(interval, include_idle, stop), name="profiler", daemon=True
+        )
+        sampler.start()
+        try:
+            await waiter
+        finally:
+            stop.set()
+            await asyncio.to_thread(sampler.join)
+            self.route = None
+            self._tasks.clear()
+            self.running = False
+
+    async def profile_for(self, seconds: float, interval: float, include_idle: bool = False) -> Counter:
+        """Sample every thread for the given number of seconds"""
+        self._begin()
+        await self._sample_while(asyncio.sleep(seconds), interval, include_idle)
+        return self.stacks
+
+    async def profile_requests(
+        self, template: str, count: int, timeout: float, interval: float, include_idle: bool = False
+    ) -> Counter:
+        """Sample the next count requests whose path matches the route template (or until timeout)"""
+        self._begin()
+        self._remaining, self._pending = count, 0
+        self._finished = asyncio.Event()
+        self.route = route_pattern(template)
+
+        async def wait_for_requests():
+            try:
+                await asyncio.wait_for(self._finished.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        await self._sample_while(wait_for_requests(), interval, include_idle)
+        return self.stacks
+
+    def claim(self, path: str) -> bool:
+        """Whether a request should be profiled; called by the middleware on the event loop"""
+        route = self.route
+        if route is None or self._remaining <= 0 or not route.fullmatch(path):
+            return False
+        self._remaining -= 1
+        self._pending += 1
+        self._tasks.add(asyncio.current_task())
+        return True
+
+    def release(self) -> None:
+        self._tasks.discard(asyncio.current_task())
+        self._pending -= 1
+        if self._remaining <= 0 and self._pending <= 0 and self._finished is not None:
+            self._finished.set()
+
+    def _sample_loop(self, interval: float, include_idle: bool, stop: threading.Event) -> None:
+        own_thread = threading.get_ident()
+        while not stop.wait(interval):
+            request_mode = self.route is not None
+            if request_mode and not self._tasks:
+                continue
+            loop_task = asyncio.current_task(self._loop) if request_mode else None
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_thread:
+                    continue
+                if request_mode and ident == self._loop_thread and loop_task not in self._tasks:
+                    continue
+                stack = self._fold(frame, include_idle)
+                if stack:
+                    self.stacks[f"{names.get(ident, ident)};{stack}"] += 1
+            self.samples += 1
+
+    def _fold(self, frame, include_idle: bool) -> Optional[str]:
+        """Outermost-first frame labels joined by ';', or None for an idle thread"""
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+
+        if not include_idle:
+            top = 0
+            while top < len(codes) - 1 and codes[top].co_filename.endswith(WAIT_MODULES):
+                top += 1
+            filename, name = codes[top].co_filename, codes[top].co_name
+            if any(filename.endswith(suffix) and name == function for suffix, function in IDLE_WAITS):
+                return None
+
+        return ";".join(
+            f"{code.co_name} ({self._short_filename(code.co_filename)}:{code.co_firstlineno})"
+            for code in reversed(codes)
+        )
+
+    def _short_filename(self, filename: str) -> str:
+        """Path relative to its sys.path entry (app/api/inventory.py, starlette/routing.py)"""
+        short = self._filenames.get(filename)
+        if short is None:
+            roots = [path for path in sys.path if path and filename.startswith(path.rstrip(os.sep) + os.sep)]
+            short = os.path.relpath(filename, max(roots, key=len)) if roots else filename
+            self._filenames[filename] = short
+        return short
+
+
+def folded(stacks: Counter) -> str:
+    """Folded stack lines, heaviest first"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """Mark requests matching an active request profile; a single attribute check otherwise"""
+
+    def __init__(self, app: ASGIApp, profiler: "SamplingProfiler" = None):
+        self.app = app
+        self.profiler = profiler or sampling_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profiler = self.profiler
+        if profiler.route is None or scope["type"] != "http" or not profiler.claim(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.release()
+
+
+sampling_profiler = SamplingProfiler()
@@ -0,0 +1,96 @@
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Table
+
+
+class QueryShapeRecorder:
+    """
+    Counts which filter combinations list endpoints are actually called with.
+
+    A shape is the set of filters a request applied, not their values, so the
+    counters stay small (at most 2^filters per endpoint) and hold no user data.
+    Counts are per process and reset on restart.
+    """
+
+    __slots__ = ("_shapes",)
+
+    def __init__(self):
+        self._shapes: Dict[str, Counter] = {}
+
+    def record(self, endpoint: str, filters: Dict[str, Any]) -> None:
+        """Count one request; filters that are None/empty/False were not applied"""
+        shape = frozenset(name for name, value in filters.items() if value)
+        self._shapes.setdefault(endpoint, Counter())[shape] += 1
+
+    def shapes(self, endpoint: str) -> Counter:
+        return Counter(self._shapes.get(endpoint, {}))
+
+    def endpoints(self) -> List[str]:
+        return sorted(self._shapes)
+
+    def reset(self) -> None:
+        self._shapes.clear()
+
+
+def serves(index_columns: Sequence[Optional[str]], shape: FrozenSet[str]) -> bool:
+    """
+    True if an index answers an equality-only shape from its leading columns
+    alone (column order among equality filters doesn't matter)
+    """
+    leading = index_columns[:len(shape)]
+    return len(leading) == len(shape) and set(leading) == shape
+
+
+def propose_indexes(table: Table, shapes: Counter, existing: Iterable[Sequence[Optional[str]]],
+                    min_share: float = 0.01) -> List[Dict[str, Any]]:
+    """
+    B-tree indexes for the equality filter shapes no existing index serves.
+
+    Only filters that are plain columns of the table count (search and
+    computed predicates need trigram/partial indexes, chosen by hand). Shapes
+    under min_share of the endpoint's requests are ignored. Columns are
+    ordered by how many requests filter on them, so one index's prefixes
+    serve as many other shapes as possible.
+    """
+    total = sum(shapes.values())
+    if not total:
+        return []
+
+    column_shapes = Counter()
+    for shape, count in shapes.items():
+        column_shapes[frozenset(name for name in shape if name in table.c)] += count
+
+    column_requests = Counter()
+    for shape, count in column_shapes.items():
+        for name in shape:
+            column_requests[name] += count
+
+    indexes = [list(columns) for columns in existing]
+    proposals = []
+    for shape, count in column_shapes.most_common():
+        if not shape or count < total * min_share:
+            continue
+        if any(serves(columns, shape) for columns in indexes):
+            continue
+
+        columns = sorted(shape, key=lambda name: (-column_requests[name], name))
+        indexes.append(columns)
+        name = f"idx_{table.name}_{'_'.join(columns)}"
+        proposals.append({
+            "name": name,
+            "columns": columns,
+            "requests": count,
+            "share": round(count / total, 4),
+            "sql": f"CREATE INDEX CONCURRENTLY {name} ON {table.name} ({', '.join(columns)})"
+        })
+
+    # Requests each proposal would serve, including other shapes that match its prefixes
+    for proposal in proposals:
+        proposal["serves_requests"] = sum(
+            count for shape, count in column_shapes.items() if shape and serves(proposal["columns"], shape)
+        )
+    return proposals
+
+
+query_shapes = QueryShapeRecorder()
@@ -0,0 +1,129 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .db_pool import Histogram
+
+# Upper bounds of the statements-per-request buckets
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class RequestQueryStats:
+    """SQL statements one request executed, and the time spent in them"""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()  # SQL text (parameters are placeholders) -> executions
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least threshold times: the same query per row is the N+1 signature"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+class QueryTotals:
+    """Statements and database time summed over every request this worker handled"""
+
+    __slots__ = ("count", "seconds", "per_request")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.per_request = Histogram(QUERY_COUNT_BUCKETS)  # Statements per request
+
+    def add(self, stats: RequestQueryStats) -> None:
+        self.count += stats.count
+        self.seconds += stats.seconds
+        self.per_request.observe(stats.count)
+
+
+query_totals = QueryTotals()
+
+# Stats of the request being handled; threadpool calls share the object
+# because they run in a copy of the request's context
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_started_at"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+@event.listens_for(Engine, "handle_error")
+def discard_query_timer(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+
+class QueryStatsMiddleware:
+    """
+    Count SQL statements and database time per HTTP request.
+
+    Requests over QUERY_LOG_COUNT_THRESHOLD statements or QUERY_LOG_TIME_MS
+    are logged with any statement repeated N_PLUS_ONE_THRESHOLD times (an
+    N+1 suspect). In DEBUG the counts are sent as X-DB-Queries/X-DB-Time-Ms
+    and Server-Timing headers, for the browser's network panel.
+    """
+
+    def __init__(self, app: ASGIApp, expose_headers: bool = None):
+        self.app = app
+        self.expose_headers = settings.DEBUG if expose_headers is None else expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_headers:
+                milliseconds = stats.seconds * 1000
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{milliseconds:.1f}"
+                headers.append("Server-Timing", f'db;dur={milliseconds:.1f};desc="{stats.count} queries"')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+            query_totals.add(stats)
+            log_request(scope, stats)
+
+
+def log_request(scope: Scope, stats: RequestQueryStats) -> None:
+    milliseconds = stats.seconds * 1000
+    suspects = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+    if stats.count < settings.QUERY_LOG_COUNT_THRESHOLD and milliseconds < settings.QUERY_LOG_TIME_MS and not suspects:
+        return
+
+    print(f"SQL: {scope['method']} {scope['path']} ran {stats.count} queries in {milliseconds:.1f}ms")
+    for statement, count in suspects:
+        print(f"  N+1 suspect ({count}x): {' '.join(statement.split())[:200]}")
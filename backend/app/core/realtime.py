@@ -0,0 +1,42 @@
+import socketio
+
+from .config import settings
+from .metrics import socket_metrics
+
+
+class InstrumentedAsyncServer(socketio.AsyncServer):
+    """AsyncServer that counts emitted events for /metrics"""
+
+    async def emit(self, event, *args, **kwargs):
+        socket_metrics.count_emit(event)
+        return await super().emit(event, *args, **kwargs)
+
+
+def socket_counts(server: socketio.AsyncServer, namespace: str = "/") -> dict:
+    """Connected clients and named rooms (excluding each client's own room) in a namespace"""
+    rooms = server.manager.rooms.get(namespace, {})
+    clients = rooms.get(None, {})
+    return {
+        "clients": len(clients),
+        "rooms": sum(1 for room in rooms if room is not None and room not in clients),
+    }
+
+
+# Socket.IO server shared by main.py and background services that push events
+sio = InstrumentedAsyncServer(
+    async_mode='asgi',
+    cors_allowed_origins=settings.ALLOWED_ORIGINS
+)
+
+
+USER_ROOM_PREFIX = "user_"
+
+
+def user_room(user_id: int) -> str:
+    """Room every socket of a user joins, for user-targeted notifications"""
+    return f"{USER_ROOM_PREFIX}{user_id}"
+
+
+def is_user_room(room: str) -> bool:
+    """User rooms are entered only on an authenticated connect, never on request"""
+    return room.startswith(USER_ROOM_PREFIX)
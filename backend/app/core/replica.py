@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from fastapi import Depends
+from sqlalchemy import event, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import SessionLocal, ReplicaSessionLocal, get_db, replica_engine
+from .security import get_current_user
+from ..models.user import User, UserWrite
+
+# Seconds the replica is behind. Zero when it has replayed everything it
+# received; comparing with now() alone would report an idle primary as lag.
+# A server that is not a standby (two independent instances in local
+# testing) counts as caught up. NULL (nothing replayed yet) counts as lagging.
+REPLICA_LAG = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class ReadRouter:
+    """
+    Decides per request whether a read-only route may use the replica.
+
+    Reads go to the primary when no replica is configured, while the replica
+    lags more than max_lag_seconds (or its lag is unknown), and for sticky_seconds
+    after the requesting user committed a write, so users see their own changes.
+    The write time is user_writes.last_write_at, so it holds across worker processes.
+    """
+
+    def __init__(self, enabled: bool, max_lag_seconds: float, sticky_seconds: float):
+        self.enabled = enabled
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = sticky_seconds
+        self.lag_seconds: Optional[float] = None  # Unknown until the first check
+        self.lag_checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.primary_reads = 0  # Routed to the primary by lag or stickiness
+
+    def replica_healthy(self) -> bool:
+        return self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+
+    def use_replica(self, last_write_at: Optional[datetime]) -> bool:
+        if not self.enabled:
+            return False
+        # last_write_at comes from the database clock; the window absorbs small skew
+        sticky = (
+            last_write_at is not None
+            and last_write_at > datetime.now(timezone.utc) - timedelta(seconds=self.sticky_seconds)
+        )
+        with self._lock:
+            use = not sticky and self.replica_healthy()
+            if use:
+                self.replica_reads += 1
+            else:
+                self.primary_reads += 1
+        return use
+
+    def check_lag(self) -> Optional[float]:
+        """Measure replica lag (blocking); an unreachable replica counts as lagging"""
+        try:
+            with replica_engine.connect() as conn:
+                lag = conn.execute(REPLICA_LAG).scalar()
+            self.lag_seconds = None if lag is None else max(0.0, float(lag))
+        except Exception as e:
+            print(f"Replica lag check failed: {e}")
+            self.lag_seconds = None
+        self.lag_checked_at = time.time()
+        return self.lag_seconds
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "healthy": self.replica_healthy(),
+                "lag_seconds": self.lag_seconds,
+                "lag_checked_at": self.lag_checked_at,
+                "max_lag_seconds": self.max_lag_seconds,
+                "replica_reads": self.replica_reads,
+                "primary_reads": self.primary_reads,
+            }
+
+
+async def run_lag_monitor(router: ReadRouter, interval: float) -> None:
+    """Refresh the replica lag until cancelled, so requests never wait on the check"""
+    while True:
+        await asyncio.to_thread(router.check_lag)
+        await asyncio.sleep(interval)
+
+
+read_router = ReadRouter(
+    enabled=replica_engine is not None,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.REPLICA_STICKY_SECONDS
+)
+
+
+# session.info key set once a primary session has written in its current transaction
+WROTE = "wrote"
+
+
+def has_unflushed_writes(session: Session) -> bool:
+    return bool(session.new or session.deleted) or any(session.is_modified(obj) for obj in session.dirty)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def note_flushed_writes(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here
+    if has_unflushed_writes(session):
+        session.info[WROTE] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def note_statement_writes(orm_execute_state):
+    # Bulk query().update()/delete() and insert/update/delete statements run through the session
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WROTE] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def forget_writes(session):
+    session.info.pop(WROTE, None)
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def make_writer_sticky(session):
+    # get_current_user records whose session this is. Commits that wrote nothing
+    # (read-only requests) leave no stamp. before_commit runs before the final
+    # flush, so unflushed changes count too. Stamped inside the commit itself,
+    # so no worker can see the write without it.
+    user_id = session.info.get("user_id")
+    if user_id is None or not read_router.enabled:
+        return
+    if not (session.info.get(WROTE) or has_unflushed_writes(session)):
+        return
+    stamp = insert(UserWrite).values(user_id=user_id, last_write_at=func.clock_timestamp())
+    session.execute(stamp.on_conflict_do_update(
+        index_elements=[UserWrite.user_id],
+        set_={"last_write_at": stamp.excluded.last_write_at}
+    ))
+
+
+def last_write_at(db: Session, user_id: int) -> Optional[datetime]:
+    return db.scalar(select(UserWrite.last_write_at).where(UserWrite.user_id == user_id))
+
+
+def get_read_db(current_user: User = Depends(get_current_user), primary: Session = Depends(get_db)):
+    """
+    Session for read-only routes: the replica when it is caught up and the
+    user has not just written, otherwise the request's primary session (one
+    primary connection per request, not two). The write stamp is read from
+    the primary, so it is current.
+    """
+    written_at = last_write_at(primary, current_user.user_id) if read_router.replica_healthy() else None
+    if not read_router.use_replica(written_at):
+        yield primary
+        return
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,15 @@
+from typing import Dict, Optional
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def model_response(model: BaseModel, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    """
+    Serialize an already-validated response model in one pass.
+
+    Returning a Response skips FastAPI's dump/re-validate/encode of the
+    return value; pydantic's serializer produces JSON types and orjson
+    writes the bytes. Keep response_model on the route for the OpenAPI schema.
+    """
+    return ORJSONResponse(model.model_dump(mode="json"), status_code=status_code, headers=headers)
@@ -84,4 +84,6 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    # Commits on this session make the user's next reads use the primary (core/replica.py)
+    db.info["user_id"] = user_id
     return user
\ No newline at end of file
@@ -0,0 +1,127 @@
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from typing import Iterator, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from .config import settings
+
+# Blob store files and their variants are named by content hash, so a URL
+# always means the same bytes: <sha256><ext> or <sha256>_<variant><ext>
+FINGERPRINTED_NAME = re.compile(r"^([0-9a-f]{64})(?:_([a-z]+))?\.[A-Za-z0-9]+$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+RANGE_READ_SIZE = 64 * 1024
+
+IMMUTABLE_CACHE_CONTROL = f"public, max-age={settings.UPLOAD_CACHE_MAX_AGE}, immutable"
+# Other files (legacy per-record paths) may be replaced in place: revalidate every time
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+
+def file_etag(full_path: str, stat_result: os.stat_result) -> Tuple[str, bool]:
+    """Strong ETag and whether the file is immutable (named by its content hash)"""
+    match = FINGERPRINTED_NAME.match(os.path.basename(full_path))
+    if match:
+        sha256, variant = match.groups()
+        return f'"{sha256}-{variant}"' if variant else f'"{sha256}"', True
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"', False
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=start-end" range into inclusive offsets; returns None
+    when it cannot be satisfied (multipart ranges are not supported)
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or size == 0:
+        return None
+    start, end = match.groups()
+    if not start:
+        # Suffix range: the last N bytes
+        if not end or int(end) == 0:
+            return None
+        return max(size - int(end), 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end:
+        return None
+    return start, end
+
+
+def read_range(full_path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(full_path, "rb") as data:
+        data.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = data.read(min(RANGE_READ_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class UploadFiles(StaticFiles):
+    """
+    StaticFiles for /uploads with long-lived caching of fingerprinted files,
+    strong ETags, bodiless 304s on revalidation and single-range requests
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = str(full_path)
+        request_headers = Headers(scope=scope)
+        etag, immutable = file_etag(full_path, stat_result)
+        headers = {
+            "etag": etag,
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "accept-ranges": "bytes",
+        }
+        if status_code != 200:
+            # e.g. the 404.html page in html mode
+            return FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+        # Revalidation: the client already has these bytes
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header and (not if_range or if_range.strip() == etag):
+            size = stat_result.st_size
+            byte_range = parse_range(range_header, size)
+            if byte_range is None:
+                return Response(status_code=416, headers={"content-range": f"bytes */{size}"})
+
+            start, end = byte_range
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            headers["content-length"] = str(end - start + 1)
+            media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+            if scope["method"] == "HEAD":
+                return Response(status_code=206, headers=headers, media_type=media_type)
+            return StreamingResponse(
+                read_range(full_path, start, end),
+                status_code=206,
+                headers=headers,
+                media_type=media_type,
+            )
+
+        return FileResponse(full_path, stat_result=stat_result, headers=headers)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)  # Content hash; also the file name on disk
+    size = Column(BigInteger, nullable=False)
+    extension = Column(String(10), nullable=False, default="")  # From the first upload, e.g. ".jpg"
+    ref_count = Column(Integer, nullable=False, default=0)  # Farmer photos / inventory documents pointing here
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, Text, Integer, ForeignKey, DateTime, Computed
+from sqlalchemy import Column, String, Date, Text, Integer, ForeignKey, DateTime, Computed, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -43,7 +43,7 @@ class ICRStatus(str, enum.Enum):
 class Farmer(Base):
     __tablename__ = "farmers"
 
-    beneficiary_id = Column(String(50), primary_key=True, index=True)
+    beneficiary_id = Column(String(50), primary_key=True)
     beneficiary_name = Column(String(255), nullable=False)
     phone_no = Column(String(15), nullable=True)
     aadhaar_no = Column(String(20), nullable=True)
@@ -66,8 +66,26 @@ class Farmer(Base):
     installation_remark = Column(Text, nullable=True)
     icr_status = Column(String(50), nullable=True)
     photos = Column(Text, nullable=True)
+    # JSON list of the photo URLs whose variants exist, set when they are rendered
+    rendered_photos = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    installer = relationship("User", foreign_keys=[installer_user_id])
\ No newline at end of file
+    installer = relationship("User", foreign_keys=[installer_user_id])
+
+    __table_args__ = (
+        Index("idx_farmers_scheme", scheme),
+        Index("idx_farmers_dispatch_status", dispatch_status),
+        Index("idx_farmers_installation_status", installation_status),
+        # Location drill-down: circle, circle+taluka, circle+taluka+village
+        Index("idx_farmers_location", circle_name, taluka_name, village_name),
+        Index("idx_farmers_installer", installer_user_id),
+        # Trigram indexes serve the ILIKE '%term%' search
+        Index("idx_farmers_name_trgm", beneficiary_name, postgresql_using="gin", postgresql_ops={"beneficiary_name": "gin_trgm_ops"}),
+        Index("idx_farmers_phone_trgm", phone_no, postgresql_using="gin", postgresql_ops={"phone_no": "gin_trgm_ops"}),
+        Index("idx_farmers_id_trgm", beneficiary_id, postgresql_using="gin", postgresql_ops={"beneficiary_id": "gin_trgm_ops"}),
+        Index("idx_farmers_created_at", created_at),
+        # Delta sync walks (updated_at, key) in order
+        Index("idx_farmers_updated_at", updated_at, beneficiary_id),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -24,8 +24,8 @@ class InventoryStatus(str, enum.Enum):
 class Inventory(Base):
     __tablename__ = "inventory"
 
-    id = Column(Integer, primary_key=True, index=True)
-    category = Column(Enum(InventoryCategory), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    category = Column(Enum(InventoryCategory), nullable=False)
     type = Column(String(50), nullable=False)  # 3hp, 5hp, 7.5hp, 520wp, 540wp
     specification = Column(String(50), nullable=True)  # 30, 50, 70, 100 (pump head)
     quantity = Column(Integer, nullable=False, default=0)
@@ -44,11 +44,26 @@ class Inventory(Base):
     # Relationships
     created_by = relationship("User", foreign_keys=[created_by_user_id])
 
+    __table_args__ = (
+        Index("idx_inventory_category", category),
+        Index("idx_inventory_status", status),
+        Index("idx_inventory_quantity", quantity),
+        # Only the (few) low-stock rows; serves low_stock_only, which compares two columns
+        Index("idx_inventory_low_stock", id, postgresql_where=quantity <= min_stock_level),
+        Index("idx_inventory_created_at", created_at),
+        # Search (ILIKE '%term%')
+        Index("idx_inventory_description_trgm", description, postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+        Index("idx_inventory_part_number_trgm", part_number, postgresql_using="gin", postgresql_ops={"part_number": "gin_trgm_ops"}),
+        Index("idx_inventory_supplier_trgm", supplier, postgresql_using="gin", postgresql_ops={"supplier": "gin_trgm_ops"}),
+        # Delta sync walks (updated_at, key) in order
+        Index("idx_inventory_updated_at", updated_at, id),
+    )
+
 
 class InventoryTransaction(Base):
     __tablename__ = "inventory_transactions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     inventory_id = Column(Integer, ForeignKey("inventory.id"), nullable=False)
     transaction_type = Column(String(20), nullable=False)  # 'in', 'out', 'adjustment'
     quantity = Column(Integer, nullable=False)
@@ -65,11 +80,16 @@ class InventoryTransaction(Base):
     inventory = relationship("Inventory", foreign_keys=[inventory_id])
     created_by = relationship("User", foreign_keys=[created_by_user_id])
 
+    __table_args__ = (
+        Index("idx_inventory_transactions_inventory_id", inventory_id),
+        Index("idx_inventory_transactions_created_at", created_at),
+    )
+
 
 class FarmerDispatch(Base):
     __tablename__ = "farmer_dispatches"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     farmer_beneficiary_id = Column(String(50), ForeignKey("farmers.beneficiary_id"), nullable=False)
     dispatch_date = Column(DateTime(timezone=True), server_default=func.now())
     status = Column(String(20), default="pending")  # pending, dispatched, delivered, installed
@@ -80,12 +100,13 @@ class FarmerDispatch(Base):
     # Relationships
     farmer = relationship("Farmer", foreign_keys=[farmer_beneficiary_id])
     created_by = relationship("User", foreign_keys=[created_by_user_id])
+    items = relationship("FarmerDispatchItem", back_populates="dispatch")
 
 
 class FarmerDispatchItem(Base):
     __tablename__ = "farmer_dispatch_items"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     dispatch_id = Column(Integer, ForeignKey("farmer_dispatches.id"), nullable=False)
     inventory_id = Column(Integer, ForeignKey("inventory.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
@@ -93,5 +114,5 @@ class FarmerDispatchItem(Base):
     total_cost = Column(Float, nullable=True)
 
     # Relationships
-    dispatch = relationship("FarmerDispatch", foreign_keys=[dispatch_id])
-    inventory = relationship("Inventory", foreign_keys=[inventory_id])
\ No newline at end of file
+    dispatch = relationship("FarmerDispatch", foreign_keys=[dispatch_id], back_populates="items")
+    inventory = relationship("Inventory", foreign_keys=[inventory_id])
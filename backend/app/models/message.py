@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, ARRAY
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -7,7 +8,7 @@ from ..core.database import Base
 class ChatGroup(Base):
     __tablename__ = "chat_groups"
 
-    group_id = Column(Integer, primary_key=True, index=True)
+    group_id = Column(Integer, primary_key=True)
     group_name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     created_by_user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
@@ -22,7 +23,7 @@ class ChatGroup(Base):
 class ChatGroupMember(Base):
     __tablename__ = "chat_group_members"
 
-    member_id = Column(Integer, primary_key=True, index=True)
+    member_id = Column(Integer, primary_key=True)
     group_id = Column(Integer, ForeignKey("chat_groups.group_id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -36,21 +37,31 @@ class ChatGroupMember(Base):
 class Message(Base):
     __tablename__ = "messages"
 
-    message_id = Column(Integer, primary_key=True, index=True)
+    message_id = Column(Integer, primary_key=True)
     group_id = Column(Integer, ForeignKey("chat_groups.group_id"), nullable=False)
     sender_user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
     content = Column(Text, nullable=False)
     message_type = Column(String(20), default="text")  # text, image, file, etc.
     file_url = Column(String(500), nullable=True)
     reply_to_message_id = Column(Integer, ForeignKey("messages.message_id"), nullable=True)
-    mentions = Column(Text, nullable=True)  # JSON string of mentioned user IDs
-    tags = Column(Text, nullable=True)  # JSON string of tags
+    mentions = Column(ARRAY(Integer), nullable=True)  # Mentioned user IDs
+    tags = Column(ARRAY(String(50)), nullable=True)
     task_id = Column(Integer, ForeignKey("tasks.task_id"), nullable=True)
     farmer_beneficiary_id = Column(String(50), ForeignKey("farmers.beneficiary_id"), nullable=True)
     is_edited = Column(Boolean, default=False)
     is_deleted = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Maintained by PostgreSQL on insert/update; 'simple' avoids English stemming of mixed-language chat
+    search_vector = Column(TSVECTOR, Computed("to_tsvector('simple', coalesce(content, ''))", persisted=True))
+
+    __table_args__ = (
+        Index("idx_messages_group_id", group_id),
+        Index("idx_messages_created_at", created_at),
+        Index("idx_messages_search_vector", search_vector, postgresql_using="gin"),
+        Index("idx_messages_mentions", mentions, postgresql_using="gin"),
+        Index("idx_messages_tags", tags, postgresql_using="gin"),
+    )
 
     # Relationships
     group = relationship("ChatGroup", foreign_keys=[group_id])
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Date
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Date, Index
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -22,7 +23,7 @@ class TaskPriority(str, enum.Enum):
 class Task(Base):
     __tablename__ = "tasks"
 
-    task_id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     assigned_to_user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
@@ -31,13 +32,36 @@ class Task(Base):
     status = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.PENDING)
     priority = Column(Enum(TaskPriority), nullable=False, default=TaskPriority.MEDIUM)
     due_date = Column(Date, nullable=True)
-    tags = Column(Text, nullable=True)  # JSON string of tags
+    tags = Column(ARRAY(String(50)), nullable=True)
     notes = Column(Text, nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("idx_tasks_status", status),
+        Index("idx_tasks_created_at", created_at),
+        Index("idx_tasks_tags", tags, postgresql_using="gin"),
+        # Serves the per-assignee queue ordered by due date (task_id breaks ties for keyset paging)
+        Index("idx_tasks_assignee_status_due", assigned_to_user_id, status, due_date, task_id),
+        # Serves the deadline scheduler's per-window range query
+        Index("idx_tasks_due_date", due_date),
+        # Delta sync walks (updated_at, key) in order
+        Index("idx_tasks_updated_at", updated_at, task_id),
+    )
+
     # Relationships
     assigned_to = relationship("User", foreign_keys=[assigned_to_user_id])
     assigned_by = relationship("User", foreign_keys=[assigned_by_user_id])
-    farmer = relationship("Farmer", foreign_keys=[farmer_beneficiary_id])
\ No newline at end of file
+    farmer = relationship("Farmer", foreign_keys=[farmer_beneficiary_id])
+
+
+# Running task totals per status, adjusted in the same transaction as every task write.
+# Each status is split over slots (summed on read) so concurrent writers don't all
+# wait on one row lock.
+class TaskCounter(Base):
+    __tablename__ = "task_counters"
+
+    status = Column(String(20), primary_key=True)
+    slot = Column(Integer, primary_key=True, server_default="0")
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+# Deleted rows for delta sync; offline devices drop their copies when they see one
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+    entity_type = Column(String(20), nullable=False)  # farmer, task, inventory
+    entity_id = Column(String(50), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=True)  # Set when the row only left this user's view
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_tombstones_entity_deleted", entity_type, deleted_at, id),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Text
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Text
 from sqlalchemy.sql import func
 import enum
 from ..core.database import Base
@@ -19,7 +19,7 @@ class UserStatus(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    user_id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, primary_key=True)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.EMPLOYEE)
     name = Column(String(255), nullable=False)
     phone = Column(String(15), nullable=False)
@@ -28,4 +28,15 @@ class User(Base):
     status = Column(Enum(UserStatus), nullable=False, default=UserStatus.ACTIVE)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    last_login = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
+    last_login = Column(DateTime(timezone=True), nullable=True)
+    # Last Socket.IO activity, flushed in batches (core/presence.py)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# Each user's last committed write; keeps their reads off the replica (core/replica.py).
+# Kept out of users so stamping a write doesn't lock or rewrite the user's row.
+class UserWrite(Base):
+    __tablename__ = "user_writes"
+
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    last_write_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, computed_field
+from typing import Optional, List
 from datetime import datetime, date
 from enum import Enum
 
+from ..services.images import parse_photo_refs, available_variants
+
 
 class SchemeType(str, Enum):
     MTS = "MTS"
@@ -94,12 +96,47 @@ class FarmerUpdate(BaseModel):
     photos: Optional[str] = None
 
 
+# Schema for updating pipeline status on many farmers at once
+class FarmerBulkStatusUpdate(BaseModel):
+    beneficiary_ids: List[str] = Field(..., min_length=1, max_length=10000)
+    jsr_status: Optional[str] = Field(None, max_length=20)
+    dispatch_status: Optional[str] = Field(None, max_length=50)
+    dispatch_date: Optional[date] = None
+    installation_status: Optional[str] = Field(None, max_length=50)
+    icr_status: Optional[str] = Field(None, max_length=50)
+    installer_user_id: Optional[int] = None
+
+
+# Schema for one photo and its resized variants
+class PhotoVariants(BaseModel):
+    original: str
+    thumb: str
+    medium: str
+
+
 # Schema for farmer response
 class FarmerResponse(FarmerBase):
     beneficiary_id: str
     pumphp_combined: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    rendered_photos: Optional[str] = Field(None, exclude=True)
+
+    @computed_field
+    @property
+    def photo_variants(self) -> List[PhotoVariants]:
+        # Variant URLs are derived from the original's name; photos without
+        # rendered variants (older uploads) use the original
+        rendered = parse_photo_refs(self.rendered_photos)
+        photos = []
+        for url in parse_photo_refs(self.photos):
+            variants = available_variants(url, rendered)
+            photos.append(PhotoVariants(
+                original=url,
+                thumb=variants.get("thumb", url),
+                medium=variants.get("medium", url)
+            ))
+        return photos
 
     class Config:
         from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -68,7 +68,11 @@ class InventoryResponse(InventoryBase):
     created_at: datetime
     updated_at: datetime
     created_by_user_id: Optional[int] = None
-    is_low_stock: bool = False
+
+    @computed_field
+    @property
+    def is_low_stock(self) -> bool:
+        return self.quantity <= self.min_stock_level
 
     class Config:
         from_attributes = True
@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+# Schema for message response
+class MessageResponse(BaseModel):
+    message_id: int
+    group_id: int
+    sender_user_id: int
+    content: str
+    message_type: Optional[str] = None
+    file_url: Optional[str] = None
+    reply_to_message_id: Optional[int] = None
+    mentions: Optional[List[int]] = None
+    tags: Optional[List[str]] = None
+    task_id: Optional[int] = None
+    farmer_beneficiary_id: Optional[str] = None
+    is_edited: bool = False
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Schema for message lists with cursor pagination
+class MessageListResponse(BaseModel):
+    messages: List[MessageResponse]
+    next_cursor: Optional[str] = None
+
+
+# Schema for a ranked search hit
+class MessageSearchHit(MessageResponse):
+    rank: float
+    headline: Optional[str] = None
+
+
+# Schema for message search results with cursor pagination
+class MessageSearchResponse(BaseModel):
+    messages: List[MessageSearchHit]
+    next_cursor: Optional[str] = None
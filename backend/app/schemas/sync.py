@@ -0,0 +1,80 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+from enum import Enum
+
+from .farmer import FarmerResponse, FarmerUpdate
+from .task import TaskResponse, TaskUpdate
+from .inventory import InventoryResponse
+
+
+# Schema for a deleted row (or one that left the user's view)
+class SyncDeletion(BaseModel):
+    id: str
+    deleted_at: datetime  # Ignore if the local copy's updated_at is newer
+
+
+# Schemas for delta sync pages; keep calling with next_token while has_more
+class FarmerSyncResponse(BaseModel):
+    changed: List[FarmerResponse]
+    deleted: List[SyncDeletion]
+    next_token: str
+    has_more: bool
+
+
+class TaskSyncResponse(BaseModel):
+    changed: List[TaskResponse]
+    deleted: List[SyncDeletion]
+    next_token: str
+    has_more: bool
+
+
+class InventorySyncResponse(BaseModel):
+    changed: List[InventoryResponse]
+    deleted: List[SyncDeletion]
+    next_token: str
+    has_more: bool
+
+
+# Schemas for uploading edits queued while offline
+class FarmerEdit(BaseModel):
+    beneficiary_id: str = Field(..., min_length=1, max_length=50)
+    base_updated_at: datetime  # updated_at of the copy the edit was made on
+    changes: FarmerUpdate
+
+
+class TaskEdit(BaseModel):
+    task_id: int
+    base_updated_at: datetime
+    changes: TaskUpdate
+
+
+class SyncPushRequest(BaseModel):
+    farmers: List[FarmerEdit] = Field(default_factory=list, max_length=500)
+    tasks: List[TaskEdit] = Field(default_factory=list, max_length=500)
+
+
+class SyncConflictReason(str, Enum):
+    MODIFIED = "modified"  # Changed on the server since base_updated_at
+    DELETED = "deleted"
+    FORBIDDEN = "forbidden"
+    INVALID = "invalid"  # Refers to something that doesn't exist (e.g. an unknown assignee)
+
+
+class SyncApplied(BaseModel):
+    entity: str
+    id: str
+    updated_at: datetime
+
+
+class SyncConflict(BaseModel):
+    entity: str
+    id: str
+    reason: SyncConflictReason
+    server: Optional[dict] = None  # Current server copy, to rebase the edit on
+
+
+class SyncPushResponse(BaseModel):
+    applied: List[SyncApplied]
+    conflicts: List[SyncConflict]
+    tasks_created: int
@@ -0,0 +1,83 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List
+from datetime import datetime, date
+from enum import Enum
+
+
+class TaskStatus(str, Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in-progress"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class TaskPriority(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    URGENT = "urgent"
+
+
+# Base Task schema
+class TaskBase(BaseModel):
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    assigned_to_user_id: int
+    farmer_beneficiary_id: Optional[str] = Field(None, max_length=50)
+    priority: TaskPriority = TaskPriority.MEDIUM
+    due_date: Optional[date] = None
+    tags: Optional[List[str]] = None
+    notes: Optional[str] = None
+
+
+# Schema for creating a task
+class TaskCreate(TaskBase):
+    pass
+
+
+# Schema for updating a task
+class TaskUpdate(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    assigned_to_user_id: Optional[int] = None
+    farmer_beneficiary_id: Optional[str] = Field(None, max_length=50)
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    due_date: Optional[date] = None
+    tags: Optional[List[str]] = None
+    notes: Optional[str] = None
+
+    @field_validator("title", "assigned_to_user_id", "status", "priority")
+    @classmethod
+    def reject_null(cls, value):
+        # Omitted fields are left unchanged; these columns can't be cleared
+        if value is None:
+            raise ValueError("must not be null")
+        return value
+
+
+# Schema for task response
+class TaskResponse(BaseModel):
+    task_id: int
+    title: str
+    description: Optional[str] = None
+    assigned_to_user_id: int
+    assigned_by_user_id: int
+    farmer_beneficiary_id: Optional[str] = None
+    status: TaskStatus
+    priority: TaskPriority
+    due_date: Optional[date] = None
+    tags: Optional[List[str]] = None
+    notes: Optional[str] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Schema for task lists with cursor pagination
+class TaskListResponse(BaseModel):
+    tasks: List[TaskResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from enum import Enum
+
+
+class UploadPurpose(str, Enum):
+    INVENTORY_DOCUMENT = "inventory_document"
+    FARMER_PHOTO = "farmer_photo"
+
+
+# Schema for starting a chunked upload
+class ChunkedUploadInit(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    size: int = Field(..., gt=0)
+    chunk_size: Optional[int] = Field(None, gt=0)
+    sha256: Optional[str] = Field(None, min_length=64, max_length=64)  # Whole-file checksum, checked on complete
+    purpose: UploadPurpose
+    target_id: str = Field(..., min_length=1, max_length=50)  # Inventory item ID or farmer beneficiary ID
+
+
+# Chunk indexes start..end, inclusive
+class ChunkRange(BaseModel):
+    start: int
+    end: int
+
+
+# Schema for upload progress (used to resume after a disconnect)
+class ChunkedUploadStatus(BaseModel):
+    upload_id: str
+    filename: str
+    size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: List[ChunkRange]
+    missing_chunks: List[ChunkRange]
+    purpose: UploadPurpose
+    target_id: str
+
+
+# Schema for a finished upload
+class ChunkedUploadResult(BaseModel):
+    upload_id: str
+    url: str
+    purpose: UploadPurpose
+    target_id: str
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.blob import Blob
+from .images import VARIANTS, variant_name
+
+COPY_CHUNK_SIZE = 1024 * 1024
+BLOB_URL_PATTERN = re.compile(r"/blobs/[0-9a-f]{2}/([0-9a-f]{64})(\.[A-Za-z0-9]+)?$")
+
+
+def blob_dir() -> Path:
+    return Path(settings.UPLOAD_DIR) / "blobs"
+
+
+def blob_path(sha256: str, extension: str) -> Path:
+    # Two-character fan-out keeps directories small
+    return blob_dir() / sha256[:2] / f"{sha256}{extension}"
+
+
+def blob_url(blob: Blob) -> str:
+    return f"/{settings.UPLOAD_DIR}/blobs/{blob.sha256[:2]}/{blob.sha256}{blob.extension}"
+
+
+def sha256_from_url(url: Optional[str]) -> Optional[str]:
+    match = BLOB_URL_PATTERN.search(url or "")
+    return match.group(1) if match else None
+
+
+def stage_file(db: Session, source: Path, sha256: str, extension: str) -> Tuple[Blob, bool]:
+    """
+    Move already-hashed content into the store. A duplicate's staged copy is
+    deleted, so the store keeps one file per content; returns the blob and
+    whether the file is new. Call add_reference once any post-processing
+    (e.g. variants) succeeded.
+    """
+    existing = db.get(Blob, sha256)
+    if existing is not None:
+        extension = existing.extension
+    blob = Blob(sha256=sha256, extension=extension, size=source.stat().st_size)
+
+    target = blob_path(sha256, extension)
+    if target.exists():
+        os.unlink(source)
+        return blob, False
+
+    # New content (or a blob whose file went missing): move it into place
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source, target)
+    return blob, True
+
+
+def add_reference(db: Session, blob: Blob) -> None:
+    """
+    Insert the index row, or bump ref_count if the content is already known.
+    Holds the row lock until commit, so commit promptly (no awaits in between).
+
+    The file is checked under that lock. remove_orphans deletes files only
+    while holding it, so a file found here stays until the reference commits.
+    """
+    statement = insert(Blob).values(
+        sha256=blob.sha256, size=blob.size, extension=blob.extension, ref_count=1
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[Blob.sha256],
+        set_={"ref_count": Blob.ref_count + 1, "last_referenced_at": func.now()}
+    ))
+    if not blob_path(blob.sha256, blob.extension).exists():
+        # Its last reference was released and the file removed after stage_file saw it
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The file was removed during the upload; upload it again"
+        )
+
+
+def blob_files(blob: Blob) -> List[Path]:
+    original = blob_path(blob.sha256, blob.extension)
+    return [original] + [original.with_name(variant_name(original.name, name)) for name in VARIANTS]
+
+
+async def store_upload(db: Session, upload: UploadFile, max_size: int) -> Tuple[Blob, bool]:
+    """
+    Stream an upload to a temp file while hashing it, then store it by content
+    """
+    temp_dir = Path(settings.UPLOAD_PARTIAL_DIR)
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = temp_dir / f"{uuid.uuid4().hex}.upload"
+
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(temp_path, "wb") as out:
+            while True:
+                chunk = await upload.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds the {max_size // (1024 * 1024)}MB limit"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+        return stage_file(db, temp_path, digest.hexdigest(), Path(upload.filename or "").suffix.lower())
+    finally:
+        if temp_path.exists():
+            os.unlink(temp_path)
+
+
+def release(db: Session, sha256: str) -> List[str]:
+    """
+    Drop one reference. Returns the hash when none remain; pass it to
+    remove_orphans after the transaction commits.
+    """
+    row = db.execute(
+        update(Blob).where(Blob.sha256 == sha256).values(ref_count=Blob.ref_count - 1)
+        .returning(Blob.ref_count)
+    ).first()
+    if row is None or row.ref_count > 0:
+        return []
+    return [sha256]
+
+
+def release_urls(db: Session, urls: List[str]) -> List[str]:
+    """Release the blobs behind any store URLs; other URLs are ignored"""
+    orphaned = []
+    for url in urls:
+        sha256 = sha256_from_url(url)
+        if sha256:
+            orphaned.extend(release(db, sha256))
+    return orphaned
+
+
+def remove_files(paths: List[Path]) -> None:
+    for path in paths:
+        if path.exists():
+            os.unlink(path)
+
+
+def remove_orphans(db: Session, hashes: List[str]) -> None:
+    """
+    Delete the files and index rows of released blobs, once the releasing
+    transaction has committed. Each row is locked while its files go, and a
+    blob referenced again in the meantime is kept. A row left at zero
+    references (e.g. after a crash) is reused by the next upload of that content.
+
+    Runs in its own session, so the caller's loaded objects are not expired.
+    """
+    if not hashes:
+        return
+    with Session(bind=db.get_bind()) as cleanup:
+        for sha256 in dict.fromkeys(hashes):
+            blob = cleanup.query(Blob).filter(
+                Blob.sha256 == sha256, Blob.ref_count <= 0
+            ).with_for_update().first()
+            if blob is not None:
+                remove_files(blob_files(blob))
+                cleanup.delete(blob)
+            cleanup.commit()
+
+
+def retarget(db: Session, before: List[str], after: List[str]) -> List[str]:
+    """
+    Keep ref counts right when a record's URLs are edited directly: blobs no
+    longer referenced are released, newly referenced store URLs gain a ref
+    """
+    for url in set(after) - set(before):
+        sha256 = sha256_from_url(url)
+        if sha256:
+            db.execute(
+                update(Blob).where(Blob.sha256 == sha256).values(ref_count=Blob.ref_count + 1)
+            )
+    return release_urls(db, list(set(before) - set(after)))
@@ -0,0 +1,308 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+import aiofiles
+from fastapi import HTTPException, status
+
+from ..core.config import settings
+
+HASH_READ_SIZE = 1024 * 1024
+
+
+def partial_dir() -> Path:
+    # Kept outside UPLOAD_DIR so unfinished files are never served by /uploads
+    return Path(settings.UPLOAD_PARTIAL_DIR)
+
+
+def manifest_path(upload_id: str) -> Path:
+    return partial_dir() / f"{upload_id}.json"
+
+
+def data_path(upload_id: str) -> Path:
+    return partial_dir() / f"{upload_id}.part"
+
+
+def chunks_dir(upload_id: str) -> Path:
+    # One marker file per verified chunk: concurrent chunk PUTs (even across
+    # workers) never rewrite shared state
+    return partial_dir() / f"{upload_id}.chunks"
+
+
+def lock_path(upload_id: str) -> Path:
+    return partial_dir() / f"{upload_id}.lock"
+
+
+def result_path(upload_id: str) -> Path:
+    # Written by a successful complete, so a repeated complete returns the same result
+    return partial_dir() / f"{upload_id}.done"
+
+
+def check_upload_id(upload_id: str) -> None:
+    if not upload_id.isalnum():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found or expired"
+        )
+
+
+@asynccontextmanager
+async def upload_lock(upload_id: str):
+    """
+    Exclusive lock on one upload, across workers (flock on a lock file).
+
+    Held while a verified chunk is copied into the data file and for the
+    whole of complete, so chunk bytes never interleave and complete never
+    reads a chunk being rewritten.
+    """
+    check_upload_id(upload_id)
+    partial_dir().mkdir(parents=True, exist_ok=True)
+    descriptor = os.open(lock_path(upload_id), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        # Blocks only a pool thread while another request holds the lock
+        await asyncio.to_thread(fcntl.flock, descriptor, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(descriptor)  # Releases the lock
+
+
+def total_chunks(manifest: dict) -> int:
+    return -(-manifest["size"] // manifest["chunk_size"])
+
+
+def expected_chunk_length(manifest: dict, index: int) -> int:
+    start = index * manifest["chunk_size"]
+    return min(manifest["chunk_size"], manifest["size"] - start)
+
+
+def received_chunks(upload_id: str) -> List[int]:
+    directory = chunks_dir(upload_id)
+    if not directory.exists():
+        return []
+    return sorted(int(marker.name) for marker in directory.iterdir() if marker.name.isdigit())
+
+
+def index_ranges(indexes: List[int]) -> List[Tuple[int, int]]:
+    """Collapse sorted chunk indexes into inclusive (start, end) runs"""
+    ranges = []
+    for index in indexes:
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1] = (ranges[-1][0], index)
+        else:
+            ranges.append((index, index))
+    return ranges
+
+
+def missing_ranges(manifest: dict, received: List[int]) -> List[Tuple[int, int]]:
+    """Inclusive (start, end) runs of chunks not received yet, given the sorted received indexes"""
+    ranges, start = [], 0
+    for index in received + [total_chunks(manifest)]:
+        if index > start:
+            ranges.append((start, index - 1))
+        start = index + 1
+    return ranges
+
+
+def remove_upload(upload_id: str) -> None:
+    for path in (manifest_path(upload_id), data_path(upload_id)):
+        if path.exists():
+            os.unlink(path)
+    shutil.rmtree(chunks_dir(upload_id), ignore_errors=True)
+
+
+def cleanup_stale_uploads() -> None:
+    """Drop partial uploads (and finished ones' results) nobody touched within UPLOAD_PARTIAL_TTL_HOURS"""
+    directory = partial_dir()
+    if not directory.exists():
+        return
+    cutoff = time.time() - settings.UPLOAD_PARTIAL_TTL_HOURS * 3600
+    for manifest in directory.glob("*.json"):
+        upload_id = manifest.stem
+        last_activity = max(
+            (p.stat().st_mtime for p in (manifest, data_path(upload_id)) if p.exists()),
+            default=0
+        )
+        if last_activity < cutoff:
+            remove_upload(upload_id)
+    for leftover in [*directory.glob("*.done"), *directory.glob("*.lock")]:
+        upload_id = leftover.stem
+        if not manifest_path(upload_id).exists() and leftover.stat().st_mtime < cutoff:
+            leftover.unlink(missing_ok=True)
+
+
+def create_upload(user_id: int, filename: str, size: int, chunk_size: int, sha256: str,
+                  purpose: str, target_id: str) -> dict:
+    """Reserve space for a new upload and write its manifest"""
+    partial_dir().mkdir(parents=True, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    manifest = {
+        "upload_id": upload_id,
+        "user_id": user_id,
+        "filename": filename,
+        "size": size,
+        "chunk_size": chunk_size,
+        "sha256": sha256.lower() if sha256 else None,
+        "purpose": purpose,
+        "target_id": target_id,
+        "created_at": time.time(),
+    }
+
+    # Pre-size the data file so chunks can be written at their offsets in any order
+    with open(data_path(upload_id), "wb") as data:
+        data.truncate(size)
+    chunks_dir(upload_id).mkdir()
+
+    temp_manifest = manifest_path(upload_id).with_suffix(".tmp")
+    temp_manifest.write_text(json.dumps(manifest))
+    os.replace(temp_manifest, manifest_path(upload_id))
+    return manifest
+
+
+def check_owner(record: dict, user_id: int) -> dict:
+    if record["user_id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this upload"
+        )
+    return record
+
+
+def load_upload(upload_id: str, user_id: int) -> dict:
+    check_upload_id(upload_id)
+    path = manifest_path(upload_id)
+    if not path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found or expired"
+        )
+    return check_owner(json.loads(path.read_text()), user_id)
+
+
+def load_result(upload_id: str, user_id: int) -> Optional[dict]:
+    """The stored result of a completed upload, if any"""
+    check_upload_id(upload_id)
+    path = result_path(upload_id)
+    if not path.exists():
+        return None
+    return check_owner(json.loads(path.read_text()), user_id)["result"]
+
+
+def finish_upload(upload_id: str, user_id: int, result: dict) -> None:
+    """Keep the result for repeated completes, then free the upload's space"""
+    temp = result_path(upload_id).with_suffix(".tmp")
+    temp.write_text(json.dumps({"user_id": user_id, "result": result}))
+    os.replace(temp, result_path(upload_id))
+    remove_upload(upload_id)
+
+
+def copy_chunk(source: Path, manifest: dict, index: int) -> None:
+    with open(source, "rb") as chunk, open(data_path(manifest["upload_id"]), "r+b") as data:
+        data.seek(index * manifest["chunk_size"])
+        shutil.copyfileobj(chunk, data, HASH_READ_SIZE)
+
+
+async def write_chunk(manifest: dict, index: int, body: AsyncIterator[bytes], expected_sha256: str) -> None:
+    """
+    Stream one chunk to a private temp file, verify its length and SHA-256,
+    then copy it to its offset in the data file under the upload lock and mark
+    it received.
+
+    Bad or aborted sends never touch the data file, and concurrent sends of
+    the same chunk are copied one at a time, so a marker always covers the
+    bytes it was verified for.
+    """
+    if index < 0 or index >= total_chunks(manifest):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Chunk index out of range"
+        )
+
+    upload_id = manifest["upload_id"]
+    expected_length = expected_chunk_length(manifest, index)
+    digest = hashlib.sha256()
+    written = 0
+
+    # Marker names are plain indexes; the temp file's name never parses as one
+    temp = chunks_dir(upload_id) / f"{index}.{uuid.uuid4().hex}.tmp"
+    try:
+        async with aiofiles.open(temp, "xb") as chunk:
+            async for piece in body:
+                written += len(piece)
+                if written > expected_length:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Chunk {index} is larger than {expected_length} bytes"
+                    )
+                digest.update(piece)
+                await chunk.write(piece)
+
+        if written != expected_length:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk {index} has {written} bytes, expected {expected_length}"
+            )
+        if digest.hexdigest() != expected_sha256.lower():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Checksum mismatch for chunk {index}"
+            )
+
+        async with upload_lock(upload_id):
+            # Completed or aborted while this chunk was streaming
+            if not manifest_path(upload_id).exists():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Upload not found or expired"
+                )
+            marker = chunks_dir(upload_id) / str(index)
+            marker.unlink(missing_ok=True)
+            await asyncio.to_thread(copy_chunk, temp, manifest, index)
+            marker.write_text(expected_sha256.lower())
+    except FileNotFoundError:
+        # The chunks directory went away with the upload
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found or expired"
+        )
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as data:
+        for block in iter(lambda: data.read(HASH_READ_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def assemble_upload(manifest: dict) -> Tuple[Path, str]:
+    """
+    Check that every chunk arrived (and the whole-file checksum, if given);
+    returns the path of the assembled data file and its SHA-256
+    """
+    upload_id = manifest["upload_id"]
+    missing = set(range(total_chunks(manifest))) - set(received_chunks(upload_id))
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload incomplete, missing chunks: {sorted(missing)[:20]}"
+        )
+
+    path = data_path(upload_id)
+    # Always hashed: the digest is the file's address in the blob store
+    actual = await asyncio.to_thread(file_sha256, path)
+    if manifest["sha256"] and actual != manifest["sha256"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Checksum mismatch for the assembled file"
+        )
+    return path, actual
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core.config import settings
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# name -> (longest edge in px, Pillow format, file suffix)
+VARIANTS = {
+    "thumb": (settings.THUMBNAIL_MAX_EDGE, "WEBP", ".webp"),
+    "medium": (settings.MEDIUM_IMAGE_MAX_EDGE, "JPEG", ".jpg"),
+}
+
+_executor: Optional[ProcessPoolExecutor] = None
+_in_flight = 0
+
+
+def variant_name(filename: str, variant: str) -> str:
+    """Variants sit beside the original: photo.jpg -> photo_thumb.webp"""
+    stem, _, _ = filename.rpartition(".")
+    return f"{stem or filename}_{variant}{VARIANTS[variant][2]}"
+
+
+def variant_url(url: str, variant: str) -> str:
+    base, _, filename = url.rpartition("/")
+    return f"{base}/{variant_name(filename, variant)}"
+
+
+def has_variants(url: str) -> bool:
+    """Only images uploaded through the API get generated variants"""
+    return url.startswith(f"/{settings.UPLOAD_DIR}/") and url.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def url_path(url: str) -> Path:
+    """Local file behind an /uploads URL"""
+    return Path(settings.UPLOAD_DIR) / url[len(settings.UPLOAD_DIR) + 2:]
+
+
+def available_variants(url: str, rendered: List[str]) -> Dict[str, str]:
+    """
+    URLs of a photo's variants, if they were rendered (Farmer.rendered_photos).
+    Photos stored before variants were generated have none; callers fall
+    back to the original. No filesystem access.
+    """
+    if url not in rendered or not has_variants(url):
+        return {}
+    return {name: variant_url(url, name) for name in VARIANTS}
+
+
+def variants_missing(original_path: Path) -> bool:
+    """Whether any variant of a stored image still has to be rendered"""
+    return any(
+        not original_path.with_name(variant_name(original_path.name, name)).is_file() for name in VARIANTS
+    )
+
+
+def parse_photo_refs(photos: Optional[str]) -> List[str]:
+    """Read Farmer.photos, stored as a JSON list (legacy rows may be comma-separated)"""
+    if not photos:
+        return []
+    try:
+        refs = json.loads(photos)
+    except ValueError:
+        refs = photos.split(",")
+    if isinstance(refs, str):
+        refs = [refs]
+    return [str(ref).strip() for ref in refs if str(ref).strip()]
+
+
+def serialize_photo_refs(refs: List[str]) -> str:
+    return json.dumps(refs)
+
+
+def append_photo_ref(photos: Optional[str], url: str) -> str:
+    refs = parse_photo_refs(photos)
+    if url not in refs:
+        refs.append(url)
+    return serialize_photo_refs(refs)
+
+
+def render_variants(original_path: str) -> Dict[str, str]:
+    """
+    Write every variant of an image next to it (runs in a worker process)
+    """
+    from PIL import Image, ImageOps
+
+    original = Path(original_path)
+    written = {}
+    with Image.open(original) as image:
+        # Phone photos carry their rotation in EXIF
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        for name, (max_edge, image_format, _) in VARIANTS.items():
+            variant = image.copy()
+            variant.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            target = original.with_name(variant_name(original.name, name))
+            variant.save(target, image_format, quality=settings.IMAGE_VARIANT_QUALITY, optimize=True)
+            written[name] = str(target)
+    return written
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the API process has threads (DB pool, event loop)
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def generate_variants(original_path: Path) -> Dict[str, str]:
+    """Render variants in the process pool without blocking the event loop"""
+    global _in_flight
+    loop = asyncio.get_running_loop()
+    _in_flight += 1
+    try:
+        return await loop.run_in_executor(get_executor(), render_variants, str(original_path))
+    finally:
+        _in_flight -= 1
+
+
+def jobs_in_flight() -> int:
+    """Variant renders submitted to the pool and not finished (running or queued)"""
+    return _in_flight
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,32 @@
+import os
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile, status
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+async def save_upload_file(upload: UploadFile, target: Path, max_size: int) -> int:
+    """
+    Stream an upload to disk in chunks, enforcing max_size; returns bytes written
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    try:
+        with open(target, "wb") as out:
+            while True:
+                chunk = await upload.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds the {max_size // (1024 * 1024)}MB limit"
+                    )
+                out.write(chunk)
+    except BaseException:
+        if target.exists():
+            os.unlink(target)
+        raise
+    return written
@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Query, Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.pagination import encode_cursor, decode_cursor
+from ..models.tombstone import Tombstone
+
+# A position in a (timestamp, key) ordered stream: [iso timestamp, key or None].
+# key None means "everything at or after the timestamp".
+Position = Optional[list]
+
+
+def record_deletion(db: Session, entity_type: str, entity_id, user_id: Optional[int] = None) -> None:
+    """
+    Write a tombstone in the caller's transaction. With user_id, the row was
+    not deleted but left that user's view (e.g. a task reassigned away).
+    """
+    db.add(Tombstone(entity_type=entity_type, entity_id=str(entity_id), user_id=user_id))
+
+
+def purge_tombstones(db: Session) -> int:
+    """Drop tombstones older than the retention window; older tokens must resync"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    deleted = db.query(Tombstone).filter(Tombstone.deleted_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def purge_expired_tombstones() -> int:
+    """purge_tombstones in a session of its own"""
+    db = SessionLocal()
+    try:
+        return purge_tombstones(db)
+    finally:
+        db.close()
+
+
+async def run_purge_loop(interval: float) -> None:
+    """Purge expired tombstones every interval until cancelled, so long-lived workers keep the window"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(purge_expired_tombstones)
+        except Exception as e:
+            print(f"Tombstone purge failed: {e}")
+
+
+def invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid sync token"
+    )
+
+
+def check_position(position) -> Position:
+    """A decoded position, or 400 unless it is [iso timestamp, key or None]"""
+    if position is None:
+        return None
+    if not (isinstance(position, list) and len(position) == 2 and isinstance(position[0], str)):
+        raise invalid_token()
+    key = position[1]
+    if key is not None and (isinstance(key, bool) or not isinstance(key, (str, int))):
+        raise invalid_token()
+    try:
+        datetime.fromisoformat(position[0])
+    except ValueError:
+        raise invalid_token()
+    return position
+
+
+def decode_sync_token(token: Optional[str]) -> Tuple[Position, Position]:
+    """(rows position, tombstones position); (None, None) starts a full sync"""
+    if not token:
+        return None, None
+    data = decode_cursor(token)
+    rows_position, tombstones_position = check_position(data.get("r")), check_position(data.get("d"))
+
+    # Tombstones are only kept for the retention window
+    if tombstones_position:
+        issued = datetime.fromisoformat(tombstones_position[0])
+        retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if issued < datetime.now(issued.tzinfo) - retention:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync token expired, start a full sync"
+            )
+    return rows_position, tombstones_position
+
+
+def encode_sync_token(rows_position: Position, tombstones_position: Position) -> str:
+    return encode_cursor({"r": rows_position, "d": tombstones_position})
+
+
+def after_position(query: Query, timestamp_column, key_column, position: Position) -> Query:
+    """Rows strictly after a position; (timestamp, key) row comparison walks the index"""
+    if position is None:
+        return query
+    # A token from another stream (e.g. a farmer token on the task feed) has the wrong key type
+    if position[1] is not None and not isinstance(position[1], key_column.type.python_type):
+        raise invalid_token()
+    timestamp = datetime.fromisoformat(position[0])
+    if position[1] is None:
+        return query.filter(timestamp_column >= timestamp)
+    return query.filter(tuple_(timestamp_column, key_column) > tuple_(timestamp, position[1]))
+
+
+def read_page(query: Query, timestamp_column, key_column, position: Position, limit: int) -> Tuple[List, bool]:
+    rows = after_position(query, timestamp_column, key_column, position).order_by(
+        timestamp_column.asc(), key_column.asc()
+    ).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+def next_position(last_timestamp: Optional[datetime], last_key, has_more: bool, cutoff: datetime) -> Position:
+    """
+    Mid-stream, continue after the last row read. Once caught up, restart
+    from `cutoff` instead: updated_at is the writer's transaction start, so
+    a slow transaction can commit rows older than ones already seen. Rows
+    inside the lag window are sent again next time; clients apply them
+    idempotently.
+    """
+    if has_more:
+        return [last_timestamp.isoformat(), last_key]
+    return [cutoff.isoformat(), None]
+
+
+def sync_cutoff(db: Session) -> datetime:
+    """Database clock minus the safety lag"""
+    return db.scalar(select(func.now())) - timedelta(seconds=settings.SYNC_SAFETY_LAG_SECONDS)
+
+
+def read_tombstones(db: Session, entity_type: str, position: Position, limit: int,
+                    user_id: Optional[int] = None) -> Tuple[List[Tombstone], bool]:
+    query = db.query(Tombstone).filter(Tombstone.entity_type == entity_type)
+    if user_id is not None:
+        query = query.filter((Tombstone.user_id.is_(None)) | (Tombstone.user_id == user_id))
+    else:
+        query = query.filter(Tombstone.user_id.is_(None))
+    return read_page(query, Tombstone.deleted_at, Tombstone.id, position, limit)
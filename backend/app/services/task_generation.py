@@ -0,0 +1,175 @@
+import heapq
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.farmer import Farmer, DispatchStatus, InstallationStatus
+from ..models.task import Task, TaskStatus, TaskPriority
+from ..models.user import User, UserRole, UserStatus
+from .tasks import adjust_task_counters
+
+# Farmer pipeline rules: when `field` moves to `to`, create one task per farmer.
+# `key` is stored as a tag so a farmer never gets the same generated task twice.
+TASK_RULES = [
+    {
+        "key": "auto:installation",
+        "field": "dispatch_status",
+        "to": DispatchStatus.DELIVERED.value,
+        "title": "Install pump set for {beneficiary_name} ({beneficiary_id})",
+        "description": "Material delivered to {village_name}. Complete installation and upload photos.",
+        "priority": TaskPriority.HIGH,
+        "due_in_days": 7,
+        "tags": ["installation"],
+    },
+    {
+        "key": "auto:icr",
+        "field": "installation_status",
+        "to": InstallationStatus.DONE.value,
+        "title": "Submit ICR for {beneficiary_name} ({beneficiary_id})",
+        "description": "Installation completed in {village_name}. Prepare and submit the ICR.",
+        "priority": TaskPriority.MEDIUM,
+        "due_in_days": 5,
+        "tags": ["icr"],
+    },
+]
+
+# Farmer columns the rules and task templates read
+SNAPSHOT_FIELDS = (
+    "beneficiary_id", "beneficiary_name", "village_name", "installer_user_id",
+    "jsr_status", "dispatch_status", "installation_status", "icr_status",
+)
+
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+
+
+def farmer_snapshot(farmer: Farmer) -> dict:
+    """Capture the farmer fields the task rules depend on"""
+    return {field: getattr(farmer, field) for field in SNAPSHOT_FIELDS}
+
+
+class TaskAssigner:
+    """
+    Picks assignees for generated tasks.
+
+    Farmers with an installer keep their installer; the rest go to active
+    employees either round-robin or to whoever has the fewest open tasks.
+    Loads are read once with a single grouped query and updated in memory.
+    """
+
+    def __init__(self, db: Session, strategy: str = None):
+        self.strategy = strategy or settings.TASK_ASSIGNMENT_STRATEGY
+        self.candidates = [
+            user_id for (user_id,) in db.query(User.user_id).filter(
+                User.role == UserRole.EMPLOYEE,
+                User.status == UserStatus.ACTIVE
+            ).order_by(User.user_id)
+        ]
+        self.loads: Dict[int, int] = dict(
+            db.query(Task.assigned_to_user_id, func.count(Task.task_id)).filter(
+                Task.status.in_(OPEN_STATUSES)
+            ).group_by(Task.assigned_to_user_id).all()
+        )
+        self._heap = [(self.loads.get(user_id, 0), user_id) for user_id in self.candidates]
+        heapq.heapify(self._heap)
+        self._next_index = 0
+
+    def assign(self, installer_user_id: Optional[int]) -> Optional[int]:
+        if installer_user_id:
+            self.loads[installer_user_id] = self.loads.get(installer_user_id, 0) + 1
+            return installer_user_id
+        if not self.candidates:
+            return None
+
+        if self.strategy == "round_robin":
+            user_id = self.candidates[self._next_index % len(self.candidates)]
+            self._next_index += 1
+            self.loads[user_id] = self.loads.get(user_id, 0) + 1
+            return user_id
+
+        # Least loaded: pop, re-check against the live load (installers may
+        # have been given tasks directly), and push back with the new count
+        while True:
+            load, user_id = heapq.heappop(self._heap)
+            current = self.loads.get(user_id, 0)
+            if current == load:
+                break
+            heapq.heappush(self._heap, (current, user_id))
+        self.loads[user_id] = load + 1
+        heapq.heappush(self._heap, (load + 1, user_id))
+        return user_id
+
+
+def matching_transitions(
+    rule: dict,
+    transitions: Sequence[Tuple[dict, dict]]
+) -> List[dict]:
+    field, target = rule["field"], rule["to"]
+    return [
+        after for before, after in transitions
+        if after.get(field) == target and before.get(field) != target
+    ]
+
+
+def generate_tasks_for_transitions(
+    db: Session,
+    transitions: Sequence[Tuple[dict, dict]],
+    assigned_by_user_id: int,
+    assigner: Optional[TaskAssigner] = None
+) -> List[Task]:
+    """
+    Create tasks for farmer status transitions in the caller's transaction.
+
+    `transitions` holds (before, after) farmer snapshots. All tasks are
+    written with one multi-row INSERT ... RETURNING.
+    """
+    if not transitions:
+        return []
+
+    rows = []
+    today = date.today()
+    for rule in TASK_RULES:
+        targets = matching_transitions(rule, transitions)
+        if not targets:
+            continue
+
+        # Skip farmers that already have this generated task
+        already_created = {
+            beneficiary_id for (beneficiary_id,) in db.query(Task.farmer_beneficiary_id).filter(
+                Task.farmer_beneficiary_id.in_([target["beneficiary_id"] for target in targets]),
+                Task.tags.contains([rule["key"]])
+            )
+        }
+
+        for target in targets:
+            if target["beneficiary_id"] in already_created:
+                continue
+            already_created.add(target["beneficiary_id"])
+
+            if assigner is None:
+                assigner = TaskAssigner(db)
+            assignee = assigner.assign(target.get("installer_user_id"))
+            if assignee is None:
+                continue
+
+            template_values = {key: value or "" for key, value in target.items()}
+            rows.append({
+                "title": rule["title"].format(**template_values)[:255],
+                "description": rule["description"].format(**template_values),
+                "assigned_to_user_id": assignee,
+                "assigned_by_user_id": assigned_by_user_id,
+                "farmer_beneficiary_id": target["beneficiary_id"],
+                "status": TaskStatus.PENDING,
+                "priority": rule["priority"],
+                "due_date": today + timedelta(days=rule["due_in_days"]),
+                "tags": rule["tags"] + [rule["key"]],
+            })
+
+    if not rows:
+        return []
+
+    tasks = db.scalars(insert(Task).returning(Task), rows).all()
+    adjust_task_counters(db, {TaskStatus.PENDING.value: len(tasks)})
+    return tasks
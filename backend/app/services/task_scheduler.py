@@ -0,0 +1,318 @@
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.realtime import sio, user_room
+from ..models.task import Task, TaskStatus
+
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+
+REMINDER = "reminder"
+OVERDUE = "overdue"
+
+
+def deadline_for(due_date: date) -> float:
+    """A task is due by the end of its due date (server local time)"""
+    return datetime.combine(due_date, dt_time.max).timestamp()
+
+
+class TaskDeadlineScheduler:
+    """
+    In-process scheduler for task reminders and overdue escalation.
+
+    Deadlines inside the current horizon live in a min-heap. The database is
+    read once per horizon window (one indexed range query on due_date), never
+    per tick, so DB load does not grow with the number of open tasks; task
+    writes update the heap directly through track()/forget().
+
+    Entries are invalidated lazily: every change gives the task a new version
+    and stale heap items are skipped when popped. Versions come from one
+    counter, so a forgotten task's entry can be dropped without its old heap
+    items ever matching again.
+
+    Open tasks already overdue when the first window loads (e.g. after a
+    restart) are escalated immediately.
+
+    Every worker runs its own scheduler for the sockets connected to it, but
+    track() only sees the writes its worker served. Each scheduler therefore
+    polls tasks changed since its last poll (idx_tasks_updated_at), and
+    re-reads the rows about to fire so a task completed or rescheduled in
+    another worker is not escalated from a stale copy.
+    """
+
+    def __init__(self, horizon_hours: float, reminder_lead_hours: float, poll_seconds: float = 30):
+        self.horizon = horizon_hours * 3600
+        self.reminder_lead = reminder_lead_hours * 3600
+        self.poll_seconds = poll_seconds
+        self._changes_since: Optional[datetime] = None
+        self._heap: List[Tuple[float, int, int, str]] = []  # (fire_at, task_id, version, kind)
+        self._tasks: Dict[int, dict] = {}  # task_id -> assignee/title/due_date
+        self._versions: Dict[int, int] = {}  # task_id -> version of its live heap items
+        self._version_counter = itertools.count(1)
+        self._loaded_until_date: Optional[date] = None
+        self._loading_until_date: Optional[date] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.windows_loaded = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def pending_count(self) -> int:
+        """Queued notifications, including stale entries not yet popped"""
+        return len(self._heap)
+
+    def _push_task(self, task_id: int, info: dict, escalate_overdue: bool) -> None:
+        now = time.time()
+        deadline = deadline_for(info["due_date"])
+        if deadline <= now and not escalate_overdue:
+            self.forget(task_id)
+            return
+
+        version = next(self._version_counter)
+        self._versions[task_id] = version
+        self._tasks[task_id] = info
+        reminder_at = deadline - self.reminder_lead
+        if reminder_at > now:
+            heapq.heappush(self._heap, (reminder_at, task_id, version, REMINDER))
+        heapq.heappush(self._heap, (max(deadline, now), task_id, version, OVERDUE))
+
+        if self._wakeup is not None and self._heap and self._heap[0][1] == task_id:
+            self._wakeup.set()
+
+    def forget(self, task_id: int) -> None:
+        """Drop a task's pending notifications"""
+        self._tasks.pop(task_id, None)
+        self._versions.pop(task_id, None)
+
+    def track(self, task: Task) -> None:
+        """
+        Reflect a created or updated task (or a polled row); call after commit.
+
+        A task saved with a due date already past escalates only if its
+        overdue notice is still pending; only the startup load escalates
+        tasks that went overdue unnoticed.
+        """
+        open_status = TaskStatus(task.status) in OPEN_STATUSES
+        window_end = max(
+            (d for d in (self._loaded_until_date, self._loading_until_date) if d is not None),
+            default=None
+        )
+        in_window = (
+            task.due_date is not None
+            and window_end is not None
+            and task.due_date <= window_end
+        )
+        if not open_status or not in_window:
+            # Tasks beyond the horizon are picked up when their window loads
+            self.forget(task.task_id)
+            return
+
+        self._push_task(task.task_id, {
+            "assigned_to_user_id": task.assigned_to_user_id,
+            "assigned_by_user_id": task.assigned_by_user_id,
+            "title": task.title,
+            "due_date": task.due_date,
+        }, escalate_overdue=task.task_id in self._tasks)
+
+    def track_many(self, tasks: Iterable[Task]) -> None:
+        for task in tasks:
+            self.track(task)
+
+    def fetch_window(self, start_date: Optional[date], until_date: date) -> list:
+        """
+        One range query on due_date for open tasks; safe to run in a worker thread.
+
+        Without a start date every open task due by until_date is read, overdue ones included.
+        """
+        db = SessionLocal()
+        try:
+            query = db.query(
+                Task.task_id,
+                Task.assigned_to_user_id,
+                Task.assigned_by_user_id,
+                Task.title,
+                Task.due_date
+            ).filter(
+                Task.status.in_(OPEN_STATUSES),
+                Task.due_date <= until_date
+            )
+            if start_date is not None:
+                query = query.filter(Task.due_date >= start_date)
+            return query.all()
+        finally:
+            db.close()
+
+    @staticmethod
+    def fetch_tasks(since: Optional[datetime] = None, task_ids: Iterable[int] = ()) -> list:
+        """Current rows of tasks changed since a time, or of the given tasks (worker thread)"""
+        db = SessionLocal()
+        try:
+            query = db.query(
+                Task.task_id,
+                Task.status,
+                Task.assigned_to_user_id,
+                Task.assigned_by_user_id,
+                Task.title,
+                Task.due_date
+            )
+            if since is not None:
+                query = query.filter(Task.updated_at >= since)
+            else:
+                query = query.filter(Task.task_id.in_(list(task_ids)))
+            return query.all()
+        finally:
+            db.close()
+
+    async def poll_changes(self) -> int:
+        """Apply task writes served by other workers since the last poll"""
+        # updated_at is the writing transaction's start, so look back past the longest one
+        started = datetime.now(timezone.utc) - timedelta(seconds=settings.SYNC_SAFETY_LAG_SECONDS)
+        if self._changes_since is not None:
+            rows = await asyncio.to_thread(self.fetch_tasks, self._changes_since)
+            self.track_many(rows)
+        else:
+            rows = []
+        self._changes_since = started
+        return len(rows)
+
+    async def recheck(self, fired: List[Tuple[str, int, dict]]) -> List[Tuple[str, int, dict]]:
+        """
+        Drop notifications whose task is no longer open or has a new due date
+        (re-queued at the new one); fired comes from pop_due
+        """
+        if not fired:
+            return fired
+        rows = await asyncio.to_thread(self.fetch_tasks, None, {task_id for _, task_id, _ in fired})
+        current = {row.task_id: row for row in rows}
+        confirmed = []
+        for kind, task_id, info in fired:
+            row = current.get(task_id)
+            if row is None or TaskStatus(row.status) not in OPEN_STATUSES:
+                self.forget(task_id)
+            elif row.due_date != info["due_date"]:
+                self.track(row)
+            else:
+                confirmed.append((kind, task_id, {
+                    "assigned_to_user_id": row.assigned_to_user_id,
+                    "assigned_by_user_id": row.assigned_by_user_id,
+                    "title": row.title,
+                    "due_date": row.due_date,
+                }))
+        return confirmed
+
+    def apply_window(self, until_date: date, rows: list) -> None:
+        """Push fetched deadlines onto the heap (event loop thread only)"""
+        self._loaded_until_date = max(until_date, self._loaded_until_date or until_date)
+        self.windows_loaded += 1
+        for row in rows:
+            self._push_task(row.task_id, {
+                "assigned_to_user_id": row.assigned_to_user_id,
+                "assigned_by_user_id": row.assigned_by_user_id,
+                "title": row.title,
+                "due_date": row.due_date,
+            }, escalate_overdue=True)
+
+    async def load_window(self, until_date: date) -> int:
+        """Load open tasks due after the loaded range (from any past date on the first load) up to until_date"""
+        start_date = self._loaded_until_date + timedelta(days=1) if self._loaded_until_date else None
+        if start_date is not None and until_date < start_date:
+            return 0
+
+        # Let track() accept tasks in the window while the query is in flight,
+        # so a task committed after the snapshot is not missed
+        self._loading_until_date = until_date
+        try:
+            rows = await asyncio.to_thread(self.fetch_window, start_date, until_date)
+        finally:
+            self._loading_until_date = None
+        self.apply_window(until_date, rows)
+        return len(rows)
+
+    def window_end_date(self, now: float) -> date:
+        # Reminders fire reminder_lead before a deadline, so look that far ahead too
+        return datetime.fromtimestamp(now + self.horizon + self.reminder_lead).date()
+
+    def pop_due(self, now: float) -> List[Tuple[str, int, dict]]:
+        """Pop every notification whose time has come"""
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, task_id, version, kind = heapq.heappop(self._heap)
+            if self._versions.get(task_id) != version or task_id not in self._tasks:
+                continue
+            info = self._tasks[task_id]
+            if kind == OVERDUE:
+                self.forget(task_id)
+            fired.append((kind, task_id, info))
+        return fired
+
+    async def emit(self, kind: str, task_id: int, info: dict) -> None:
+        payload = {
+            "task_id": task_id,
+            "title": info["title"],
+            "due_date": info["due_date"].isoformat(),
+        }
+        if kind == REMINDER:
+            await sio.emit('task_reminder', payload, room=user_room(info["assigned_to_user_id"]))
+        else:
+            # Escalate overdue tasks to whoever assigned them as well
+            await sio.emit('task_overdue', payload, room=user_room(info["assigned_to_user_id"]))
+            if info["assigned_by_user_id"] != info["assigned_to_user_id"]:
+                await sio.emit('task_overdue', payload, room=user_room(info["assigned_by_user_id"]))
+
+    async def run(self) -> None:
+        """Sleep until the next deadline or window refresh, then fire; runs until cancelled"""
+        self._wakeup = asyncio.Event()
+        lookahead = self.horizon + self.reminder_lead
+        last_poll: Optional[float] = None
+        while True:
+            now = time.time()
+            window_end = self.window_end_date(now)
+            # The window grows by a day whenever now + lookahead crosses midnight
+            next_at = datetime.combine(window_end + timedelta(days=1), dt_time.min).timestamp() - lookahead
+            if self._loaded_until_date is None or self._loaded_until_date < window_end:
+                try:
+                    await self.load_window(window_end)
+                except Exception as e:
+                    print(f"Task scheduler failed to load deadlines: {e}")
+                    next_at = now + 60
+
+            if last_poll is None or now - last_poll >= self.poll_seconds:
+                try:
+                    await self.poll_changes()
+                    last_poll = now
+                except Exception as e:
+                    print(f"Task scheduler failed to poll task changes: {e}")
+            next_at = min(next_at, (last_poll or now) + self.poll_seconds)
+
+            fired = self.pop_due(now)
+            try:
+                fired = await self.recheck(fired)
+            except Exception as e:
+                # Without the check a stale notice is better than a lost one
+                print(f"Task scheduler failed to re-check due tasks: {e}")
+            for kind, task_id, info in fired:
+                try:
+                    await self.emit(kind, task_id, info)
+                except Exception as e:
+                    print(f"Task scheduler failed to emit {kind} for task {task_id}: {e}")
+
+            # Wake for the next deadline, a new earlier entry, or the next window
+            if self._heap:
+                next_at = min(self._heap[0][0], next_at)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_at - time.time()))
+            except asyncio.TimeoutError:
+                pass
+
+
+task_scheduler = TaskDeadlineScheduler(
+    horizon_hours=settings.TASK_SCHEDULER_HORIZON_HOURS,
+    reminder_lead_hours=settings.TASK_REMINDER_LEAD_HOURS,
+    poll_seconds=settings.TASK_SCHEDULER_POLL_SECONDS
+)
@@ -0,0 +1,119 @@
+import random
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.task import Task, TaskCounter, TaskStatus
+from .sync import record_deletion
+
+
+def status_key(status) -> str:
+    """Counter key for a task status (enum member or raw value)"""
+    return TaskStatus(status).value
+
+
+def adjust_task_counters(db: Session, deltas: Dict[str, int]) -> None:
+    """
+    Apply per-status deltas to task_counters inside the caller's transaction.
+
+    A session always writes the same slot, and rows are locked in status
+    order, so two transactions can only wait on each other, never deadlock.
+    """
+    slot = db.info.setdefault("task_counter_slot", random.randrange(settings.TASK_COUNTER_SLOTS))
+    rows = [{"status": key, "slot": slot, "count": delta} for key, delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+
+    statement = insert(TaskCounter).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[TaskCounter.status, TaskCounter.slot],
+        set_={"count": TaskCounter.count + statement.excluded.count}
+    ))
+
+
+def record_status_change(db: Session, old_status, new_status) -> None:
+    """Move one task between status counters"""
+    old_key = status_key(old_status) if old_status is not None else None
+    new_key = status_key(new_status) if new_status is not None else None
+    if old_key == new_key:
+        return
+
+    deltas = {}
+    if old_key:
+        deltas[old_key] = -1
+    if new_key:
+        deltas[new_key] = 1
+    adjust_task_counters(db, deltas)
+
+
+def count_tasks_by_status(db: Session) -> Dict[str, int]:
+    """Task totals for every status, from one grouped scan of tasks"""
+    counts = {status.value: 0 for status in TaskStatus}
+    for status, count in db.query(Task.status, func.count(Task.task_id)).group_by(Task.status):
+        counts[status_key(status)] = count
+    return counts
+
+
+def rebuild_task_counters(db: Session) -> None:
+    """Recompute task_counters from the tasks table (one grouped scan)"""
+    counts = count_tasks_by_status(db)
+
+    db.query(TaskCounter).delete(synchronize_session=False)
+    db.add_all(TaskCounter(status=key, slot=0, count=count) for key, count in counts.items())
+    db.commit()
+
+
+def ensure_task_counters(db: Session) -> None:
+    """
+    Seed task_counters on first start; afterwards they are maintained incrementally.
+
+    Every worker runs this at startup. Existing counters are never touched,
+    so a worker that loses the race to seed them inserts nothing.
+    """
+    if db.query(func.count(func.distinct(TaskCounter.status))).scalar() >= len(TaskStatus):
+        return
+
+    statement = insert(TaskCounter).values([
+        {"status": key, "slot": 0, "count": count} for key, count in count_tasks_by_status(db).items()
+    ])
+    db.execute(statement.on_conflict_do_nothing(index_elements=[TaskCounter.status, TaskCounter.slot]))
+    db.commit()
+
+
+def get_task_count(db: Session, status) -> int:
+    """Read a status total without counting rows (sums its slots)"""
+    return db.query(func.coalesce(func.sum(TaskCounter.count), 0)).filter(
+        TaskCounter.status == status_key(status)
+    ).scalar()
+
+
+def apply_task_update(db: Session, task: Task, update_data: dict) -> Optional[TaskStatus]:
+    """
+    Apply field updates to a task, keeping counters and completed_at in step.
+
+    Returns the previous status if it changed.
+    """
+    previous_status = task.status
+    previous_assignee = task.assigned_to_user_id
+    for field, value in update_data.items():
+        setattr(task, field, value)
+
+    # A reassigned task leaves the previous assignee's synced copy
+    if task.assigned_to_user_id != previous_assignee and previous_assignee != task.assigned_by_user_id:
+        record_deletion(db, "task", task.task_id, user_id=previous_assignee)
+
+    if "status" not in update_data or status_key(task.status) == status_key(previous_status):
+        return None
+
+    task.status = TaskStatus(status_key(task.status))
+    if task.status == TaskStatus.COMPLETED:
+        task.completed_at = datetime.utcnow()
+    elif previous_status == TaskStatus.COMPLETED:
+        task.completed_at = None
+
+    record_status_change(db, previous_status, task.status)
+    return previous_status
@@ -0,0 +1,186 @@
+"""
+Benchmark full-text message search against a synthetic corpus.
+
+Loads N synthetic messages (default 1,000,000) into the configured database
+with a single INSERT ... SELECT, then compares the tsvector/GIN search used by
+GET /api/chat/messages/search with a naive ILIKE scan.
+
+Usage:
+    python benchmarks/bench_message_search.py --messages 1000000 --runs 50
+    python benchmarks/bench_message_search.py --cleanup
+"""
+import sys
+import os
+import argparse
+import random
+import statistics
+import time
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text, func, or_, and_
+
+from app.core.database import SessionLocal, engine, Base
+from app.models.user import User
+from app.models.message import Message, ChatGroup
+from app.models.task import Task  # noqa: F401 - needed for Message relationships
+from app.models.farmer import Farmer  # noqa: F401
+
+BENCH_MESSAGE_TYPE = "benchmark"
+BENCH_GROUP_PREFIX = "Benchmark Group"
+
+WORDS = [
+    "motor", "pump", "panel", "controller", "structure", "wire", "pipe", "dispatch",
+    "delivered", "installation", "pending", "village", "taluka", "circle", "farmer",
+    "photo", "icr", "jsr", "vehicle", "driver", "borewell", "head", "solar", "invoice",
+    "complete", "issue", "repair", "replace", "urgent", "tomorrow", "today", "site",
+    "sadbhav", "mts", "saylip", "crompton", "approved", "rejected", "transit", "stock",
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_corpus(db, message_count, group_count):
+    """Insert synthetic messages in one statement so load time stays server-side"""
+    sender = db.query(User).order_by(User.user_id).first()
+    if sender is None:
+        raise SystemExit("No users found - run scripts/seed.py first")
+
+    group_ids = [
+        g.group_id for g in db.query(ChatGroup).filter(ChatGroup.group_name.like(f"{BENCH_GROUP_PREFIX}%")).all()
+    ]
+    for i in range(len(group_ids), group_count):
+        group = ChatGroup(group_name=f"{BENCH_GROUP_PREFIX} {i + 1}", created_by_user_id=sender.user_id)
+        db.add(group)
+        db.flush()
+        group_ids.append(group.group_id)
+    db.commit()
+
+    existing = db.query(Message).filter(Message.message_type == BENCH_MESSAGE_TYPE).count()
+    missing = message_count - existing
+    if missing <= 0:
+        print(f"📦 Corpus already has {existing} benchmark messages")
+        return group_ids
+
+    print(f"📦 Loading {missing} synthetic messages...")
+    started = time.perf_counter()
+    db.execute(
+        text("""
+            INSERT INTO messages (group_id, sender_user_id, content, message_type, is_edited, is_deleted, created_at)
+            SELECT
+                (:group_ids)[1 + (g % cardinality(:group_ids))],
+                :sender_id,
+                array_to_string(ARRAY(
+                    SELECT (:words)[1 + floor(random() * cardinality(:words))::int]
+                    FROM generate_series(1, 6 + (g % 14))
+                ), ' '),
+                :message_type,
+                false,
+                false,
+                now() - make_interval(secs => g)
+            FROM generate_series(1, :count) AS g
+        """),
+        {
+            "group_ids": group_ids,
+            "sender_id": sender.user_id,
+            "words": WORDS,
+            "message_type": BENCH_MESSAGE_TYPE,
+            "count": missing,
+        }
+    )
+    db.commit()
+    db.execute(text("ANALYZE messages"))
+    db.commit()
+    print(f"✅ Loaded in {time.perf_counter() - started:.1f}s")
+    return group_ids
+
+
+def run_fulltext(db, term, group_id=None, limit=20):
+    ts_query = func.websearch_to_tsquery('simple', term)
+    rank = func.ts_rank_cd(Message.search_vector, ts_query)
+    query = db.query(Message.message_id, rank.label("rank")).filter(
+        Message.search_vector.op('@@')(ts_query),
+        Message.is_deleted == False
+    )
+    if group_id:
+        query = query.filter(Message.group_id == group_id)
+    rows = query.order_by(rank.desc(), Message.message_id.desc()).limit(limit + 1).all()
+
+    # Fetch the second page too, so keyset pagination is part of the measurement
+    if len(rows) > limit:
+        last_id, last_rank = rows[limit - 1]
+        query.filter(or_(
+            rank < last_rank,
+            and_(rank == last_rank, Message.message_id < last_id)
+        )).order_by(rank.desc(), Message.message_id.desc()).limit(limit + 1).all()
+
+
+def run_ilike(db, term, group_id=None, limit=20):
+    query = db.query(Message.message_id).filter(
+        Message.content.ilike(f"%{term}%"),
+        Message.is_deleted == False
+    )
+    if group_id:
+        query = query.filter(Message.group_id == group_id)
+    query.order_by(Message.message_id.desc()).offset(limit).limit(limit).all()
+
+
+def measure(label, fn, db, terms, group_ids):
+    samples = []
+    for term in terms:
+        group_id = random.choice(group_ids + [None])
+        started = time.perf_counter()
+        fn(db, term, group_id)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{label:<12} p50={percentile(samples, 50):8.2f}ms  "
+        f"p99={percentile(samples, 99):8.2f}ms  mean={statistics.mean(samples):8.2f}ms"
+    )
+
+
+def cleanup(db):
+    deleted = db.query(Message).filter(Message.message_type == BENCH_MESSAGE_TYPE).delete(synchronize_session=False)
+    db.query(ChatGroup).filter(ChatGroup.group_name.like(f"{BENCH_GROUP_PREFIX}%")).delete(synchronize_session=False)
+    db.commit()
+    print(f"🧹 Removed {deleted} benchmark messages")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-ilike", action="store_true", help="Skip the sequential-scan baseline")
+    parser.add_argument("--cleanup", action="store_true", help="Remove benchmark rows and exit")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            return
+
+        group_ids = load_corpus(db, args.messages, args.groups)
+
+        rng = random.Random(args.seed)
+        random.seed(args.seed)
+        terms = [
+            " ".join(rng.sample(WORDS, rng.choice([1, 2]))) for _ in range(args.runs)
+        ]
+
+        measure("fulltext", run_fulltext, db, terms, group_ids)
+        if not args.skip_ilike:
+            measure("ilike scan", run_ilike, db, terms, group_ids)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark the cost of MetricsMiddleware per request.
+
+Two measurements, both in-process over ASGI (no server or network):
+
+- own cost: the middleware around a stub ASGI app that only sets the route
+  and sends a response, minus the stub alone. This is the work the
+  middleware itself does per request, and it is stable enough to gate on.
+- end to end: a FastAPI app with a trivial JSON route, with and without the
+  middleware. Besides the middleware's own work this includes the price of
+  one more ASGI layer, and the trivial handler is the worst case for
+  relative overhead: real endpoints spend milliseconds in the database.
+  Rounds alternate between the two apps and the median of the paired
+  differences is reported, which filters out drift from other processes.
+
+Exits 1 when the own cost exceeds --max-cost-us microseconds.
+
+Usage:
+    python benchmarks/bench_metrics.py --requests 5000 --rounds 20
+"""
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import time
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+
+from app.core.metrics import MetricsMiddleware, RequestMetrics, MetricsWriter, write_request_metrics
+
+
+def make_app(instrumented: bool, metrics: RequestMetrics) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/farmers/{beneficiary_id}")
+    async def get_farmer(beneficiary_id: str):
+        return {"beneficiary_id": beneficiary_id, "status": "Delivered"}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+def http_scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def drive(app, count: int) -> float:
+    """Send count GET requests straight into the ASGI app; returns microseconds per request"""
+    started = time.perf_counter()
+    for i in range(count):
+        await app(http_scope(f"/api/farmers/BEN{i % 1000:07d}"), receive, send)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+class StubRoute:
+    path_format = "/api/farmers/{beneficiary_id}"
+
+
+STUB_ROUTE = StubRoute()
+RESPONSE_START = {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]}
+RESPONSE_BODY = {"type": "http.response.body", "body": b'{"status":"Delivered"}'}
+
+
+async def stub_app(scope, receive, send):
+    """What the middleware sees of a routed request, without the framework"""
+    scope["route"] = STUB_ROUTE
+    await send(RESPONSE_START)
+    await send(RESPONSE_BODY)
+
+
+async def compare(apps: dict, requests: int, rounds: int) -> dict:
+    """Per-request microseconds for each app over alternating rounds"""
+    timings = {name: [] for name in apps}
+    for app in apps.values():
+        await drive(app, min(requests, 1000))  # warm up routing, validation and the first series
+    for _ in range(rounds):
+        for name, app in apps.items():
+            timings[name].append(await drive(app, requests))
+    return timings
+
+
+async def run(requests: int, rounds: int) -> float:
+    metrics = RequestMetrics()
+
+    stub = await compare({"bare": stub_app, "instrumented": MetricsMiddleware(stub_app, metrics=RequestMetrics())}, requests * 4, rounds)
+    own_cost = min(stub["instrumented"]) - min(stub["bare"])
+
+    apps = {"bare": make_app(False, metrics), "instrumented": make_app(True, metrics)}
+    timings = await compare(apps, requests, rounds)
+    paired = statistics.median(i - b for i, b in zip(timings["instrumented"], timings["bare"]))
+    bare = statistics.median(timings["bare"])
+
+    print(f"own cost           {own_cost:10.2f}us per request (around a stub app)")
+    print(f"bare FastAPI       {bare:10.2f}us per request (trivial route)")
+    print(f"end to end         {paired:10.2f}us per request, {paired / bare * 100:.1f}% of the trivial route")
+    print(f"series recorded    {len(metrics.series)} (one per route template, not per ID)")
+
+    writer = MetricsWriter()
+    started = time.perf_counter()
+    write_request_metrics(writer, metrics)
+    writer.render()
+    print(f"exposition         {(time.perf_counter() - started) * 1000:10.3f}ms per scrape")
+    return own_cost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--max-cost-us", type=float, default=2.5, help="Fail above this own cost (microseconds per request)")
+    args = parser.parse_args()
+
+    own_cost = asyncio.run(run(args.requests, args.rounds))
+    if own_cost > args.max_cost_us:
+        print(f"❌ Instrumentation costs {own_cost:.2f}us per request (budget {args.max_cost_us}us)")
+        sys.exit(1)
+    print(f"✅ Instrumentation costs {own_cost:.2f}us per request (budget {args.max_cost_us}us)")
+
+
+if __name__ == "__main__":
+    main()
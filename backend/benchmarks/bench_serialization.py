@@ -0,0 +1,166 @@
+"""
+Benchmark list-endpoint serialization on 100-item pages.
+
+Compares the previous path (per-row from_orm().dict(), a second model per
+row, then FastAPI dumping, re-validating and JSON-encoding the return value)
+with the single-pass path used by GET /api/inventory/ and GET /api/farmers/
+(model_validate(from_attributes=True) once, serialized by model_response).
+
+Rows are transient ORM objects, so no database is needed and the numbers are
+pure per-request CPU.
+
+Usage:
+    python benchmarks/bench_serialization.py --items 100 --runs 500
+"""
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, datetime, timezone
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import model_response
+from app.models.user import User  # noqa: F401 - needed for relationships
+from app.models.farmer import Farmer
+from app.models.inventory import Inventory, InventoryCategory, InventoryStatus
+from app.schemas.farmer import FarmerResponse, FarmerListResponse
+from app.schemas.inventory import InventoryResponse, InventoryListResponse
+
+# One loop for the whole run so loop setup is not counted against the old path
+LOOP = asyncio.new_event_loop()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def make_inventory(count):
+    now = datetime.now(timezone.utc)
+    return [
+        Inventory(
+            id=i + 1,
+            category=InventoryCategory.MOTOR,
+            type="5hp",
+            specification="50",
+            quantity=i % 25,
+            min_stock_level=10,
+            unit_price=18500.0,
+            supplier="Crompton",
+            part_number=f"MTR-5-50-{i:05d}",
+            description="Submersible pump motor",
+            location="Main warehouse",
+            status=InventoryStatus.ACTIVE,
+            created_at=now,
+            updated_at=now,
+            created_by_user_id=1,
+        )
+        for i in range(count)
+    ]
+
+
+def make_farmers(count):
+    now = datetime.now(timezone.utc)
+    return [
+        Farmer(
+            beneficiary_id=f"BEN{i:07d}",
+            beneficiary_name=f"Farmer {i}",
+            phone_no="9876543210",
+            scheme="MTS",
+            pumphp="5",
+            pumphead="50",
+            pumphp_combined="5-50",
+            selection_date=date(2024, 1, 15),
+            circle_name="Nashik",
+            taluka_name="Niphad",
+            village_name="Lasalgaon",
+            dispatch_status="Delivered",
+            installation_status="In Progress",
+            photos='["/uploads/blobs/ab/' + "ab" * 32 + '.jpg"]',
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+async def fastapi_serialize(list_model, content):
+    """What FastAPI does with a returned model when the route has a response_model"""
+    field = create_response_field(name="response", type_=list_model)
+    body = await serialize_response(field=field, response_content=content)
+    return JSONResponse(body).body
+
+
+def previous_inventory(items):
+    responses = []
+    for item in items:
+        item_dict = InventoryResponse.from_orm(item).dict()
+        item_dict['is_low_stock'] = item.quantity <= item.min_stock_level
+        responses.append(InventoryResponse(**item_dict))
+    content = InventoryListResponse(items=responses, total=1000, page=1, page_size=len(items), total_pages=10)
+    return LOOP.run_until_complete(fastapi_serialize(InventoryListResponse, content))
+
+
+def single_pass_inventory(items):
+    return model_response(InventoryListResponse.model_validate({
+        "items": items, "total": 1000, "page": 1, "page_size": len(items), "total_pages": 10
+    }, from_attributes=True)).body
+
+
+def previous_farmers(farmers):
+    content = FarmerListResponse(
+        farmers=[FarmerResponse.from_orm(farmer) for farmer in farmers],
+        total=1000, page=1, page_size=len(farmers), total_pages=10
+    )
+    return LOOP.run_until_complete(fastapi_serialize(FarmerListResponse, content))
+
+
+def single_pass_farmers(farmers):
+    return model_response(FarmerListResponse.model_validate({
+        "farmers": farmers, "total": 1000, "page": 1, "page_size": len(farmers), "total_pages": 10
+    }, from_attributes=True)).body
+
+
+def measure(label, fn, rows, runs):
+    fn(rows)  # warm up validators and serializers
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(rows)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{label:<22} p50={percentile(samples, 50):7.3f}ms  "
+        f"p99={percentile(samples, 99):7.3f}ms  mean={statistics.mean(samples):7.3f}ms"
+    )
+    return statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    inventory = make_inventory(args.items)
+    farmers = make_farmers(args.items)
+
+    for name, rows, previous, single_pass in (
+        ("inventory", inventory, previous_inventory, single_pass_inventory),
+        ("farmers", farmers, previous_farmers, single_pass_farmers),
+    ):
+        before = measure(f"{name} previous", previous, rows, args.runs)
+        after = measure(f"{name} single pass", single_pass, rows, args.runs)
+        print(f"{name:<22} saves {before - after:.3f}ms CPU per request ({before / after:.1f}x)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+"""
+Benchmark the API's hot paths end to end and store the results as JSON.
+
+Creates a throwaway PostgreSQL database (<DATABASE_URL name>_bench by
+default), migrates it, seeds it with scripts/generate_data.py at the
+requested scale from a fixed seed, starts the app with uvicorn, then runs
+each scenario with a fixed number of concurrent clients and records
+throughput and p50/p99 latency:
+
+    login, farmers_list, farmers_search, farmers_filter, farmers_summary,
+    inventory_list, inventory_upload, inventory_upload_bulk, dispatch,
+    inventory_stats, dashboard_stats
+
+inventory_upload sends a 50-row CSV; inventory_upload_bulk sends a stock
+sheet of --bulk-rows rows (5,000 by default), one at a time with fewer requests.
+
+Results go to benchmarks/results/<timestamp>-<commit>.json. Compare two runs
+(e.g. main vs a branch) with --compare; it exits 1 when a scenario's p50 or
+throughput regresses by more than --max-regression percent. Numbers are
+only comparable between runs on the same machine with the same scale.
+
+Usage:
+    python benchmarks/run.py --farmers 50000 --messages 50000 --requests 500 --concurrency 10
+    python benchmarks/run.py --compare benchmarks/results/<baseline>.json
+    python benchmarks/run.py --compare-only benchmarks/results/<new>.json benchmarks/results/<baseline>.json
+"""
+import sys
+import os
+import argparse
+import asyncio
+import csv
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# The admin login scripts/generate_data.py creates
+BENCH_EMAIL = "admin@jyotielectrotech.com"
+BENCH_PASSWORD = "admin123"
+
+INVENTORY_TYPES = ["3hp", "5hp", "7.5hp", "10hp"]
+INVENTORY_SPECIFICATIONS = ["30", "50", "70", "100", ""]
+
+SCENARIOS = [
+    "login", "farmers_list", "farmers_search", "farmers_filter", "farmers_summary",
+    "inventory_list", "inventory_upload", "inventory_upload_bulk", "dispatch", "inventory_stats", "dashboard_stats",
+]
+
+
+# --- Database ---------------------------------------------------------------
+
+def bench_database_url(args) -> str:
+    if args.database_url:
+        return args.database_url
+    url = make_url(settings.DATABASE_URL)
+    return url.set(database=f"{url.database}_bench").render_as_string(hide_password=False)
+
+
+def recreate_database(url: str) -> None:
+    target = make_url(url)
+    admin_engine = create_engine(target.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with admin_engine.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{target.database}" WITH (FORCE)'))
+        conn.execute(text(f'CREATE DATABASE "{target.database}"'))
+    admin_engine.dispose()
+
+
+def drop_database(url: str) -> None:
+    target = make_url(url)
+    admin_engine = create_engine(target.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with admin_engine.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{target.database}" WITH (FORCE)'))
+    admin_engine.dispose()
+
+
+def migrate(url: str) -> None:
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": url}, check=True
+    )
+
+
+def seed(url: str, farmers: int, messages: int, installers: int, seed_value: int) -> None:
+    """Load the synthetic dataset with scripts/generate_data.py (COPY, deterministic from the seed)"""
+    subprocess.run(
+        [sys.executable, "scripts/generate_data.py", "--farmers", str(farmers), "--messages", str(messages),
+         "--installers", str(installers), "--seed", str(seed_value)],
+        cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": url}, check=True
+    )
+
+
+def scenario_data(url: str) -> dict:
+    """What the scenarios pick their requests from, read from the seeded database"""
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        beneficiary_ids = list(conn.execute(text(
+            "SELECT beneficiary_id FROM farmers ORDER BY beneficiary_id LIMIT 1000"
+        )).scalars())
+        locations = [tuple(row) for row in conn.execute(text(
+            "SELECT DISTINCT circle_name, taluka_name FROM farmers ORDER BY 1, 2"
+        ))]
+        surnames = list(conn.execute(text(
+            "SELECT DISTINCT split_part(beneficiary_name, ' ', 2) FROM farmers ORDER BY 1"
+        )).scalars())
+        phone_prefixes = list(conn.execute(text(
+            "SELECT left(phone_no, 6) FROM farmers ORDER BY beneficiary_id LIMIT 10"
+        )).scalars())
+        # Deep stock on the SKUs dispatch draws from, so it never runs out mid-run
+        dispatchable = list(conn.execute(text(
+            "UPDATE inventory SET quantity = quantity + 1000000 "
+            "WHERE id IN (SELECT id FROM inventory ORDER BY id LIMIT 100) RETURNING id"
+        )).scalars())
+        farmer_count = conn.execute(text("SELECT count(*) FROM farmers")).scalar()
+        inventory_count = conn.execute(text("SELECT count(*) FROM inventory")).scalar()
+    engine.dispose()
+    return {
+        "beneficiary_ids": beneficiary_ids,
+        "locations": locations,
+        "search_terms": surnames + phone_prefixes,
+        "dispatchable": sorted(dispatchable),
+        "farmer_pages": max(1, farmer_count // settings.DEFAULT_PAGE_SIZE),
+        "inventory_pages": max(1, inventory_count // settings.DEFAULT_PAGE_SIZE),
+    }
+
+
+# --- Server -----------------------------------------------------------------
+
+def start_server(url: str, port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": url, "DEBUG": "false", "PORT": str(port)}
+    env.pop("DATABASE_REPLICA_URL", None)
+    env.pop("METRICS_TOKEN", None)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:socket_app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not become healthy within 60 seconds")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+# --- Scenarios --------------------------------------------------------------
+
+def upload_csv(rows: int, offset: int) -> bytes:
+    """An inventory upload file; even rows add stock to existing item kinds, odd rows create items"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["category", "type", "specification", "quantity", "min_stock_level", "unit_price", "part_number"])
+    for i in range(rows):
+        specification = INVENTORY_SPECIFICATIONS[i % 4] if i % 2 == 0 else f"U{offset}-{i}"
+        writer.writerow(["motor", INVENTORY_TYPES[i % 4], specification, 5, 2, 18000, f"UPLOAD-{offset}-{i}"])
+    return buffer.getvalue().encode()
+
+
+def build_requests(name: str, data: dict, i: int) -> dict:
+    """httpx request arguments for the i-th request of a scenario (deterministic)"""
+    rng = random.Random(i)
+    if name == "login":
+        return {"method": "POST", "url": "/api/auth/login", "json": {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}}
+    if name == "farmers_list":
+        return {"method": "GET", "url": "/api/farmers/", "params": {"page": rng.randint(1, min(data["farmer_pages"], 50))}}
+    if name == "farmers_search":
+        return {"method": "GET", "url": "/api/farmers/", "params": {"search": rng.choice(data["search_terms"])}}
+    if name == "farmers_filter":
+        circle, taluka = rng.choice(data["locations"])
+        return {"method": "GET", "url": "/api/farmers/", "params": {
+            "circle_name": circle, "taluka_name": taluka, "installation_status": "In Progress"
+        }}
+    if name == "farmers_summary":
+        return {"method": "GET", "url": "/api/farmers/stats/summary"}
+    if name == "inventory_list":
+        return {"method": "GET", "url": "/api/inventory/", "params": {"page": rng.randint(1, min(data["inventory_pages"], 20))}}
+    if name == "inventory_upload":
+        return {"method": "POST", "url": "/api/inventory/upload",
+                "files": {"file": ("inventory.csv", upload_csv(50, i), "text/csv")}}
+    if name == "inventory_upload_bulk":
+        return {"method": "POST", "url": "/api/inventory/upload",
+                "files": {"file": ("stock.csv", upload_csv(data["bulk_rows"], i), "text/csv")}}
+    if name == "dispatch":
+        items = rng.sample(data["dispatchable"], min(3, len(data["dispatchable"])))
+        return {"method": "POST", "url": "/api/inventory/dispatch", "json": {
+            "farmer_beneficiary_id": rng.choice(data["beneficiary_ids"]),
+            "items": [{"inventory_id": item, "quantity": 1, "unit_cost": 100.0} for item in items],
+        }}
+    if name == "inventory_stats":
+        return {"method": "GET", "url": "/api/inventory/stats/dashboard"}
+    if name == "dashboard_stats":
+        return {"method": "GET", "url": "/api/dashboard/stats"}
+    raise ValueError(f"Unknown scenario {name}")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, data: dict, requests: int,
+                       concurrency: int, warmup: int) -> dict:
+    """Closed loop: concurrency clients send requests back to back until the total is reached"""
+    for i in range(warmup):
+        await client.request(**build_requests(name, data, -1 - i))
+
+    latencies, errors = [], 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await client.request(**build_requests(name, data, i))
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+    }
+
+
+async def run_scenarios(port: int, data: dict, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        login = await client.post("/api/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        login.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        results = {}
+        for name in args.scenarios:
+            # bcrypt makes login CPU-bound by design, so it gets fewer requests. A bulk
+            # upload is thousands of rows that an admin sends one file at a time
+            requests, concurrency, warmup = args.requests, args.concurrency, args.warmup
+            if name == "login":
+                requests = max(args.concurrency, args.requests // 5)
+            elif name == "inventory_upload_bulk":
+                requests, concurrency, warmup = max(1, args.requests // 50), 1, min(args.warmup, 1)
+            results[name] = await run_scenario(client, name, data, requests, concurrency, warmup)
+            result = results[name]
+            flag = f"  ❌ {result['errors']} errors" if result["errors"] else ""
+            print(f"  {name:<18} {result['throughput_rps']:9.1f} req/s  p50={result['p50_ms']:8.2f}ms  "
+                  f"p99={result['p99_ms']:8.2f}ms{flag}")
+        return results
+
+
+# --- Results ----------------------------------------------------------------
+
+def git_commit() -> dict:
+    def git(*command):
+        return subprocess.run(["git", *command], cwd=BACKEND_DIR, capture_output=True, text=True).stdout.strip()
+    return {"commit": git("rev-parse", "HEAD") or None, "dirty": bool(git("status", "--porcelain"))}
+
+
+def server_version(url: str) -> str:
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        version = conn.execute(text("SHOW server_version")).scalar()
+    engine.dispose()
+    return version
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> bool:
+    """Print per-scenario changes; False when a scenario regressed beyond max_regression percent"""
+    print(f"\n📊 Compared with {baseline['git']['commit'] or 'unknown'} ({baseline['timestamp']})")
+    if baseline["config"] != current["config"]:
+        print("⚠️  Runs used different settings; the comparison is indicative only")
+    ok = True
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        throughput = (result["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100
+        p50 = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        p99 = (result["p99_ms"] - before["p99_ms"]) / before["p99_ms"] * 100
+        regressed = throughput < -max_regression or p50 > max_regression
+        ok = ok and not regressed
+        print(f"  {'❌' if regressed else '✅'} {name:<18} throughput {throughput:+6.1f}%  "
+              f"p50 {p50:+6.1f}%  p99 {p99:+6.1f}%")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Database to (re)create for the run (default: <DATABASE_URL>_bench)")
+    parser.add_argument("--farmers", type=int, default=50000)
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--installers", type=int, default=50)
+    parser.add_argument("--bulk-rows", type=int, default=5000, help="Rows per inventory_upload_bulk file")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset to run")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="Baseline result file to compare against")
+    parser.add_argument("--compare-only", nargs=2, metavar=("CURRENT", "BASELINE"), help="Compare two result files and exit")
+    parser.add_argument("--max-regression", type=float, default=10.0, help="Percent change that fails --compare")
+    parser.add_argument("--keep-db", action="store_true", help="Leave the benchmark database in place")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    if args.compare_only:
+        current, baseline = (json.loads(Path(path).read_text()) for path in args.compare_only)
+        sys.exit(0 if compare(current, baseline, args.max_regression) else 1)
+
+    url = bench_database_url(args)
+    print(f"🗄️  Creating {make_url(url).database} and migrating...")
+    recreate_database(url)
+    try:
+        migrate(url)
+        print(f"🌱 Seeding {args.farmers} farmers, {args.messages} messages...")
+        started = time.perf_counter()
+        seed(url, args.farmers, args.messages, args.installers, args.seed)
+        data = {**scenario_data(url), "bulk_rows": args.bulk_rows}
+        print(f"   seeded in {time.perf_counter() - started:.1f}s")
+
+        print(f"🚀 Starting the API ({args.workers} worker(s)) on port {args.port}...")
+        server = start_server(url, args.port, args.workers)
+        try:
+            print(f"⏱️  {args.requests} requests per scenario, {args.concurrency} concurrent clients")
+            scenarios = asyncio.run(run_scenarios(args.port, data, args))
+        finally:
+            stop_server(server)
+
+        result = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git": git_commit(),
+            "config": {
+                "farmers": args.farmers,
+                "messages": args.messages,
+                "installers": args.installers,
+                "bulk_rows": args.bulk_rows,
+                "seed": args.seed,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "warmup": args.warmup,
+                "workers": args.workers,
+            },
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "postgres": server_version(url),
+            },
+            "scenarios": scenarios,
+        }
+    finally:
+        if not args.keep_db:
+            drop_database(url)
+
+    commit = (result["git"]["commit"] or "nogit")[:10]
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"💾 Results written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        sys.exit(0 if compare(result, baseline, args.max_regression) else 1)
+    failed = [name for name, scenario in scenarios.items() if scenario["errors"]]
+    if failed:
+        print(f"❌ Scenarios with errors: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
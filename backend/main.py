@@ -1,17 +1,66 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import socketio
 import uvicorn
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
+from urllib.parse import parse_qs
 
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api import auth, farmers, tasks, chat, dashboard, users, inventory
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+from app.core.database import engine, Base, SessionLocal
+from app.core.security import verify_token
+from app.core.presence import presence, run_flush_loop
+from app.core.realtime import sio, user_room, is_user_room
+from app.core.static import UploadFiles
+from app.core.compression import CompressionMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.profiler import ProfilingMiddleware
+from app.core.replica import read_router, run_lag_monitor
+from app.services.tasks import ensure_task_counters
+from app.services.sync import purge_tombstones, run_purge_loop
+from app.services.task_scheduler import task_scheduler
+from app.services.images import shutdown_executor
+from app.api import auth, farmers, tasks, chat, dashboard, users, inventory, uploads, sync, admin, metrics
+
+def initialize_database_state():
+    db = SessionLocal()
+    try:
+        ensure_task_counters(db)
+        purge_tombstones(db)
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown. Nothing touches the database or filesystem at import
+    time, so importing the app (and booting a worker) stays fast.
+    """
+    # Schema comes from migrations (alembic upgrade head); create_all is for throwaway databases
+    if settings.AUTO_CREATE_SCHEMA:
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+    Path(settings.UPLOAD_DIR).mkdir(exist_ok=True)
+    await asyncio.to_thread(initialize_database_state)
+
+    background_tasks = [
+        asyncio.create_task(run_flush_loop(presence, settings.PRESENCE_FLUSH_INTERVAL_SECONDS)),
+        asyncio.create_task(task_scheduler.run()),
+        asyncio.create_task(run_purge_loop(settings.SYNC_TOMBSTONE_PURGE_INTERVAL_SECONDS)),
+    ]
+    if read_router.enabled:
+        background_tasks.append(asyncio.create_task(
+            run_lag_monitor(read_router, settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+        ))
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        shutdown_executor()
 
 # Create FastAPI app
 app = FastAPI(
@@ -19,7 +68,8 @@ app = FastAPI(
     description="Farmer Management System Backend API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -31,18 +81,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create uploads directory if it doesn't exist
-uploads_dir = Path("uploads")
-uploads_dir.mkdir(exist_ok=True)
+# Compress responses (brotli or gzip, per Accept-Encoding) within a CPU budget
+app.add_middleware(CompressionMiddleware)
 
-# Serve static files
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Count SQL statements per request; log slow requests and N+1 suspects
+app.add_middleware(QueryStatsMiddleware)
 
-# Socket.IO server
-sio = socketio.AsyncServer(
-    async_mode='asgi',
-    cors_allowed_origins=settings.ALLOWED_ORIGINS
-)
+# Mark requests for an on-demand request profile (POST /api/admin/profile?route=...)
+app.add_middleware(ProfilingMiddleware)
+
+# Request latency per route and in-flight requests for /metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+
+# Serve uploaded files (immutable caching for content-addressed blobs, ETags, ranges);
+# the directory is created on startup
+app.mount(f"/{settings.UPLOAD_DIR}", UploadFiles(directory=settings.UPLOAD_DIR, check_dir=False), name="uploads")
 
 # Combine FastAPI and Socket.IO
 socket_app = socketio.ASGIApp(sio, app)
@@ -55,6 +108,10 @@ app.include_router(tasks.router, prefix="/api/tasks", tags=["Tasks"])
 app.include_router(chat.router, prefix="/api/chat", tags=["Chat"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
 app.include_router(inventory.router, prefix="/api/inventory", tags=["Inventory"])
+app.include_router(uploads.router, prefix="/api/uploads", tags=["Uploads"])
+app.include_router(sync.router, prefix="/api/sync", tags=["Sync"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+app.include_router(metrics.router, tags=["Monitoring"])
 
 # Health check endpoint
 @app.get("/health")
@@ -74,20 +131,47 @@ async def root():
         "health": "/health"
     }
 
+def get_socket_user_id(environ, auth):
+    """Resolve the user ID from the JWT passed in the auth payload or query string"""
+    token = None
+    if isinstance(auth, dict):
+        token = auth.get('token')
+    if not token:
+        token = parse_qs(environ.get('QUERY_STRING', '')).get('token', [None])[0]
+    if not token:
+        return None
+    
+    payload = verify_token(token)
+    if payload is None or payload.get('sub') is None:
+        return None
+    return int(payload['sub'])
+
 # Socket.IO events
 @sio.event
-async def connect(sid, environ):
+async def connect(sid, environ, auth=None):
     print(f"Client {sid} connected")
+    user_id = get_socket_user_id(environ, auth)
+    if user_id is not None:
+        presence.connect(sid, user_id)
+        await sio.enter_room(sid, user_room(user_id))
     await sio.emit('message', {'data': 'Connected to Project Moriarty'}, room=sid)
 
 @sio.event
 async def disconnect(sid):
     print(f"Client {sid} disconnected")
+    presence.disconnect(sid)
+
+@sio.event
+async def heartbeat(sid, data=None):
+    presence.touch_sid(sid)
 
 @sio.event
 async def join_room(sid, data):
     room = data.get('room')
-    if room:
+    if room and is_user_room(room):
+        # Would receive another user's notifications
+        await sio.emit('message', {'data': f'Cannot join room {room}'}, room=sid)
+    elif room:
         await sio.enter_room(sid, room)
         await sio.emit('message', {'data': f'Joined room {room}'}, room=sid)
 
@@ -103,8 +187,10 @@ async def send_message(sid, data):
     room = data.get('room', sid)
     message = data.get('message')
     user = data.get('user')
+    presence.touch_sid(sid)
     
-    if message:
+    # User rooms carry server notifications only
+    if message and not is_user_room(room):
         await sio.emit('new_message', {
             'message': message,
             'user': user,
@@ -0,0 +1,35 @@
+"""
+Index changes that don't block writes, for use in revisions.
+
+CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction, so each call
+commits the revision's transaction so far and runs in autocommit. Both are
+idempotent (IF [NOT] EXISTS), so a revision that failed half way can be rerun.
+"""
+from alembic import context, op
+from sqlalchemy import text
+
+
+def drop_invalid_index(name: str) -> None:
+    # A failed CONCURRENTLY build leaves an INVALID index behind; IF NOT EXISTS would keep it
+    if context.is_offline_mode():
+        return
+    invalid = op.get_bind().execute(
+        text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND NOT i.indisvalid
+        """),
+        {"name": name}
+    ).scalar()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def create_index_concurrently(name: str, table: str, columns, **kw) -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(name)
+        op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,273 @@
+"""baseline: tables as created by Base.metadata.create_all
+
+Databases created by the app's old create_all on startup already match this
+revision; mark them with `alembic stamp 0001` instead of upgrading through it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Enum columns store member names
+user_role = sa.Enum('ADMIN', 'EMPLOYEE', 'CUSTOMER', name='userrole')
+user_status = sa.Enum('ACTIVE', 'INACTIVE', 'SUSPENDED', name='userstatus')
+inventory_category = sa.Enum(
+    'MOTOR', 'CONTROLLER', 'SOLAR_PANEL', 'BOS', 'STRUCTURE', 'WIRE', 'PIPE', name='inventorycategory'
+)
+inventory_status = sa.Enum('ACTIVE', 'INACTIVE', 'OUT_OF_STOCK', name='inventorystatus')
+task_status = sa.Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='taskstatus')
+task_priority = sa.Enum('LOW', 'MEDIUM', 'HIGH', 'URGENT', name='taskpriority')
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('role', user_role, nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('phone', sa.String(length=15), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.Text(), nullable=False),
+        sa.Column('status', user_status, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_user_id', 'users', ['user_id'])
+
+    op.create_table(
+        'farmers',
+        sa.Column('beneficiary_id', sa.String(length=50), nullable=False),
+        sa.Column('beneficiary_name', sa.String(length=255), nullable=False),
+        sa.Column('phone_no', sa.String(length=15), nullable=True),
+        sa.Column('aadhaar_no', sa.String(length=20), nullable=True),
+        sa.Column('scheme', sa.String(length=20), nullable=False),
+        sa.Column('pumphp', sa.String(length=20), nullable=True),
+        sa.Column('pumphead', sa.String(length=20), nullable=True),
+        sa.Column('pumphp_combined', sa.String(length=50), sa.Computed("pumphp || '-' || pumphead"), nullable=True),
+        sa.Column('selection_date', sa.Date(), nullable=True),
+        sa.Column('circle_name', sa.String(length=100), nullable=True),
+        sa.Column('taluka_name', sa.String(length=100), nullable=True),
+        sa.Column('village_name', sa.String(length=100), nullable=True),
+        sa.Column('installer_user_id', sa.Integer(), nullable=True),
+        sa.Column('ld', sa.String(length=50), nullable=True),
+        sa.Column('jsr_status', sa.String(length=20), nullable=True),
+        sa.Column('dispatch_status', sa.String(length=50), nullable=True),
+        sa.Column('dispatch_date', sa.Date(), nullable=True),
+        sa.Column('vehicle_no', sa.String(length=50), nullable=True),
+        sa.Column('driver_info', sa.String(length=255), nullable=True),
+        sa.Column('installation_status', sa.String(length=50), nullable=True),
+        sa.Column('installation_remark', sa.Text(), nullable=True),
+        sa.Column('icr_status', sa.String(length=50), nullable=True),
+        sa.Column('photos', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['installer_user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('beneficiary_id')
+    )
+    op.create_index('ix_farmers_beneficiary_id', 'farmers', ['beneficiary_id'])
+
+    op.create_table(
+        'inventory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('category', inventory_category, nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('specification', sa.String(length=50), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('min_stock_level', sa.Integer(), nullable=True),
+        sa.Column('unit_price', sa.Float(), nullable=True),
+        sa.Column('supplier', sa.String(length=255), nullable=True),
+        sa.Column('part_number', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('document_url', sa.Text(), nullable=True),
+        sa.Column('status', inventory_status, nullable=True),
+        sa.Column('location', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_inventory_category', 'inventory', ['category'])
+    op.create_index('ix_inventory_id', 'inventory', ['id'])
+
+    op.create_table(
+        'inventory_transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('inventory_id', sa.Integer(), nullable=False),
+        sa.Column('transaction_type', sa.String(length=20), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('previous_quantity', sa.Integer(), nullable=False),
+        sa.Column('new_quantity', sa.Integer(), nullable=False),
+        sa.Column('reference_type', sa.String(length=50), nullable=True),
+        sa.Column('reference_id', sa.String(length=50), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('unit_cost', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_inventory_transactions_id', 'inventory_transactions', ['id'])
+
+    op.create_table(
+        'farmer_dispatches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('farmer_beneficiary_id', sa.String(length=50), nullable=False),
+        sa.Column('dispatch_date', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('total_value', sa.Float(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['farmer_beneficiary_id'], ['farmers.beneficiary_id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_farmer_dispatches_id', 'farmer_dispatches', ['id'])
+
+    op.create_table(
+        'farmer_dispatch_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dispatch_id', sa.Integer(), nullable=False),
+        sa.Column('inventory_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_cost', sa.Float(), nullable=True),
+        sa.Column('total_cost', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['dispatch_id'], ['farmer_dispatches.id']),
+        sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_farmer_dispatch_items_id', 'farmer_dispatch_items', ['id'])
+
+    op.create_table(
+        'tasks',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('assigned_to_user_id', sa.Integer(), nullable=False),
+        sa.Column('assigned_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('farmer_beneficiary_id', sa.String(length=50), nullable=True),
+        sa.Column('status', task_status, nullable=False),
+        sa.Column('priority', task_priority, nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=True),
+        sa.Column('tags', postgresql.ARRAY(sa.String(length=50)), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['assigned_by_user_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['assigned_to_user_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['farmer_beneficiary_id'], ['farmers.beneficiary_id']),
+        sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_tasks_task_id', 'tasks', ['task_id'])
+
+    op.create_table(
+        'task_counters',
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('status')
+    )
+
+    op.create_table(
+        'blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('extension', sa.String(length=10), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('last_referenced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table(
+        'chat_groups',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('group_name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('group_id')
+    )
+    op.create_index('ix_chat_groups_group_id', 'chat_groups', ['group_id'])
+
+    op.create_table(
+        'chat_group_members',
+        sa.Column('member_id', sa.Integer(), nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['group_id'], ['chat_groups.group_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('member_id')
+    )
+    op.create_index('ix_chat_group_members_member_id', 'chat_group_members', ['member_id'])
+
+    op.create_table(
+        'messages',
+        sa.Column('message_id', sa.Integer(), nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('sender_user_id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('message_type', sa.String(length=20), nullable=True),
+        sa.Column('file_url', sa.String(length=500), nullable=True),
+        sa.Column('reply_to_message_id', sa.Integer(), nullable=True),
+        sa.Column('mentions', postgresql.ARRAY(sa.Integer()), nullable=True),
+        sa.Column('tags', postgresql.ARRAY(sa.String(length=50)), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=True),
+        sa.Column('farmer_beneficiary_id', sa.String(length=50), nullable=True),
+        sa.Column('is_edited', sa.Boolean(), nullable=True),
+        sa.Column('is_deleted', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column(
+            'search_vector', postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', coalesce(content, ''))", persisted=True), nullable=True
+        ),
+        sa.ForeignKeyConstraint(['farmer_beneficiary_id'], ['farmers.beneficiary_id']),
+        sa.ForeignKeyConstraint(['group_id'], ['chat_groups.group_id']),
+        sa.ForeignKeyConstraint(['reply_to_message_id'], ['messages.message_id']),
+        sa.ForeignKeyConstraint(['sender_user_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.task_id']),
+        sa.PrimaryKeyConstraint('message_id')
+    )
+    op.create_index('ix_messages_message_id', 'messages', ['message_id'])
+
+
+def downgrade():
+    for table in (
+        'messages', 'chat_group_members', 'chat_groups', 'tombstones', 'blobs', 'task_counters', 'tasks',
+        'farmer_dispatch_items', 'farmer_dispatches', 'inventory_transactions', 'inventory', 'farmers', 'users'
+    ):
+        op.drop_table(table)
+    for enum_type in (task_priority, task_status, inventory_status, inventory_category, user_status, user_role):
+        enum_type.drop(op.get_bind(), checkfirst=True)
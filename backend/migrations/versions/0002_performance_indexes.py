@@ -0,0 +1,81 @@
+"""performance indexes, built online
+
+Creates every secondary index the models declare, including the ones that
+used to exist only in database_setup.sql, with CREATE INDEX CONCURRENTLY so
+farmers/tasks/messages keep taking writes during the build. Indexes that
+already exist (from create_all or the old SQL file) are left alone.
+
+Drops the ix_<table>_<pk> indexes that index=True put on primary keys; each
+one duplicated the primary key index and only slowed down writes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from migrations.online import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, options)
+INDEXES = [
+    ('idx_farmers_scheme', 'farmers', ['scheme'], {}),
+    ('idx_farmers_dispatch_status', 'farmers', ['dispatch_status'], {}),
+    ('idx_farmers_installation_status', 'farmers', ['installation_status'], {}),
+    ('idx_farmers_circle_name', 'farmers', ['circle_name'], {}),
+    ('idx_farmers_created_at', 'farmers', ['created_at'], {}),
+    ('idx_farmers_updated_at', 'farmers', ['updated_at', 'beneficiary_id'], {}),
+    ('idx_inventory_category', 'inventory', ['category'], {}),
+    ('idx_inventory_status', 'inventory', ['status'], {}),
+    ('idx_inventory_quantity', 'inventory', ['quantity'], {}),
+    ('idx_inventory_created_at', 'inventory', ['created_at'], {}),
+    ('idx_inventory_updated_at', 'inventory', ['updated_at', 'id'], {}),
+    ('idx_inventory_transactions_inventory_id', 'inventory_transactions', ['inventory_id'], {}),
+    ('idx_inventory_transactions_created_at', 'inventory_transactions', ['created_at'], {}),
+    ('idx_tasks_status', 'tasks', ['status'], {}),
+    ('idx_tasks_created_at', 'tasks', ['created_at'], {}),
+    ('idx_tasks_tags', 'tasks', ['tags'], {'postgresql_using': 'gin'}),
+    ('idx_tasks_assignee_status_due', 'tasks', ['assigned_to_user_id', 'status', 'due_date', 'task_id'], {}),
+    ('idx_tasks_due_date', 'tasks', ['due_date'], {}),
+    ('idx_tasks_updated_at', 'tasks', ['updated_at', 'task_id'], {}),
+    ('idx_tombstones_entity_deleted', 'tombstones', ['entity_type', 'deleted_at', 'id'], {}),
+    ('idx_messages_group_id', 'messages', ['group_id'], {}),
+    ('idx_messages_created_at', 'messages', ['created_at'], {}),
+    ('idx_messages_search_vector', 'messages', ['search_vector'], {'postgresql_using': 'gin'}),
+    ('idx_messages_mentions', 'messages', ['mentions'], {'postgresql_using': 'gin'}),
+    ('idx_messages_tags', 'messages', ['tags'], {'postgresql_using': 'gin'}),
+]
+
+# ix_inventory_category is replaced by idx_inventory_category; the rest duplicate primary keys
+REDUNDANT_INDEXES = [
+    ('ix_inventory_category', 'inventory', ['category']),
+    ('ix_users_user_id', 'users', ['user_id']),
+    ('ix_farmers_beneficiary_id', 'farmers', ['beneficiary_id']),
+    ('ix_inventory_id', 'inventory', ['id']),
+    ('ix_inventory_transactions_id', 'inventory_transactions', ['id']),
+    ('ix_farmer_dispatches_id', 'farmer_dispatches', ['id']),
+    ('ix_farmer_dispatch_items_id', 'farmer_dispatch_items', ['id']),
+    ('ix_tasks_task_id', 'tasks', ['task_id']),
+    ('ix_chat_groups_group_id', 'chat_groups', ['group_id']),
+    ('ix_chat_group_members_member_id', 'chat_group_members', ['member_id']),
+    ('ix_messages_message_id', 'messages', ['message_id']),
+]
+
+
+def upgrade():
+    for name, table, columns, options in INDEXES:
+        create_index_concurrently(name, table, columns, **options)
+    for name, table, _ in REDUNDANT_INDEXES:
+        drop_index_concurrently(name, table)
+
+
+def downgrade():
+    for name, table, columns in REDUNDANT_INDEXES:
+        create_index_concurrently(name, table, columns)
+    for name, table, _, _ in reversed(INDEXES):
+        drop_index_concurrently(name, table)
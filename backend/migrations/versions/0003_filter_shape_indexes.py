@@ -0,0 +1,55 @@
+"""composite, partial and trigram indexes for the list filters
+
+- idx_farmers_location (circle, taluka, village) replaces idx_farmers_circle_name,
+  which is its prefix
+- idx_farmers_installer: installer filter (and the FK had no index)
+- trigram GIN indexes for the farmer search (ILIKE '%term%' on name, phone, id)
+- idx_inventory_low_stock: partial index over rows with quantity <= min_stock_level
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = [
+    ('idx_farmers_name_trgm', 'beneficiary_name'),
+    ('idx_farmers_phone_trgm', 'phone_no'),
+    ('idx_farmers_id_trgm', 'beneficiary_id'),
+]
+
+
+def upgrade():
+    # Trusted extension: the database owner can create it (PostgreSQL 13+)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    create_index_concurrently('idx_farmers_location', 'farmers', ['circle_name', 'taluka_name', 'village_name'])
+    drop_index_concurrently('idx_farmers_circle_name', 'farmers')
+    create_index_concurrently('idx_farmers_installer', 'farmers', ['installer_user_id'])
+    for name, column in TRIGRAM_INDEXES:
+        create_index_concurrently(
+            name, 'farmers', [column], postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+    create_index_concurrently(
+        'idx_inventory_low_stock', 'inventory', ['id'], postgresql_where=sa.text('quantity <= min_stock_level')
+    )
+
+
+def downgrade():
+    drop_index_concurrently('idx_inventory_low_stock', 'inventory')
+    for name, _ in TRIGRAM_INDEXES:
+        drop_index_concurrently(name, 'farmers')
+    drop_index_concurrently('idx_farmers_installer', 'farmers')
+    create_index_concurrently('idx_farmers_circle_name', 'farmers', ['circle_name'])
+    drop_index_concurrently('idx_farmers_location', 'farmers')
@@ -0,0 +1,36 @@
+"""trigram indexes for the inventory search
+
+The inventory search (ILIKE '%term%' on description, part number, supplier)
+read the whole table; pg_trgm is already installed by 0003.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from migrations.online import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = [
+    ('idx_inventory_description_trgm', 'description'),
+    ('idx_inventory_part_number_trgm', 'part_number'),
+    ('idx_inventory_supplier_trgm', 'supplier'),
+]
+
+
+def upgrade():
+    for name, column in TRIGRAM_INDEXES:
+        create_index_concurrently(
+            name, 'inventory', [column], postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    for name, _ in TRIGRAM_INDEXES:
+        drop_index_concurrently(name, 'inventory')
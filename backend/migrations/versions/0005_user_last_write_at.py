@@ -0,0 +1,28 @@
+"""users.last_write_at for read-your-writes across workers
+
+Each user's last committed write, so any worker can keep that user's reads
+on the primary while the replica may not have it yet. Nullable with no
+default, so adding it doesn't rewrite the table.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('last_write_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('users', 'last_write_at')
@@ -0,0 +1,27 @@
+"""users.last_seen_at for presence
+
+Socket.IO last-seen times were written into users.last_login, which is the
+login time. Nullable with no default, so adding it doesn't rewrite the table.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('users', 'last_seen_at')
@@ -0,0 +1,36 @@
+"""split task_counters over slots
+
+Every task write upserted the one task_counters row for its status, so all
+concurrent task writes queued on that row lock until commit. Each status now
+has up to TASK_COUNTER_SLOTS rows, summed on read. Existing totals become
+slot 0. task_counters has one row per status, so the rewrite is instant.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_counters', sa.Column('slot', sa.Integer(), server_default='0', nullable=False))
+    op.drop_constraint('task_counters_pkey', 'task_counters', type_='primary')
+    op.create_primary_key('task_counters_pkey', 'task_counters', ['status', 'slot'])
+
+
+def downgrade():
+    # Fold the slots back into one row per status
+    op.execute("INSERT INTO task_counters (status, slot, count) SELECT status, -1, sum(count) FROM task_counters GROUP BY status")
+    op.execute("DELETE FROM task_counters WHERE slot <> -1")
+    op.drop_constraint('task_counters_pkey', 'task_counters', type_='primary')
+    op.drop_column('task_counters', 'slot')
+    op.create_primary_key('task_counters_pkey', 'task_counters', ['status'])
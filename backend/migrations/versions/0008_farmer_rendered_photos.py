@@ -0,0 +1,30 @@
+"""farmers.rendered_photos
+
+JSON list of the photo URLs whose resized variants were rendered, so
+responses build variant URLs without checking files on disk. Nullable with
+no default, so adding it doesn't rewrite the table. Photos uploaded with
+variants before this column existed are marked by
+scripts/backfill_rendered_photos.py.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('farmers', sa.Column('rendered_photos', sa.Text(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('farmers', 'rendered_photos')
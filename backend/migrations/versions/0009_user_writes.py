@@ -0,0 +1,40 @@
+"""move last_write_at from users to user_writes
+
+Stamping users.last_write_at took the user's row lock in every write
+transaction, so one user's concurrent writes queued on their users row, and
+rewrote that hot row. user_writes holds only the stamp. Existing stamps are
+copied over. They matter only for REPLICA_STICKY_SECONDS, so the copy is
+small.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_writes',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('last_write_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute("INSERT INTO user_writes (user_id, last_write_at) SELECT user_id, last_write_at FROM users WHERE last_write_at IS NOT NULL")
+    op.drop_column('users', 'last_write_at')
+
+
+def downgrade():
+    op.add_column('users', sa.Column('last_write_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE users SET last_write_at = user_writes.last_write_at FROM user_writes WHERE users.user_id = user_writes.user_id")
+    op.drop_table('user_writes')
@@ -0,0 +1,59 @@
+"""
+Record which farmer photos already have variant files on disk.
+
+Responses only link variants listed in farmers.rendered_photos (set by the
+upload endpoints). Photos uploaded with variants before that column existed
+are found here by checking the files once. Safe to rerun.
+
+Usage:
+    python scripts/backfill_rendered_photos.py [--batch-size 1000]
+"""
+import sys
+import os
+import argparse
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.models import blob, farmer, inventory, message, task, tombstone, user  # noqa: F401
+from app.models.farmer import Farmer
+from app.services.images import (
+    VARIANTS, has_variants, parse_photo_refs, serialize_photo_refs, url_path, variant_url
+)
+
+
+def backfill(batch_size: int) -> int:
+    """Mark photos whose variants exist; returns the number of farmers updated"""
+    db = SessionLocal()
+    updated = 0
+    last_id = ""
+    try:
+        while True:
+            farmers = db.query(Farmer).filter(
+                Farmer.photos.isnot(None), Farmer.beneficiary_id > last_id
+            ).order_by(Farmer.beneficiary_id).limit(batch_size).all()
+            if not farmers:
+                break
+            for row in farmers:
+                rendered = parse_photo_refs(row.rendered_photos)
+                found = [
+                    url for url in parse_photo_refs(row.photos)
+                    if url not in rendered and has_variants(url)
+                    and all(url_path(variant_url(url, name)).is_file() for name in VARIANTS)
+                ]
+                if found:
+                    row.rendered_photos = serialize_photo_refs(rendered + found)
+                    updated += 1
+            last_id = farmers[-1].beneficiary_id
+            db.commit()
+    finally:
+        db.close()
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record which farmer photos have variant files")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"✅ Marked rendered photos on {backfill(args.batch_size)} farmers")
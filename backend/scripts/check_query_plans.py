@@ -0,0 +1,145 @@
+"""
+Fail if a hot query can't use an index.
+
+EXPLAINs the queries behind the busiest filters (farmer/inventory lists,
+task queue, delta sync, chat search) with sequential scans disabled. A plan
+that still contains a Seq Scan (or an index scan with no index condition)
+has no usable index, e.g. after an index was dropped or a filter changed. Disabling seq scans makes the check independent
+of table size, so it works on a small CI database. Run after
+`alembic upgrade head`; exits 1 on a regression.
+
+Usage:
+    python scripts/check_query_plans.py [--verbose]
+"""
+import sys
+import os
+import argparse
+from datetime import date, datetime, timezone
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, func, or_, tuple_, text, literal_column
+
+from app.core.database import engine
+# Every model module, so relationships between them resolve
+from app.models import blob, farmer, inventory, message, task, tombstone, user  # noqa: F401
+from app.models.farmer import Farmer
+from app.models.inventory import Inventory, InventoryCategory, InventoryStatus
+from app.models.task import Task, TaskStatus
+from app.models.message import Message
+from app.models.tombstone import Tombstone
+
+
+def farmers_list(*criteria):
+    # The list endpoints' count/max(updated_at) aggregate reads every matching row
+    return select(func.count(), func.max(Farmer.updated_at)).where(*criteria)
+
+
+def inventory_list(*criteria):
+    return select(func.count(), func.max(Inventory.updated_at)).where(*criteria)
+
+
+SINCE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# (name, statement)
+HOT_QUERIES = [
+    ("farmers by scheme", farmers_list(Farmer.scheme == "MTS")),
+    ("farmers by circle", farmers_list(Farmer.circle_name == "Circle")),
+    ("farmers by circle+taluka", farmers_list(Farmer.circle_name == "Circle", Farmer.taluka_name == "Taluka")),
+    ("farmers by circle+taluka+village", farmers_list(
+        Farmer.circle_name == "Circle", Farmer.taluka_name == "Taluka", Farmer.village_name == "Village"
+    )),
+    ("farmers by dispatch status", farmers_list(Farmer.dispatch_status == "In Transit")),
+    ("farmers by installation status", farmers_list(Farmer.installation_status == "In Progress")),
+    ("farmers by installer", farmers_list(Farmer.installer_user_id == 1)),
+    ("farmers search", farmers_list(or_(
+        Farmer.beneficiary_name.ilike("%ram%"),
+        Farmer.phone_no.ilike("%ram%"),
+        Farmer.beneficiary_id.ilike("%ram%")
+    ))),
+    ("inventory low stock", inventory_list(Inventory.quantity <= Inventory.min_stock_level)),
+    ("inventory by category", inventory_list(Inventory.category == InventoryCategory.MOTOR)),
+    ("inventory by status", inventory_list(Inventory.status == InventoryStatus.ACTIVE)),
+    ("inventory search", inventory_list(or_(
+        Inventory.description.ilike("%pump%"),
+        Inventory.part_number.ilike("%pump%"),
+        Inventory.supplier.ilike("%pump%")
+    ))),
+    ("task queue", select(Task).where(
+        Task.assigned_to_user_id == 1, Task.status == TaskStatus.PENDING
+    ).order_by(Task.due_date.asc().nulls_last(), Task.task_id.asc()).limit(51)),
+    ("task deadline window", select(Task.task_id, Task.due_date).where(
+        Task.due_date >= date(2026, 1, 1), Task.due_date < date(2026, 1, 2)
+    )),
+    ("sync farmers", select(Farmer).where(
+        tuple_(Farmer.updated_at, Farmer.beneficiary_id) > tuple_(SINCE, "")
+    ).order_by(Farmer.updated_at, Farmer.beneficiary_id).limit(501)),
+    ("sync tombstones", select(Tombstone).where(
+        Tombstone.entity_type == "farmer", tuple_(Tombstone.deleted_at, Tombstone.id) > tuple_(SINCE, 0)
+    ).order_by(Tombstone.deleted_at, Tombstone.id).limit(501)),
+    ("chat search", select(Message.message_id).where(
+        # regconfig has no literal renderer, so the config name goes in as SQL
+        Message.search_vector.op("@@")(func.websearch_to_tsquery(literal_column("'simple'"), "pump"))
+    )),
+]
+
+
+PARTIAL_INDEXES = """
+    SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE i.indpred IS NOT NULL
+"""
+
+
+def plan_nodes(plan: dict):
+    """Every node of an EXPLAIN (FORMAT JSON) plan"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def check_query_plans(verbose: bool = False) -> bool:
+    """
+    EXPLAIN each hot query and report the ones that fall back to a sequential scan
+    """
+    ok = True
+    with engine.connect() as conn:
+        partial = set(conn.execute(text(PARTIAL_INDEXES)).scalars())
+        conn.commit()
+        for name, statement in HOT_QUERIES:
+            # Literal values go through the column types (enum members become names)
+            compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+            with conn.begin() as transaction:
+                conn.execute(text("SET LOCAL enable_seqscan = off"))
+                plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()[0]["Plan"]
+                transaction.rollback()
+
+            nodes = list(plan_nodes(plan))
+            # An index scan without an Index Cond reads the whole index (a seq scan in
+            # disguise), unless it is a partial index whose predicate is the filter
+            scanned = sorted({
+                node["Relation Name"] for node in nodes
+                if node["Node Type"] == "Seq Scan"
+                or (
+                    node["Node Type"] in ("Index Scan", "Index Only Scan")
+                    and "Index Cond" not in node
+                    and node["Index Name"] not in partial
+                )
+            })
+            if scanned:
+                print(f"❌ {name}: full scan of {', '.join(scanned)}")
+                ok = False
+            else:
+                indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+                print(f"✅ {name}: {', '.join(indexes)}")
+            if verbose:
+                print(f"   {compiled}")
+
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if a hot query can't use an index")
+    parser.add_argument("--verbose", action="store_true", help="Print each query's SQL")
+    args = parser.parse_args()
+    sys.exit(0 if check_query_plans(args.verbose) else 1)
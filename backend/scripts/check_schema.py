@@ -0,0 +1,72 @@
+"""
+Fail if the live database and the models disagree.
+
+Checks that the database is at the latest migration, that no index is left
+INVALID by an interrupted CONCURRENTLY build, and that autogenerate finds no
+difference between Base.metadata and the live schema. Exits 1 on any problem;
+run it in CI and before deploys.
+
+Usage:
+    python scripts/check_schema.py
+"""
+import sys
+import os
+
+# Add the parent directory to the path so we can import our app
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+
+from app.core.database import engine, Base
+from app.models import blob, farmer, inventory, message, task, tombstone, user  # noqa: F401
+
+INVALID_INDEXES = """
+    SELECT c.relname FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE NOT i.indisvalid AND n.nspname = current_schema()
+"""
+
+
+def check_schema() -> bool:
+    """
+    Compare the live database with the migration head and the models
+    """
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+
+    ok = True
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"compare_type": True})
+
+        current = set(context.get_current_heads())
+        if current != heads:
+            print(f"❌ Database is at {sorted(current) or 'no revision'}, migrations head is {sorted(heads)}")
+            print("   Run: alembic upgrade head")
+            ok = False
+        else:
+            print(f"✅ Database is at migration head {sorted(heads)}")
+
+        invalid = conn.execute(text(INVALID_INDEXES)).scalars().all()
+        for name in invalid:
+            print(f"❌ Index {name} is INVALID (interrupted concurrent build); rerun the migration")
+            ok = False
+
+        differences = compare_metadata(context, Base.metadata)
+        for difference in differences:
+            print(f"❌ Models and database differ: {difference}")
+            ok = False
+        if not differences:
+            print("✅ Models match the database")
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_schema() else 1)
@@ -0,0 +1,616 @@
+"""
+Generate a realistic synthetic dataset for scale testing.
+
+Produces farmers across schemes and a circle > taluka > village hierarchy
+(village sizes are skewed, as in the field), inventory SKUs for every motor
+HP/head, controller, panel and balance-of-system kit in each warehouse, and
+years of activity consistent with each farmer's progress: dispatches with
+their kit items, the stock movements they caused (stock levels are the
+running balance of the transactions), installer tasks and chat messages.
+
+Rows are generated column-wise with numpy and loaded with COPY in a single
+transaction. Secondary indexes of the loaded tables are dropped for the
+load and rebuilt afterwards, which is much faster than maintaining the
+GIN/trigram indexes row by row. The output depends only on --seed and
+--end-date, which defaults to a fixed day so runs are identical (bar the
+bcrypt salts of the login hashes).
+
+The database must be migrated (`alembic upgrade head`) and empty, or pass
+--truncate to wipe the generated tables first. Logins are the seed.py ones
+(admin@jyotielectrotech.com / admin123; installers use installer123).
+
+Usage:
+    python scripts/generate_data.py --farmers 500000 --years 3 --seed 42
+    python scripts/generate_data.py --farmers 20000 --messages 20000 --truncate
+"""
+import sys
+import os
+import argparse
+import importlib
+import io
+import time
+from contextlib import contextmanager
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.core.database import engine, SessionLocal
+from app.core.security import get_password_hash
+from app.services.tasks import rebuild_task_counters
+
+# Every model module, so relationships between them resolve (by name: farmer/inventory are locals below)
+for model_module in ("blob", "farmer", "inventory", "message", "task", "tombstone", "user"):
+    importlib.import_module(f"app.models.{model_module}")
+
+# Tables in load order (parents first)
+TABLES = [
+    "users", "farmers", "inventory", "farmer_dispatches", "farmer_dispatch_items",
+    "inventory_transactions", "tasks", "chat_groups", "chat_group_members", "messages",
+]
+# Integer primary keys given explicit values; their sequences are moved past the max afterwards
+SERIAL_KEYS = {
+    "users": "user_id", "inventory": "id", "farmer_dispatches": "id", "farmer_dispatch_items": "id",
+    "inventory_transactions": "id", "tasks": "task_id", "chat_groups": "group_id",
+    "chat_group_members": "member_id", "messages": "message_id",
+}
+# Last day of history unless --end-date is given; fixed so the same --seed gives the same data
+DEFAULT_END_DATE = "2026-06-30"
+
+CIRCLES = ["Nashik", "Pune", "Aurangabad", "Nagpur", "Amravati", "Kolhapur", "Solapur", "Latur",
+           "Jalgaon", "Ahmednagar", "Satara", "Nanded"]
+WAREHOUSES = ["Nashik Central", "Pune Hub", "Aurangabad Depot", "Nagpur Depot", "Kolhapur Yard"]
+FIRST_NAMES = ["Ramesh", "Suresh", "Ganesh", "Sunita", "Anita", "Vijay", "Sanjay", "Kavita", "Prakash", "Meena",
+               "Dattatray", "Shankar", "Lata", "Mahesh", "Rekha", "Balu", "Nitin", "Savita", "Ashok", "Jyoti",
+               "Rajendra", "Sushila", "Bhausaheb", "Mangal", "Dnyaneshwar", "Sarika", "Tukaram", "Vandana"]
+LAST_NAMES = ["Patil", "Pawar", "Jadhav", "Shinde", "Kale", "More", "Deshmukh", "Gaikwad", "Chavan", "Bhosale",
+              "Kadam", "Salunkhe", "Thorat", "Wagh", "Mane", "Kulkarni", "Sonawane", "Ahire", "Nikam", "Gavali"]
+
+# Weighted choices: (values, probabilities)
+SCHEMES = (["MTS", "SADBHAV", "SAYLIP", "CROMPTON"], [0.45, 0.25, 0.2, 0.1])
+PUMP_HP = (["3", "5", "7.5"], [0.45, 0.4, 0.15])
+PUMP_HEAD = (["30", "50", "70", "100"], [0.3, 0.35, 0.25, 0.1])
+PRIORITIES = (["LOW", "MEDIUM", "HIGH", "URGENT"], [0.2, 0.55, 0.2, 0.05])
+
+# Array size in kW per pump HP, and the panel models in use (newer panels after the switch date)
+ARRAY_KW = {"3": 3.0, "5": 4.8, "7.5": 6.75}
+PANELS = {"445wp": 445, "540wp": 540}
+MOTOR_PRICE = {"3": 18000.0, "5": 25000.0, "7.5": 35000.0}
+KIT_PRICE = {"controller": 8000.0, "bos": 5000.0, "structure": 3000.0, "wire": 500.0, "pipe": 200.0}
+PANEL_PRICE = {"445wp": 10500.0, "540wp": 13000.0}
+
+# Days each pipeline stage takes on average; stage = survey, transit, installation, ICR, done
+STAGE_DAYS = 90
+# Share of SKUs restocked short, so they end at or below min_stock_level
+LOW_STOCK_SHARE = 0.08
+
+MESSAGE_TEMPLATES = [  # (prefix, suffix) around a beneficiary ID; None for messages about no farmer
+    ("Reached site for ", ", starting installation"),
+    ("Material delivered to ", " today"),
+    ("Need two more panels for ", ", structure is short as well"),
+    ("JSR uploaded for ", ""),
+    ("Pump running fine at ", ", handing over to the farmer"),
+    ("Farmer not available at site ", ", will revisit tomorrow"),
+    ("Controller fault reported by ", ", checking the wiring"),
+    ("ICR documents collected for ", ""),
+    ("Borewell depth lower than planned for ", ", please check the pump head"),
+    (None, "Good morning team, please update dispatch status in the app"),
+    (None, "Vehicle leaving the warehouse at 10, load list shared"),
+    (None, "Panels stock is low at the depot, raise a request"),
+]
+
+
+def weighted(rng, choices, size):
+    values, weights = choices
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=weights)]
+
+
+def recent_days(rng, end: np.datetime64, span_days: int, size) -> np.ndarray:
+    """Days before end with linearly rising density, so activity grows toward the present"""
+    days_ago = (span_days * (1 - np.sqrt(rng.random(size)))).astype(np.int64)
+    return end - days_ago.astype("timedelta64[D]")
+
+
+def timestamps(days: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    """ISO UTC timestamps from datetime64[D] days plus seconds into the day"""
+    moments = days.astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+    return np.datetime_as_string(moments, unit="s", timezone="UTC")
+
+
+def work_hours(rng, size) -> np.ndarray:
+    """Seconds into the day, clustered around late morning (IST working hours in UTC)"""
+    return np.clip(rng.normal(6.5 * 3600, 2.5 * 3600, size), 2 * 3600, 14 * 3600).astype(np.int64)
+
+
+def make_users(rng, installers: int, password_hash: str, installer_hash: str) -> pd.DataFrame:
+    office = 5
+    count = 1 + office + installers
+    names = np.asarray(FIRST_NAMES, dtype=object)[rng.integers(len(FIRST_NAMES), size=count)] + " " + \
+        np.asarray(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=count)]
+    names[0] = "Admin User"
+    emails = ["admin@jyotielectrotech.com"] + \
+        [f"office{i}@jyotielectrotech.com" for i in range(1, office + 1)] + \
+        [f"installer{i}@jyotielectrotech.com" for i in range(1, installers + 1)]
+    return pd.DataFrame({
+        "user_id": np.arange(1, count + 1),
+        "role": ["ADMIN"] + ["EMPLOYEE"] * (office + installers),
+        "name": names,
+        "phone": rng.integers(7_000_000_000, 10_000_000_000, size=count).astype(str),
+        "email": emails,
+        "password_hash": [password_hash] * (1 + office) + [installer_hash] * installers,
+        "status": "ACTIVE",
+    })
+
+
+def make_locations(rng):
+    """Village table: circle and taluka of each village and its share of farmers (lognormal sizes)"""
+    rows = []
+    for circle in CIRCLES:
+        for t in range(1, int(rng.integers(6, 13)) + 1):
+            taluka = f"{circle} Taluka {t}"
+            for v in range(1, int(rng.integers(20, 61)) + 1):
+                rows.append((circle, taluka, f"{taluka} Village {v}"))
+    villages = pd.DataFrame(rows, columns=["circle_name", "taluka_name", "village_name"])
+    weights = rng.lognormal(0, 1, len(villages))
+    villages["weight"] = weights / weights.sum()
+    return villages
+
+
+def make_farmers(rng, count: int, villages: pd.DataFrame, installer_ids: np.ndarray, end: np.datetime64, years: int):
+    village = rng.choice(len(villages), size=count, p=villages["weight"].to_numpy())
+    circle_index = pd.Categorical(villages["circle_name"], categories=CIRCLES).codes[village]
+
+    selection = recent_days(rng, end, years * 365, count)
+    age = (end - selection).astype(np.int64)
+
+    # Pipeline stage from age and a per-farmer pace: 0 survey, 1 in transit, 2 installing, 3 ICR, 4 done
+    pace = rng.lognormal(0, 0.4, count)
+    stage = np.clip((age * pace / STAGE_DAYS).astype(np.int64), 0, 4)
+    rejected = rng.random(count) < 0.03
+    stage[rejected] = 0
+    issues = (stage == 2) & (rng.random(count) < 0.1)
+
+    dispatch_offset = np.minimum(age, 20 + rng.exponential(25, count).astype(np.int64))
+    dispatch_date = selection + dispatch_offset.astype("timedelta64[D]")
+
+    # Installers work one circle each; farmers get one once material is on its way (some earlier)
+    per_circle = max(1, len(installer_ids) // len(CIRCLES))
+    installer = installer_ids[(circle_index * per_circle + rng.integers(per_circle, size=count)) % len(installer_ids)]
+    has_installer = (stage >= 1) | (rng.random(count) < 0.3)
+
+    ids = pd.Series(np.arange(1, count + 1)).astype(str).str.zfill(7)
+    scheme = weighted(rng, SCHEMES, count)
+    names = np.asarray(FIRST_NAMES, dtype=object)[rng.integers(len(FIRST_NAMES), size=count)] + " " + \
+        np.asarray(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=count)]
+
+    farmers = pd.DataFrame({
+        "beneficiary_id": (pd.Series(scheme).str[:3] + ids).to_numpy(),
+        "beneficiary_name": names,
+        "phone_no": rng.integers(7_000_000_000, 10_000_000_000, size=count).astype(str),
+        "aadhaar_no": rng.integers(100_000_000_000, 1_000_000_000_000, size=count).astype(str),
+        "scheme": scheme,
+        "pumphp": weighted(rng, PUMP_HP, count),
+        "pumphead": weighted(rng, PUMP_HEAD, count),
+        "selection_date": np.datetime_as_string(selection, unit="D"),
+        "circle_name": villages["circle_name"].to_numpy()[village],
+        "taluka_name": villages["taluka_name"].to_numpy()[village],
+        "village_name": villages["village_name"].to_numpy()[village],
+        "installer_user_id": pd.Series(installer, dtype="Int64").where(has_installer),
+        "jsr_status": np.select(
+            [rejected, (stage == 0) & (age < 30)], ["Rejected", "Pending"], "Approved"
+        ).astype(object),
+        "dispatch_status": np.asarray(["Not Dispatched", "In Transit", "Delivered", "Delivered", "Done"], dtype=object)[stage],
+        "dispatch_date": np.where(stage >= 1, np.datetime_as_string(dispatch_date, unit="D"), None),
+        "vehicle_no": np.where(stage >= 1, "MH" + rng.integers(10, 51, count).astype(str).astype(object)
+                               + "AB" + rng.integers(1000, 10000, count).astype(str).astype(object), None),
+        "installation_status": np.where(
+            issues, "Issues",
+            np.asarray(["Not Started", "Not Started", "In Progress", "Completed", "Done"], dtype=object)[stage]
+        ),
+        "icr_status": np.asarray(["Not Started", "Not Started", "Not Started", "In Progress", "Done"], dtype=object)[stage],
+        "created_at": timestamps(selection, work_hours(rng, count)),
+        "updated_at": timestamps(selection + np.minimum(age, stage * STAGE_DAYS).astype("timedelta64[D]"), work_hours(rng, count)),
+    })
+    # Carried alongside (not loaded): what the activity generators need per farmer
+    extra = pd.DataFrame({
+        "stage": stage, "age": age, "circle_index": circle_index,
+        "installer": installer, "has_installer": has_installer,
+        "selection": selection, "dispatch_date": dispatch_date,
+    })
+    return farmers, extra
+
+
+def make_inventory(rng, end: np.datetime64, admin_id: int) -> pd.DataFrame:
+    """One SKU per item kind per warehouse"""
+    kinds = []
+    for hp in PUMP_HP[0]:
+        for head in PUMP_HEAD[0]:
+            kinds.append(("MOTOR", f"{hp}hp", head, MOTOR_PRICE[hp] + 1000 * PUMP_HEAD[0].index(head), "Motor Tech Ltd"))
+        for category, price in KIT_PRICE.items():
+            kinds.append((category.upper(), f"{hp}hp", None, price * float(hp) / 3, f"{category.title()} Supplies"))
+    for panel, price in PANEL_PRICE.items():
+        kinds.append(("SOLAR_PANEL", panel, None, price, "Solar Tech Ltd"))
+
+    rows = []
+    for warehouse_index, warehouse in enumerate(WAREHOUSES):
+        for category, kind_type, specification, price, supplier in kinds:
+            part = f"{category[:3]}-{kind_type.upper()}{'-' + specification if specification else ''}-W{warehouse_index + 1}"
+            rows.append((category, kind_type, specification, round(price, 2), supplier, part, warehouse))
+    inventory = pd.DataFrame(rows, columns=["category", "type", "specification", "unit_price", "supplier", "part_number", "location"])
+    count = len(inventory)
+    inventory.insert(0, "id", np.arange(1, count + 1))
+    inventory["description"] = inventory["category"].str.replace("_", " ").str.lower() + " " + inventory["type"]
+    inventory["status"] = "ACTIVE"
+    inventory["created_at"] = timestamps(np.full(count, end - np.timedelta64(3650, "D")), np.zeros(count, dtype=np.int64))
+    inventory["created_by_user_id"] = admin_id
+    return inventory
+
+
+def make_dispatches(rng, farmers: pd.DataFrame, extra: pd.DataFrame, inventory: pd.DataFrame,
+                    end: np.datetime64, office_ids: np.ndarray):
+    """A dispatch with a full kit for every farmer whose material has left the warehouse"""
+    shipped = np.flatnonzero(extra["stage"].to_numpy() >= 1)
+    count = len(shipped)
+    dispatch_ids = np.arange(1, count + 1)
+    dispatch_day = extra["dispatch_date"].to_numpy()[shipped]
+    hp = farmers["pumphp"].to_numpy()[shipped]
+    warehouse = np.asarray(WAREHOUSES, dtype=object)[extra["circle_index"].to_numpy()[shipped] % len(WAREHOUSES)]
+    panel = np.where(dispatch_day < end - np.timedelta64(730, "D"), "445wp", "540wp")
+    panel_count = np.ceil(
+        pd.Series(hp).map(ARRAY_KW).to_numpy() * 1000 / pd.Series(panel).map(PANELS).to_numpy()
+    ).astype(np.int64)
+
+    hp_type = hp.astype(object) + "hp"
+    head = farmers["pumphead"].to_numpy()[shipped]
+    lines = [("MOTOR", hp_type, head, np.ones(count, dtype=np.int64)),
+             ("SOLAR_PANEL", panel.astype(object), None, panel_count)]
+    lines += [(category.upper(), hp_type, None, np.ones(count, dtype=np.int64)) for category in KIT_PRICE]
+    items = pd.concat([
+        pd.DataFrame({
+            "dispatch_id": dispatch_ids, "category": category, "type": kind_type,
+            "specification": specification, "location": warehouse, "quantity": quantity,
+            "day": dispatch_day, "reference_id": farmers["beneficiary_id"].to_numpy()[shipped],
+        })
+        for category, kind_type, specification, quantity in lines
+    ], ignore_index=True)
+    keys = ["category", "type", "specification", "location"]
+    skus = inventory[["id", "unit_price", *keys]].rename(columns={"id": "inventory_id"})
+    items = items.merge(skus, on=keys, how="left", validate="many_to_one")
+    items = items.sort_values(["dispatch_id", "inventory_id"], kind="stable", ignore_index=True)
+    items.insert(0, "id", np.arange(1, len(items) + 1))
+    items["unit_cost"] = items["unit_price"]
+    items["total_cost"] = items["quantity"] * items["unit_cost"]
+
+    stage = extra["stage"].to_numpy()[shipped]
+    dispatches = pd.DataFrame({
+        "id": dispatch_ids,
+        "farmer_beneficiary_id": farmers["beneficiary_id"].to_numpy()[shipped],
+        "dispatch_date": timestamps(dispatch_day, work_hours(rng, count)),
+        "status": np.asarray(["pending", "dispatched", "delivered", "installed", "installed"], dtype=object)[stage],
+        "total_value": items.groupby("dispatch_id")["total_cost"].sum().to_numpy(),
+        "notes": None,
+        "created_by_user_id": office_ids[rng.integers(len(office_ids), size=count)],
+    })
+    return dispatches, items
+
+
+def make_transactions(rng, items: pd.DataFrame, inventory: pd.DataFrame, office_ids: np.ndarray):
+    """
+    Stock movements: an 'out' per dispatched item, and a purchase at the start
+    of each month covering that month's dispatches plus a buffer (opening stock
+    for SKUs never dispatched). Quantities are running balances, and the final
+    balance is the SKU's stock level. Returns the transactions, stock levels
+    and min_stock_level per SKU (both indexed by inventory id).
+    """
+    out = pd.DataFrame({
+        "inventory_id": items["inventory_id"].to_numpy(),
+        "transaction_type": "out",
+        "quantity": items["quantity"].to_numpy(),
+        "signed": -items["quantity"].to_numpy(),
+        "reference_type": "farmer_dispatch",
+        "reference_id": items["reference_id"].to_numpy(),
+        "unit_cost": items["unit_cost"].to_numpy(),
+        "day": items["day"].to_numpy(),
+        "seconds": work_hours(rng, len(items)),
+    })
+    out["notes"] = "Dispatched to farmer " + out["reference_id"]
+
+    month = out["day"].to_numpy().astype("datetime64[M]")
+    monthly = out.assign(month=month).groupby(["inventory_id", "month"], as_index=False)["quantity"].sum()
+    # Alert at about a week of typical use (20 a month for SKUs never dispatched)
+    sku_ids = inventory["id"].to_numpy()
+    monthly_use = monthly.groupby("inventory_id")["quantity"].mean().reindex(sku_ids).fillna(20)
+    min_stock_level = np.maximum(5, np.ceil(monthly_use / 4)).astype(np.int64)
+
+    # Buy what the month needs plus 2-4 alert levels, net of stock on hand, so stock stays
+    # above the alert level. LOW_STOCK_SHARE of SKUs are kept short (at most one alert level
+    # left after each purchase), so they end low. Sequential per SKU, but one step per SKU-month.
+    low = pd.Series(rng.random(len(sku_ids)) < LOW_STOCK_SHARE, index=sku_ids)
+    used = monthly["quantity"].to_numpy()
+    level = monthly["inventory_id"].map(min_stock_level).to_numpy()
+    buffer = np.ceil(level * rng.uniform(2, 4, len(monthly))).astype(np.int64)
+    short = monthly["inventory_id"].map(low).to_numpy()
+    buffer[short] = rng.integers(0, level[short] + 1)
+    purchased = np.zeros(len(monthly), dtype=np.int64)
+    balance, previous_sku = 0, None
+    for i, sku in enumerate(monthly["inventory_id"].to_numpy()):
+        if sku != previous_sku:
+            balance, previous_sku = 0, sku
+        purchased[i] = max(0, used[i] + buffer[i] - balance)
+        balance += purchased[i] - used[i]
+
+    # SKUs never dispatched hold their opening stock, bought when the SKU was created
+    idle = np.setdiff1d(sku_ids, monthly["inventory_id"].to_numpy())
+    idle_level = min_stock_level.loc[idle].to_numpy()
+    opening = np.where(
+        low.loc[idle].to_numpy(),
+        rng.integers(0, idle_level + 1),
+        np.ceil(idle_level * rng.uniform(2, 4, len(idle)))
+    ).astype(np.int64)
+    created = inventory.set_index("id")["created_at"].loc[idle].to_numpy().astype("datetime64[D]")
+
+    purchase_skus = np.concatenate([monthly["inventory_id"].to_numpy(), idle])
+    purchased = np.concatenate([purchased, opening])
+    purchases = pd.DataFrame({
+        "inventory_id": purchase_skus,
+        "transaction_type": "in",
+        "quantity": purchased,
+        "signed": purchased,
+        "reference_type": "purchase",
+        "reference_id": "PO-" + pd.Series(np.arange(1, len(purchase_skus) + 1)).astype(str).str.zfill(6).to_numpy(),
+        "unit_cost": pd.Series(purchase_skus).map(inventory.set_index("id")["unit_price"]).to_numpy(),
+        "day": np.concatenate([monthly["month"].to_numpy().astype("datetime64[D]"), created]),
+        "seconds": np.zeros(len(purchase_skus), dtype=np.int64),  # Before the day's dispatches
+        "notes": np.concatenate([np.full(len(monthly), "Monthly purchase", dtype=object),
+                                 np.full(len(idle), "Opening stock", dtype=object)]),
+    })
+    purchases = purchases[purchases["quantity"] > 0]
+
+    transactions = pd.concat([purchases, out], ignore_index=True)
+    transactions = transactions.sort_values(["inventory_id", "day", "seconds"], kind="stable", ignore_index=True)
+    transactions["new_quantity"] = transactions.groupby("inventory_id")["signed"].cumsum()
+    transactions["previous_quantity"] = transactions["new_quantity"] - transactions["signed"]
+    transactions["created_at"] = timestamps(transactions["day"].to_numpy(), transactions["seconds"].to_numpy())
+    transactions.insert(0, "id", np.arange(1, len(transactions) + 1))
+    transactions["created_by_user_id"] = office_ids[rng.integers(len(office_ids), size=len(transactions))]
+
+    stock = transactions.groupby("inventory_id")["new_quantity"].last()
+    return transactions.drop(columns=["signed", "day", "seconds"]), stock, min_stock_level
+
+
+def make_tasks(rng, farmers: pd.DataFrame, extra: pd.DataFrame, end: np.datetime64, office_ids: np.ndarray):
+    """Survey for every farmer, installation once dispatched, ICR paperwork once installed"""
+    stage = extra["stage"].to_numpy()
+    selection = extra["selection"].to_numpy()
+    dispatched = extra["dispatch_date"].to_numpy()
+    # Farmers without an installer yet keep their tasks with the office user who assigned them
+    installer = np.where(extra["has_installer"].to_numpy(), extra["installer"].to_numpy(), 0)
+    frames = []
+    for title, tag, eligible, start, due_after, done_at_stage in (
+        ("Site survey", "survey", stage >= 0, selection, 14, 1),
+        ("Pump installation", "installation", stage >= 1, dispatched, 21, 3),
+        ("ICR documentation", "icr", stage >= 3, dispatched, 60, 4),
+    ):
+        index = np.flatnonzero(eligible)
+        count = len(index)
+        done = stage[index] >= done_at_stage
+        started = rng.random(count) < 0.5
+        due = start[index] + np.timedelta64(due_after, "D")
+        completed = np.minimum(due - rng.integers(-10, 10, count).astype("timedelta64[D]"), end)
+        created = start[index]
+        assigned_by = office_ids[rng.integers(len(office_ids), size=count)]
+        frames.append(pd.DataFrame({
+            "title": title + " - " + farmers["beneficiary_name"].to_numpy()[index],
+            "description": title + " for " + farmers["beneficiary_id"].to_numpy()[index] + ", "
+                           + farmers["village_name"].to_numpy()[index],
+            "assigned_to_user_id": np.where(installer[index] > 0, installer[index], assigned_by),
+            "assigned_by_user_id": assigned_by,
+            "farmer_beneficiary_id": farmers["beneficiary_id"].to_numpy()[index],
+            "status": np.where(done, "COMPLETED", np.where(started, "IN_PROGRESS", "PENDING")),
+            "priority": weighted(rng, PRIORITIES, count),
+            "due_date": np.datetime_as_string(due, unit="D"),
+            "tags": "{" + tag + "," + farmers["scheme"].str.lower().to_numpy()[index] + "}",
+            "completed_at": np.where(done, timestamps(completed, work_hours(rng, count)), None),
+            "created_at": timestamps(created, work_hours(rng, count)),
+            "updated_at": timestamps(np.where(done, completed, created), work_hours(rng, count)),
+            "sort_day": created,
+        }))
+    tasks = pd.concat(frames, ignore_index=True).sort_values("sort_day", kind="stable", ignore_index=True)
+    tasks.insert(0, "task_id", np.arange(1, len(tasks) + 1))
+    return tasks.drop(columns=["sort_day"])
+
+
+def make_chat(rng, count: int, farmers: pd.DataFrame, extra: pd.DataFrame, users: pd.DataFrame,
+              installer_ids: np.ndarray, end: np.datetime64, years: int):
+    """A group per circle (its installers plus the office) and messages weighted toward recent days"""
+    admin_id = int(users["user_id"].iloc[0])
+    office_ids = users["user_id"].to_numpy()[1:6]
+    groups = pd.DataFrame({
+        "group_id": np.arange(1, len(CIRCLES) + 2),
+        "group_name": ["General"] + [f"{circle} Installers" for circle in CIRCLES],
+        "description": ["Company-wide announcements"] + [f"Field team for {circle} circle" for circle in CIRCLES],
+        "created_by_user_id": admin_id,
+        "is_active": True,
+        "created_at": timestamps(np.full(len(CIRCLES) + 1, end - np.timedelta64(years * 365, "D")),
+                                 np.zeros(len(CIRCLES) + 1, dtype=np.int64)),
+    })
+
+    per_circle = max(1, len(installer_ids) // len(CIRCLES))
+    installer_circle = (np.arange(len(installer_ids)) // per_circle) % len(CIRCLES)
+    staff = np.concatenate([[admin_id], office_ids])
+    members = pd.concat([
+        pd.DataFrame({"group_id": 1, "user_id": users["user_id"].to_numpy(), "is_admin": users["user_id"].to_numpy() == admin_id}),
+        pd.DataFrame({"group_id": np.repeat(np.arange(2, len(CIRCLES) + 2), len(staff)),
+                      "user_id": np.tile(staff, len(CIRCLES)), "is_admin": np.tile(staff == admin_id, len(CIRCLES))}),
+        pd.DataFrame({"group_id": installer_circle + 2, "user_id": installer_ids, "is_admin": False}),
+    ], ignore_index=True)
+    members.insert(0, "member_id", np.arange(1, len(members) + 1))
+
+    # Circle groups carry most traffic, in proportion to their farmers
+    circle_sizes = np.bincount(extra["circle_index"].to_numpy(), minlength=len(CIRCLES))
+    circle = rng.choice(len(CIRCLES), size=count, p=circle_sizes / circle_sizes.sum())
+    general = rng.random(count) < 0.1
+    group = np.where(general, 1, circle + 2)
+
+    # Mostly the circle's installers talking, the rest from the office
+    sender = staff[rng.integers(len(staff), size=count)]
+    from_field = rng.random(count) < 0.8
+    for c in range(len(CIRCLES)):
+        team = installer_ids[installer_circle == c]
+        mask = from_field & (circle == c)
+        if len(team):
+            sender[mask] = team[rng.integers(len(team), size=mask.sum())]
+
+    # A farmer from the message's circle: farmers sorted by circle, then an offset into the circle's block
+    by_circle = np.argsort(extra["circle_index"].to_numpy(), kind="stable")
+    starts = np.concatenate([[0], np.cumsum(circle_sizes)[:-1]])
+    farmer = by_circle[starts[circle] + (rng.random(count) * circle_sizes[circle]).astype(np.int64)]
+    beneficiary = farmers["beneficiary_id"].to_numpy()[farmer]
+
+    template = rng.integers(len(MESSAGE_TEMPLATES), size=count)
+    prefixes = np.asarray([prefix or "" for prefix, _ in MESSAGE_TEMPLATES], dtype=object)[template]
+    suffixes = np.asarray([suffix for _, suffix in MESSAGE_TEMPLATES], dtype=object)[template]
+    about_farmer = np.asarray([prefix is not None for prefix, _ in MESSAGE_TEMPLATES])[template]
+    content = np.where(about_farmer, prefixes + beneficiary + suffixes, suffixes)
+
+    day = recent_days(rng, end, years * 365, count)
+    seconds = work_hours(rng, count)
+    order = np.lexsort((seconds, day))
+    created = timestamps(day[order], seconds[order])
+    messages = pd.DataFrame({
+        "message_id": np.arange(1, count + 1),
+        "group_id": group[order],
+        "sender_user_id": sender[order],
+        "content": content[order],
+        "message_type": "text",
+        "farmer_beneficiary_id": np.where(about_farmer, beneficiary, None)[order],
+        "is_edited": rng.random(count) < 0.02,
+        "is_deleted": False,
+        "created_at": created,
+        "updated_at": created,
+    })
+    return groups, members, messages
+
+
+@contextmanager
+def without_indexes(cursor, tables):
+    """Drop the tables' secondary indexes (not primary keys or unique constraints) and rebuild them on exit"""
+    cursor.execute("""
+        SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid)
+        FROM pg_index
+        WHERE indrelid = ANY(%s::regclass[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = pg_index.indexrelid)
+    """, (list(tables),))
+    definitions = cursor.fetchall()
+    for name, _ in definitions:
+        cursor.execute(f"DROP INDEX {name}")
+    yield
+    started = time.perf_counter()
+    for _, definition in definitions:
+        cursor.execute(definition)
+    print(f"   rebuilt {len(definitions)} indexes in {time.perf_counter() - started:.1f}s")
+
+
+def copy_frame(cursor, table: str, frame: pd.DataFrame, chunk_rows: int = 250_000) -> None:
+    """COPY a DataFrame into a table; None/NA become NULL"""
+    columns = ", ".join(frame.columns)
+    for start in range(0, len(frame), chunk_rows):
+        buffer = io.StringIO()
+        frame.iloc[start:start + chunk_rows].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def generate(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    end = np.datetime64(args.end_date, "D")
+    started = time.perf_counter()
+
+    print("🧮 Generating rows...")
+    users = make_users(rng, args.installers, get_password_hash("admin123"), get_password_hash("installer123"))
+    admin_id = int(users["user_id"].iloc[0])
+    office_ids = users["user_id"].to_numpy()[1:6]
+    installer_ids = users["user_id"].to_numpy()[6:]
+    villages = make_locations(rng)
+    farmers, extra = make_farmers(rng, args.farmers, villages, installer_ids, end, args.years)
+    inventory = make_inventory(rng, end, admin_id)
+    dispatches, items = make_dispatches(rng, farmers, extra, inventory, end, office_ids)
+    transactions, stock, min_stock_level = make_transactions(rng, items, inventory, office_ids)
+    inventory["quantity"] = inventory["id"].map(stock).fillna(0).astype(np.int64)
+    inventory["min_stock_level"] = inventory["id"].map(min_stock_level).astype(np.int64)
+    tasks = make_tasks(rng, farmers, extra, end, office_ids)
+    groups, members, messages = make_chat(rng, args.messages, farmers, extra, users, installer_ids, end, args.years)
+    item_columns = ["id", "dispatch_id", "inventory_id", "quantity", "unit_cost", "total_cost"]
+    frames = {
+        "users": users,
+        "farmers": farmers,
+        "inventory": inventory,
+        "farmer_dispatches": dispatches,
+        "farmer_dispatch_items": items[item_columns],
+        "inventory_transactions": transactions,
+        "tasks": tasks,
+        "chat_groups": groups,
+        "chat_group_members": members,
+        "messages": messages,
+    }
+    total = sum(len(frame) for frame in frames.values())
+    print(f"   {total:,} rows in {time.perf_counter() - started:.1f}s")
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        # Bulk load: no statement timeout, and don't wait on WAL flushes
+        cursor.execute("SET LOCAL statement_timeout = 0")
+        cursor.execute("SET LOCAL synchronous_commit = off")
+        cursor.execute("SET LOCAL maintenance_work_mem = '512MB'")
+
+        if args.truncate:
+            cursor.execute(f"TRUNCATE {', '.join(TABLES)}, task_counters, tombstones RESTART IDENTITY CASCADE")
+        else:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM users) OR EXISTS (SELECT 1 FROM farmers)")
+            if cursor.fetchone()[0]:
+                print("❌ The database already has users or farmers; pass --truncate to replace them")
+                sys.exit(1)
+
+        print("📥 Loading with COPY...")
+        load_started = time.perf_counter()
+        with without_indexes(cursor, [table for table in TABLES if not args.keep_indexes]):
+            for table, frame in frames.items():
+                table_started = time.perf_counter()
+                copy_frame(cursor, table, frame)
+                print(f"   {table:<24} {len(frame):>10,} rows  {time.perf_counter() - table_started:6.1f}s")
+        for table, key in SERIAL_KEYS.items():
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', '{key}'), (SELECT max({key}) FROM {table}))")
+        connection.commit()
+        print(f"   loaded in {time.perf_counter() - load_started:.1f}s")
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    db = SessionLocal()
+    try:
+        rebuild_task_counters(db)
+    finally:
+        db.close()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--farmers", type=int, default=200_000)
+    parser.add_argument("--installers", type=int, default=120)
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--years", type=int, default=3, help="History length ending at --end-date")
+    parser.add_argument("--end-date", default=DEFAULT_END_DATE, help="Last day of history")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="Empty the generated tables first")
+    parser.add_argument("--keep-indexes", action="store_true", help="Maintain indexes during the load instead of rebuilding")
+    generate(parser.parse_args())
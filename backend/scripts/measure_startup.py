@@ -0,0 +1,130 @@
+"""
+Measure application cold start against a budget.
+
+Each run starts a fresh interpreter (like a new worker), imports main, and
+optionally runs the lifespan startup and shutdown. It reports the median and
+worst times and the slowest imports from -X importtime. The exit status is 1
+when the median exceeds the budget, so the script can gate CI or a deploy.
+
+The framework floor (a bare import of fastapi, socketio, sqlalchemy and jose)
+is measured too, so the app's own share is visible. On a 1-vCPU host with
+FastAPI 0.104 / Pydantic 2.5 the import median is 1.8-2.0s and the floor 0.9-1.0s.
+fastapi.openapi.models alone builds its Pydantic models for ~0.5s at
+import. The rest is the app's models, schemas and routers, each about 0.2-0.3s.
+A sub-second cold start is not reachable on that host. The default budget
+leaves room over what the tree measures there.
+
+Usage:
+    python scripts/measure_startup.py --runs 5 --budget 2.5
+    python scripts/measure_startup.py --lifespan    # needs the database
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter() - started
+print(json.dumps({"import": imported}))
+"""
+
+FLOOR_PROBE = """
+import json, time
+started = time.perf_counter()
+import fastapi, socketio, sqlalchemy, jose
+print(json.dumps({"import": time.perf_counter() - started}))
+"""
+
+LIFESPAN_PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter() - started
+
+async def boot():
+    started = time.perf_counter()
+    async with main.app.router.lifespan_context(main.app):
+        ready = time.perf_counter() - started
+    return ready
+
+ready = asyncio.run(boot())
+print(json.dumps({"import": imported, "lifespan": ready}))
+"""
+
+# Modules that must not load at import time (they belong on upload/export paths)
+LAZY_MODULES = ("pandas", "openpyxl", "PIL")
+
+
+def run_probe(code: str, env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict, top: int):
+    """Cumulative import times (microseconds) of the heaviest top-level packages"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stderr
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit() and not name.startswith(" "):
+            package = name.split(".")[0]
+            totals[package] = max(totals.get(package, 0), int(cumulative))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top], totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.5, help="Seconds allowed for the median cold start")
+    parser.add_argument("--lifespan", action="store_true", help="Also run startup/shutdown (needs the database)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if not args.lifespan:
+        env.setdefault("AUTO_CREATE_SCHEMA", "false")
+
+    probe = LIFESPAN_PROBE if args.lifespan else IMPORT_PROBE
+    samples = [run_probe(probe, env) for _ in range(args.runs)]
+    totals = [sum(sample.values()) for sample in samples]
+
+    print(f"import    median={statistics.median(s['import'] for s in samples) * 1000:8.1f}ms")
+    if args.lifespan:
+        print(f"lifespan  median={statistics.median(s['lifespan'] for s in samples) * 1000:8.1f}ms")
+    floor = statistics.median(run_probe(FLOOR_PROBE, env)["import"] for _ in range(args.runs))
+    print(f"framework median={floor * 1000:8.1f}ms  (fastapi, socketio, sqlalchemy, jose alone)")
+    median = statistics.median(totals)
+    print(f"total     median={median * 1000:8.1f}ms  max={max(totals) * 1000:8.1f}ms  budget={args.budget * 1000:.0f}ms")
+
+    top, imported = slowest_imports(env, args.top)
+    print("\nSlowest imports (cumulative):")
+    for package, micros in top:
+        print(f"  {package:<24} {micros / 1000:8.1f}ms")
+
+    eager = [module for module in LAZY_MODULES if module in imported]
+    if eager:
+        print(f"\n❌ Imported eagerly, should be lazy: {', '.join(eager)}")
+    if median > args.budget:
+        print(f"\n❌ Cold start {median:.3f}s exceeds the {args.budget:.3f}s budget")
+    if eager or median > args.budget:
+        sys.exit(1)
+    print("\n✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import sys
+import os
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+# Parses the legacy JSON-in-Text values; rows that are not valid JSON are
+# treated as comma-separated lists so no data is dropped.
+PARSE_FUNCTION = """
+CREATE OR REPLACE FUNCTION pg_temp.json_text_to_array(value text) RETURNS text[] AS $$
+BEGIN
+    IF value IS NULL OR btrim(value) = '' THEN
+        RETURN NULL;
+    END IF;
+    RETURN ARRAY(SELECT jsonb_array_elements_text(value::jsonb));
+EXCEPTION WHEN others THEN
+    RETURN ARRAY(
+        SELECT btrim(item, ' "[]') FROM unnest(string_to_array(value, ',')) AS item
+        WHERE btrim(item, ' "[]') <> ''
+    );
+END;
+$$ LANGUAGE plpgsql IMMUTABLE
+"""
+
+# (table, column, element type, conversion expression over the legacy column)
+MIGRATIONS = [
+    (
+        "messages", "mentions", "integer[]",
+        "ARRAY(SELECT item::integer FROM unnest(pg_temp.json_text_to_array(mentions)) AS item WHERE item ~ '^[0-9]+$')"
+    ),
+    ("messages", "tags", "varchar(50)[]", "pg_temp.json_text_to_array(tags)::varchar(50)[]"),
+    ("tasks", "tags", "varchar(50)[]", "pg_temp.json_text_to_array(tags)::varchar(50)[]"),
+]
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_messages_mentions ON messages USING GIN (mentions)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_tags ON messages USING GIN (tags)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_tags ON tasks USING GIN (tags)",
+]
+
+
+def column_type(conn, table, column):
+    return conn.execute(
+        text("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = :table AND column_name = :column
+        """),
+        {"table": table, "column": column}
+    ).scalar()
+
+
+def migrate():
+    """
+    Convert JSON-in-Text tags/mentions columns to indexed PostgreSQL arrays
+    """
+    print("🔧 Migrating tags and mentions to array columns...")
+
+    with engine.begin() as conn:
+        conn.execute(text(PARSE_FUNCTION))
+
+        for table, column, array_type, conversion in MIGRATIONS:
+            current_type = column_type(conn, table, column)
+            if current_type is None:
+                print(f"⚠️  {table}.{column} does not exist, skipping")
+                continue
+            if current_type == "ARRAY":
+                print(f"✅ {table}.{column} is already an array")
+                continue
+
+            # Add, backfill, then swap so the conversion can use a subquery
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column}_migrated {array_type}"))
+            converted = conn.execute(text(
+                f"UPDATE {table} SET {column}_migrated = {conversion} WHERE {column} IS NOT NULL"
+            )).rowcount
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+            conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN {column}_migrated TO {column}"))
+            print(f"✅ Converted {converted} rows in {table}.{column}")
+
+        for statement in INDEXES:
+            conn.execute(text(statement))
+
+    print("🎉 Migration completed!")
+
+
+if __name__ == "__main__":
+    migrate()
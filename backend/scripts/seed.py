@@ -7,21 +7,59 @@ from pathlib import Path
 # Add the parent directory to the path so we can import our app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.core.database import SessionLocal, engine
+from app.core.database import SessionLocal
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.models.farmer import Farmer
-from app.core.database import Base
+from app.models.inventory import Inventory, InventoryCategory
+from app.models.message import ChatGroup, ChatGroupMember
+
+# (category, type, specification, quantity, min_stock_level, unit_price, supplier, part_number, description, location)
+SAMPLE_INVENTORY = [
+    # Motors
+    ("motor", "3hp", "30", 15, 5, 18000.00, "Motor Tech Ltd", "MOT-3HP-30", "3HP motor with 30m pump head", "Warehouse A"),
+    ("motor", "3hp", "50", 12, 5, 19000.00, "Motor Tech Ltd", "MOT-3HP-50", "3HP motor with 50m pump head", "Warehouse A"),
+    ("motor", "3hp", "70", 10, 3, 20000.00, "Motor Tech Ltd", "MOT-3HP-70", "3HP motor with 70m pump head", "Warehouse A"),
+    ("motor", "5hp", "30", 20, 5, 25000.00, "Motor Tech Ltd", "MOT-5HP-30", "5HP motor with 30m pump head", "Warehouse A"),
+    ("motor", "5hp", "50", 18, 5, 26000.00, "Motor Tech Ltd", "MOT-5HP-50", "5HP motor with 50m pump head", "Warehouse A"),
+    ("motor", "5hp", "70", 15, 3, 27000.00, "Motor Tech Ltd", "MOT-5HP-70", "5HP motor with 70m pump head", "Warehouse A"),
+    ("motor", "5hp", "100", 8, 3, 28000.00, "Motor Tech Ltd", "MOT-5HP-100", "5HP motor with 100m pump head", "Warehouse A"),
+    ("motor", "7.5hp", "30", 10, 3, 35000.00, "Motor Tech Ltd", "MOT-7.5HP-30", "7.5HP motor with 30m pump head", "Warehouse A"),
+    ("motor", "7.5hp", "50", 8, 3, 36000.00, "Motor Tech Ltd", "MOT-7.5HP-50", "7.5HP motor with 50m pump head", "Warehouse A"),
+    ("motor", "7.5hp", "70", 6, 2, 37000.00, "Motor Tech Ltd", "MOT-7.5HP-70", "7.5HP motor with 70m pump head", "Warehouse A"),
+    ("motor", "7.5hp", "100", 4, 2, 38000.00, "Motor Tech Ltd", "MOT-7.5HP-100", "7.5HP motor with 100m pump head", "Warehouse A"),
+    # Controllers
+    ("controller", "3hp", "", 25, 8, 8000.00, "Control Systems Inc", "CTRL-3HP", "3HP pump controller", "Warehouse B"),
+    ("controller", "5hp", "", 20, 6, 12000.00, "Control Systems Inc", "CTRL-5HP", "5HP pump controller", "Warehouse B"),
+    ("controller", "7.5hp", "", 15, 5, 15000.00, "Control Systems Inc", "CTRL-7.5HP", "7.5HP pump controller", "Warehouse B"),
+    # Solar Panels
+    ("solar_panel", "520wp", "", 100, 30, 12000.00, "Solar Tech Ltd", "SOLAR-520", "520W solar panel", "Warehouse C"),
+    ("solar_panel", "540wp", "", 80, 25, 13000.00, "Solar Tech Ltd", "SOLAR-540", "540W solar panel", "Warehouse C"),
+    # BOS (Balance of System)
+    ("bos", "3hp", "", 30, 10, 5000.00, "BOS Systems Ltd", "BOS-3HP", "3HP Balance of System components", "Warehouse D"),
+    ("bos", "5hp", "", 25, 8, 7000.00, "BOS Systems Ltd", "BOS-5HP", "5HP Balance of System components", "Warehouse D"),
+    ("bos", "7.5hp", "", 20, 6, 9000.00, "BOS Systems Ltd", "BOS-7.5HP", "7.5HP Balance of System components", "Warehouse D"),
+    # Structure
+    ("structure", "3hp", "", 40, 12, 3000.00, "Structure Co", "STRUCT-3HP", "3HP system mounting structure", "Warehouse E"),
+    ("structure", "5hp", "", 35, 10, 4000.00, "Structure Co", "STRUCT-5HP", "5HP system mounting structure", "Warehouse E"),
+    ("structure", "7.5hp", "", 25, 8, 5000.00, "Structure Co", "STRUCT-7.5HP", "7.5HP system mounting structure", "Warehouse E"),
+    # Wire
+    ("wire", "3hp", "", 150, 30, 500.00, "Cable Works", "WIRE-3HP", "3HP system wiring kit", "Warehouse F"),
+    ("wire", "5hp", "", 120, 25, 700.00, "Cable Works", "WIRE-5HP", "5HP system wiring kit", "Warehouse F"),
+    ("wire", "7.5hp", "", 100, 20, 900.00, "Cable Works", "WIRE-7.5HP", "7.5HP system wiring kit", "Warehouse F"),
+    # Pipe
+    ("pipe", "3hp", "", 200, 40, 200.00, "Pipe Industries", "PIPE-3HP", "3HP system piping kit", "Warehouse G"),
+    ("pipe", "5hp", "", 180, 35, 250.00, "Pipe Industries", "PIPE-5HP", "5HP system piping kit", "Warehouse G"),
+    ("pipe", "7.5hp", "", 150, 30, 300.00, "Pipe Industries", "PIPE-7.5HP", "7.5HP system piping kit", "Warehouse G"),
+]
 
 def seed_database():
     """
-    Seed the database with initial data from Excel file
+    Seed the database with initial data from Excel file.
+    Tables must already exist: run `alembic upgrade head` first.
     """
     print("🌱 Starting database seeding...")
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    
     # Create database session
     db = SessionLocal()
     
@@ -170,6 +208,44 @@ def seed_database():
                 
         else:
             print("🚜 Farmers already exist, skipping farmer creation")
+        
+        # Check if inventory already exists
+        admin = db.query(User).filter(User.email == "admin@jyotielectrotech.com").first()
+        if db.query(Inventory).count() == 0:
+            print("📦 Creating sample inventory...")
+            for category, type_, specification, quantity, min_stock, price, supplier, part_number, description, location in SAMPLE_INVENTORY:
+                db.add(Inventory(
+                    category=InventoryCategory(category),
+                    type=type_,
+                    specification=specification,
+                    quantity=quantity,
+                    min_stock_level=min_stock,
+                    unit_price=price,
+                    supplier=supplier,
+                    part_number=part_number,
+                    description=description,
+                    location=location,
+                    created_by_user_id=admin.user_id if admin else None
+                ))
+            db.commit()
+            print(f"✅ Created {len(SAMPLE_INVENTORY)} inventory items")
+        else:
+            print("📦 Inventory already exists, skipping inventory creation")
+        
+        # Create a default chat group with every user in it
+        if admin and db.query(ChatGroup).count() == 0:
+            print("💬 Creating default chat group...")
+            group = ChatGroup(
+                group_name="General Discussion",
+                description="Main discussion group for all team members",
+                created_by_user_id=admin.user_id
+            )
+            db.add(group)
+            db.flush()
+            for member in db.query(User).all():
+                db.add(ChatGroupMember(group_id=group.group_id, user_id=member.user_id, is_admin=member.user_id == admin.user_id))
+            db.commit()
+            print("✅ Chat group created successfully")
     
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
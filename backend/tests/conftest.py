@@ -0,0 +1,68 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+# Database tests run against TEST_DATABASE_URL (it is migrated to head and each
+# test rolls back); without it they are skipped. Set before the app is imported
+# so app.core.database binds its engine to the test database.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.models import blob, farmer, inventory, message, task, tombstone, user  # noqa: F401
+from app.models.user import User, UserRole
+
+
+@pytest.fixture(scope="session")
+def migrated_db():
+    """The test database, upgraded to the latest migration"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    command.upgrade(config, "head")
+    return engine
+
+
+@pytest.fixture
+def db(migrated_db):
+    """A session whose changes (commits included) are rolled back after the test"""
+    connection = migrated_db.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Insert a user; keyword arguments override the defaults"""
+    def make(**fields):
+        count = db.query(User).count()
+        values = {
+            "role": UserRole.EMPLOYEE,
+            "name": f"User {count + 1}",
+            "phone": "9000000000",
+            "email": f"user{count + 1}@example.com",
+            "password_hash": "x",
+        }
+        values.update(fields)
+        new_user = User(**values)
+        db.add(new_user)
+        db.flush()
+        return new_user
+
+    return make
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.models.blob import Blob
+from app.services import blob_store
+
+SHA256 = "ab" * 32
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    return tmp_path
+
+
+def stage(db, upload_dir, name: str):
+    source = upload_dir / name
+    source.write_bytes(b"photo")
+    return blob_store.stage_file(db, source, SHA256, ".jpg")
+
+
+def test_released_blob_is_kept_when_referenced_again(db, upload_dir):
+    blob, created = stage(db, upload_dir, "first")
+    assert created
+    blob_store.add_reference(db, blob)
+
+    orphaned = blob_store.release(db, SHA256)
+    assert orphaned == [SHA256]
+    # Uploaded again before the cleanup ran
+    blob, created = stage(db, upload_dir, "second")
+    assert not created
+    blob_store.add_reference(db, blob)
+
+    blob_store.remove_orphans(db, orphaned)
+
+    assert blob_store.blob_path(SHA256, ".jpg").exists()
+    assert db.get(Blob, SHA256, populate_existing=True).ref_count == 1
+
+
+def test_reference_to_a_file_removed_after_staging_is_refused(db, upload_dir):
+    blob, _ = stage(db, upload_dir, "first")
+    blob_store.add_reference(db, blob)
+    orphaned = blob_store.release(db, SHA256)
+
+    # stage_file sees the file, then the cleanup deletes it
+    blob, created = stage(db, upload_dir, "second")
+    assert not created
+    blob_store.remove_orphans(db, orphaned)
+    assert not blob_store.blob_path(SHA256, ".jpg").exists()
+
+    with pytest.raises(HTTPException) as refused:
+        blob_store.add_reference(db, blob)
+    assert refused.value.status_code == 409
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.chat import search_messages
+from app.core.pagination import encode_cursor
+from app.models.message import ChatGroup, Message
+from app.models.user import UserRole
+
+
+async def search_all(db, current_user, q, limit):
+    """Follow next_cursor to the end; returns the pages' message IDs"""
+    pages, cursor = [], None
+    while True:
+        page = await search_messages(
+            q=q, group_id=None, farmer_beneficiary_id=None, task_id=None,
+            cursor=cursor, limit=limit, db=db, current_user=current_user
+        )
+        pages.append([hit.message_id for hit in page.messages])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_tied_ranks_span_page_boundaries(db, make_user):
+    admin = make_user(role=UserRole.ADMIN)
+    group = ChatGroup(group_name="Installers", created_by_user_id=admin.user_id)
+    db.add(group)
+    db.flush()
+
+    # Identical content ranks identically (a real that is inexact as a double);
+    # one stronger match ranks above the ties
+    contents = ["pump pump pump delivered"] + ["pump delivered to the village"] * 5
+    for content in contents:
+        db.add(Message(group_id=group.group_id, sender_user_id=admin.user_id, content=content))
+    db.flush()
+
+    pages = await search_all(db, admin, "pump", limit=2)
+
+    found = [message_id for page in pages for message_id in page]
+    assert len(found) == len(contents)
+    assert len(set(found)) == len(found)
+    assert [len(page) for page in pages] == [2, 2, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("position", [{"id": 5}, {"rank": "high", "id": 5}, {"rank": 0.5, "id": [5]}, {"rank": 0.5, "id": True}])
+async def test_malformed_cursor_is_rejected(db, make_user, position):
+    with pytest.raises(HTTPException) as error:
+        await search_messages(
+            q="pump", group_id=None, farmer_beneficiary_id=None, task_id=None,
+            cursor=encode_cursor(position), limit=10, db=db, current_user=make_user(role=UserRole.ADMIN)
+        )
+    assert error.value.status_code == 400
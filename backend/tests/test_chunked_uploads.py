@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.uploads import complete_upload
+from app.core.config import settings
+from app.models.blob import Blob
+from app.models.inventory import Inventory, InventoryCategory
+from app.services import chunked_uploads
+
+
+async def stream(data: bytes):
+    yield data
+
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_PARTIAL_DIR", str(tmp_path))
+    return chunked_uploads.create_upload(1, "manual.pdf", 10, 4, None, "inventory_document", "1")
+
+
+def test_chunk_ranges(manifest):
+    assert chunked_uploads.index_ranges([0, 1, 2, 5, 7, 8]) == [(0, 2), (5, 5), (7, 8)]
+    assert chunked_uploads.missing_ranges(manifest, []) == [(0, 2)]
+    assert chunked_uploads.missing_ranges(manifest, [1]) == [(0, 0), (2, 2)]
+    assert chunked_uploads.missing_ranges(manifest, [0, 1, 2]) == []
+
+
+@pytest.mark.asyncio
+async def test_bad_resend_keeps_the_received_chunk(manifest):
+    upload_id = manifest["upload_id"]
+    good = b"abcd"
+    await chunked_uploads.write_chunk(manifest, 0, stream(good), hashlib.sha256(good).hexdigest())
+    assert chunked_uploads.received_chunks(upload_id) == [0]
+
+    # Fails the checksum before anything reaches the data file
+    with pytest.raises(HTTPException):
+        await chunked_uploads.write_chunk(manifest, 0, stream(b"wxyz"), hashlib.sha256(good).hexdigest())
+
+    assert chunked_uploads.received_chunks(upload_id) == [0]
+    assert chunked_uploads.data_path(upload_id).read_bytes()[:4] == good
+
+
+async def slow_stream(data: bytes):
+    # Yield between pieces so concurrent sends interleave
+    for offset in range(len(data)):
+        await asyncio.sleep(0)
+        yield data[offset:offset + 1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_of_a_chunk_never_mix(manifest):
+    upload_id = manifest["upload_id"]
+    first, second = b"aaaa", b"bbbb"
+    await asyncio.gather(
+        chunked_uploads.write_chunk(manifest, 0, slow_stream(first), hashlib.sha256(first).hexdigest()),
+        chunked_uploads.write_chunk(manifest, 0, slow_stream(second), hashlib.sha256(second).hexdigest()),
+    )
+
+    stored = chunked_uploads.data_path(upload_id).read_bytes()[:4]
+    marker = (chunked_uploads.chunks_dir(upload_id) / "0").read_text()
+    assert stored in (first, second)
+    assert marker == hashlib.sha256(stored).hexdigest()
+    assert [p.name for p in chunked_uploads.chunks_dir(upload_id).iterdir()] == ["0"]
+
+
+@pytest.mark.asyncio
+async def test_chunk_after_complete_is_rejected(manifest):
+    upload_id = manifest["upload_id"]
+    chunked_uploads.finish_upload(upload_id, 1, {"url": "/uploads/x"})
+
+    assert chunked_uploads.load_result(upload_id, 1) == {"url": "/uploads/x"}
+    with pytest.raises(HTTPException) as error:
+        await chunked_uploads.write_chunk(manifest, 0, stream(b"abcd"), hashlib.sha256(b"abcd").hexdigest())
+    assert error.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_completes_attach_once(db, make_user, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "UPLOAD_DIR", "uploads")
+    monkeypatch.setattr(settings, "UPLOAD_PARTIAL_DIR", "partial")
+    user = make_user()
+    item = Inventory(category=InventoryCategory.MOTOR, type="3hp", quantity=1)
+    db.add(item)
+    db.flush()
+    content = b"manual"
+    manifest = chunked_uploads.create_upload(
+        user.user_id, "manual.pdf", len(content), len(content), None, "inventory_document", str(item.id)
+    )
+    await chunked_uploads.write_chunk(manifest, 0, stream(content), hashlib.sha256(content).hexdigest())
+
+    first, second = await asyncio.gather(
+        complete_upload(manifest["upload_id"], db=db, current_user=user),
+        complete_upload(manifest["upload_id"], db=db, current_user=user),
+    )
+
+    assert first == second
+    assert item.document_url == first.url
+    assert db.query(Blob).one().ref_count == 1
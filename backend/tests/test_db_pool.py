@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.db_pool import Histogram, PoolMetrics, instrument_engine, instrumented_pool_class, pool_status
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """A one-connection SQLite QueuePool recording into its own metrics"""
+    metrics = PoolMetrics()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_engine(engine, metrics)
+    yield engine, metrics
+    engine.dispose()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0, 10.0))
+    for value in (0.05, 0.1, 0.5, 5.0, 50.0):
+        histogram.observe(value)
+
+    # A value equal to a bound falls in that bucket; 50.0 only in +Inf (count)
+    assert histogram.cumulative() == [2, 3, 4]
+    assert histogram.count == 5
+    assert histogram.sum == pytest.approx(55.65)
+    assert histogram.max == 50.0
+    assert histogram.snapshot()["buckets"] == {"0.1": 2, "1.0": 3, "10.0": 4}
+
+
+def test_pool_status_tracks_checked_out_connections(pool):
+    engine, metrics = pool
+    assert pool_status(engine) == {
+        "size": 1, "max_overflow": 0, "timeout": 0.05,
+        "checked_out": 0, "checked_in": 0, "overflow_in_use": 0,
+    }
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert (status["checked_out"], status["checked_in"]) == (1, 0)
+
+    status = pool_status(engine)
+    assert (status["checked_out"], status["checked_in"]) == (0, 1)
+    counters, wait, hold = metrics.read()
+    assert counters["checkouts"] == 1
+    assert counters["connections_opened"] == 1
+    assert (wait.count, hold.count) == (1, 1)
+
+
+def test_exhausted_pool_counts_the_timeout(pool):
+    engine, metrics = pool
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    counters, wait, _ = metrics.read()
+    assert counters["timeouts"] == 1
+    # Only the checkout that got a connection is timed
+    assert counters["checkouts"] == wait.count == 1
+    assert metrics.snapshot()["peak_checked_out"] == 1
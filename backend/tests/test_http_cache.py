@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.http_cache import is_fresh, is_settled, validator_headers
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_recent_changes_get_no_validators():
+    lag = timedelta(seconds=settings.SYNC_SAFETY_LAG_SECONDS)
+
+    assert is_settled(None, NOW)
+    assert is_settled(NOW - lag, NOW)
+    assert not is_settled(NOW - lag + timedelta(seconds=1), NOW)
+
+    assert validator_headers(None, NOW) == {"Cache-Control": "private, no-cache"}
+    assert set(validator_headers('"v1"', NOW)) == {"Cache-Control", "ETag", "Last-Modified"}
+
+
+def request_with(headers: dict) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_lists_validate_by_etag_only():
+    since = {"If-Modified-Since": format_datetime(NOW, usegmt=True)}
+
+    # Detail: the row's updated_at is its version
+    assert is_fresh(request_with(since), '"v1"', NOW)
+    # List: max(updated_at) survives a delete, so the date alone never validates
+    assert not is_fresh(request_with(since), '"v1"', None)
+    assert is_fresh(request_with({"If-None-Match": '"v1"'}), '"v1"', None)
+    assert "Last-Modified" not in validator_headers('"v1"', None)
@@ -0,0 +1,34 @@
+from app.core.config import settings
+from app.services.images import available_variants, serialize_photo_refs
+from app.schemas.farmer import FarmerResponse
+
+
+def test_photos_without_rendered_variants_fall_back_to_the_original(tmp_path, monkeypatch):
+    # Nothing on disk: the URLs come from rendered_photos alone
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "UPLOAD_DIR", "uploads")
+    rendered = ["/uploads/blobs/ab/ab12.jpg"]
+
+    assert available_variants("/uploads/blobs/ab/ab12.jpg", rendered) == {
+        "thumb": "/uploads/blobs/ab/ab12_thumb.webp",
+        "medium": "/uploads/blobs/ab/ab12_medium.jpg",
+    }
+    # Stored before variants were generated, or not stored here at all
+    assert available_variants("/uploads/blobs/ab/legacy.jpg", rendered) == {}
+    assert available_variants("https://example.com/photo.jpg", ["https://example.com/photo.jpg"]) == {}
+
+
+def test_response_lists_variants_without_exposing_rendered_photos(monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", "uploads")
+    farmer = FarmerResponse(
+        beneficiary_id="B1", beneficiary_name="Ram", scheme="MTS",
+        created_at="2026-01-01T00:00:00", updated_at="2026-01-01T00:00:00",
+        photos=serialize_photo_refs(["/uploads/blobs/ab/ab12.jpg", "/uploads/blobs/cd/old.jpg"]),
+        rendered_photos=serialize_photo_refs(["/uploads/blobs/ab/ab12.jpg"]),
+    )
+    data = farmer.model_dump()
+
+    assert "rendered_photos" not in data
+    assert [photo["thumb"] for photo in data["photo_variants"]] == [
+        "/uploads/blobs/ab/ab12_thumb.webp", "/uploads/blobs/cd/old.jpg"
+    ]
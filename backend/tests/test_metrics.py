@@ -0,0 +1,91 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.db_pool import Histogram
+from app.core.metrics import MetricsMiddleware, MetricsWriter, RequestMetrics, write_request_metrics
+
+
+@pytest.fixture
+def metrics():
+    return RequestMetrics()
+
+
+@pytest.fixture
+def client(metrics):
+    app = FastAPI()
+
+    @app.get("/api/farmers/{beneficiary_id}")
+    async def get_farmer(beneficiary_id: str):
+        if beneficiary_id == "missing":
+            raise HTTPException(status_code=404, detail="Farmer not found")
+        return {"beneficiary_id": beneficiary_id}
+
+    @app.get("/api/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_requests_are_grouped_by_route_template(client, metrics):
+    for beneficiary_id in ("BEN1", "BEN2", "missing"):
+        client.get(f"/api/farmers/{beneficiary_id}")
+    client.get("/api/boom")
+    client.get("/no/such/path")
+    client.get(f"/{settings.UPLOAD_DIR}/farmers/photo.jpg")
+
+    assert set(metrics.series) == {
+        ("GET", "/api/farmers/{beneficiary_id}"),
+        ("GET", "/api/boom"),
+        ("GET", "unmatched"),
+        ("GET", f"/{settings.UPLOAD_DIR}"),
+    }
+    farmers = metrics.series[("GET", "/api/farmers/{beneficiary_id}")]
+    assert farmers.responses == {200: 2, 404: 1}
+    assert farmers.latency.count == 3
+    # An exception before the response starts is recorded as 500
+    assert metrics.series[("GET", "/api/boom")].responses == {500: 1}
+    assert metrics.in_flight == 0
+
+
+def test_exposition_format():
+    writer = MetricsWriter()
+    histogram = Histogram((0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    writer.gauge("up", "Whether the worker is up", [(None, 1)])
+    writer.counter("events", "Events by name", [({"event": 'say "hi"\n'}, 3)])
+    writer.histogram("latency_seconds", "Latency", [({"route": "/x"}, histogram)])
+
+    assert writer.render() == "\n".join([
+        "# HELP moriarty_up Whether the worker is up",
+        "# TYPE moriarty_up gauge",
+        "moriarty_up 1",
+        "# HELP moriarty_events_total Events by name",
+        "# TYPE moriarty_events_total counter",
+        'moriarty_events_total{event="say \\"hi\\"\\n"} 3',
+        "# HELP moriarty_latency_seconds Latency",
+        "# TYPE moriarty_latency_seconds histogram",
+        'moriarty_latency_seconds_bucket{route="/x",le="0.1"} 1',
+        'moriarty_latency_seconds_bucket{route="/x",le="1.0"} 2',
+        'moriarty_latency_seconds_bucket{route="/x",le="+Inf"} 2',
+        'moriarty_latency_seconds_sum{route="/x"} 0.55',
+        'moriarty_latency_seconds_count{route="/x"} 2',
+    ]) + "\n"
+
+
+def test_request_metrics_exposition(client, metrics):
+    client.get("/api/farmers/BEN1")
+    client.get("/api/farmers/missing")
+
+    writer = MetricsWriter()
+    write_request_metrics(writer, metrics)
+    lines = writer.render().splitlines()
+
+    assert "moriarty_http_requests_in_flight 0" in lines
+    assert 'moriarty_http_requests_total{method="GET",route="/api/farmers/{beneficiary_id}",status="200"} 1' in lines
+    assert 'moriarty_http_requests_total{method="GET",route="/api/farmers/{beneficiary_id}",status="404"} 1' in lines
+    assert 'moriarty_http_request_duration_seconds_count{method="GET",route="/api/farmers/{beneficiary_id}"} 2' in lines
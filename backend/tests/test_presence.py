@@ -0,0 +1,49 @@
+import pytest
+
+from app.core import presence as presence_module
+from app.core.presence import PresenceRegistry, flush
+from app.models.user import User
+
+
+def test_heartbeats_batch_into_one_entry_per_user():
+    registry = PresenceRegistry()
+    registry.connect("a", 1)
+    registry.connect("b", 1)
+    for _ in range(100):
+        registry.touch_sid("a")
+    registry.touch(2)
+
+    assert registry.pending_count() == 2
+    pending = dict(registry.drain())
+    assert set(pending) == {1, 2}
+    assert pending[1] == registry.last_seen(1)
+    assert registry.pending_count() == 0
+    assert registry.online_user_ids() == (1,)
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_last_seen_at(db, make_user, monkeypatch):
+    user_id = make_user().user_id
+    monkeypatch.setattr(presence_module, "SessionLocal", lambda: db)
+    registry = PresenceRegistry()
+    registry.touch(user_id)
+
+    assert await flush(registry) == 1
+    user = db.get(User, user_id)  # write() closed the session
+    assert user.last_seen_at is not None
+    assert user.last_login is None
+    assert registry.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried(monkeypatch):
+    def broken():
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(presence_module, "SessionLocal", broken)
+    registry = PresenceRegistry()
+    registry.touch(1)
+
+    with pytest.raises(RuntimeError):
+        await flush(registry)
+    assert registry.pending_count() == 1
@@ -0,0 +1,87 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.profiler import ProfilingMiddleware, SamplingProfiler, route_pattern
+
+
+def test_route_pattern_matches_one_segment_per_parameter():
+    pattern = route_pattern("/api/uploads/{upload_id}")
+    assert pattern.fullmatch("/api/uploads/abc")
+    assert pattern.fullmatch("/api/uploads/abc/")
+    assert not pattern.fullmatch("/api/uploads/abc/chunks/1")
+    assert not pattern.fullmatch("/api/uploads")
+    # Literal parts are escaped, not regex
+    assert not route_pattern("/api/a.b").fullmatch("/api/aXb")
+
+
+def busy_request(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_request_profile_claims_matching_requests_only():
+    profiler = SamplingProfiler()
+
+    async def app(scope, receive, send):
+        busy_request(0.05)
+
+    middleware = ProfilingMiddleware(app, profiler=profiler)
+    profile = asyncio.create_task(
+        profiler.profile_requests("/api/farmers/{beneficiary_id}", count=2, timeout=10, interval=0.002)
+    )
+    while profiler.route is None:
+        await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await middleware({"type": "http", "path": "/api/tasks/1"}, None, None)
+    assert not profiler.claim("/api/tasks/1")
+    for beneficiary_id in ("BEN1", "BEN2"):
+        await middleware({"type": "http", "path": f"/api/farmers/{beneficiary_id}"}, None, None)
+    stacks = await profile
+
+    # Two matching requests finish the profile well before the timeout
+    assert time.perf_counter() - started < 5
+    assert profiler.samples > 0
+    assert any("busy_request" in stack for stack in stacks)
+    assert not profiler.running
+    assert profiler.route is None
+    # Once the profile is over nothing is claimed
+    assert not profiler.claim("/api/farmers/BEN3")
+
+
+def test_fold_drops_idle_threads_unless_asked():
+    profiler = SamplingProfiler()
+    release = threading.Event()
+
+    def waiting_job():
+        release.wait()
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        busy = executor.submit(waiting_job)
+        executor.submit(lambda: None).result()
+        time.sleep(0.05)
+        frames = sys._current_frames()
+        folded = {
+            thread.ident: profiler._fold(frames[thread.ident], include_idle=False)
+            for thread in executor._threads
+        }
+        # The worker waiting for work is idle; the one blocked inside a job is not
+        idle = [ident for ident, stack in folded.items() if stack is None]
+        working = [stack for stack in folded.values() if stack is not None]
+        assert len(idle) == 1 and len(working) == 1
+        # Idleness is judged below the threading frames, which the stack still shows
+        assert ";waiting_job (" in working[0]
+        assert "threading.py" in working[0].split(";")[-1]
+        assert "_worker" in profiler._fold(frames[idle[0]], include_idle=True)
+    finally:
+        release.set()
+        busy.result()
+        executor.shutdown()
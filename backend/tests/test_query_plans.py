@@ -0,0 +1,13 @@
+import os
+import sys
+
+from conftest import BACKEND_DIR
+
+sys.path.append(os.path.join(BACKEND_DIR, "scripts"))
+
+from check_query_plans import check_query_plans  # noqa: E402
+
+
+def test_hot_queries_use_an_index(migrated_db, capsys):
+    ok = check_query_plans()
+    assert ok, capsys.readouterr().out
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import create_engine, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.config import settings
+from app.core.query_stats import QueryStatsMiddleware, RequestQueryStats
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def make_client(engine, expose_headers: bool) -> TestClient:
+    async def farmers(request):
+        # One list query, then one lookup per row: the N+1 shape
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            for row_id in range(6):
+                connection.execute(text("SELECT :id"), {"id": row_id})
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/api/farmers", farmers)])
+    return TestClient(QueryStatsMiddleware(app, expose_headers=expose_headers))
+
+
+def test_repeated_statements_are_n_plus_one_suspects():
+    stats = RequestQueryStats()
+    for statement in ["SELECT a", "SELECT b", "SELECT b", "SELECT b"]:
+        stats.record(statement, 0.001)
+
+    assert stats.count == 4
+    assert stats.seconds == pytest.approx(0.004)
+    assert stats.repeated(3) == [("SELECT b", 3)]
+    assert stats.repeated(4) == []
+
+
+def test_request_statements_are_counted_and_logged(engine, capsys, monkeypatch):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 5)
+
+    response = make_client(engine, expose_headers=True).get("/api/farmers")
+
+    assert response.headers["X-DB-Queries"] == "7"
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="7 queries"' in response.headers["Server-Timing"]
+    output = capsys.readouterr().out
+    assert "SQL: GET /api/farmers ran 7 queries" in output
+    assert "N+1 suspect (6x): SELECT ?" in output
+
+
+def test_headers_are_only_sent_in_debug(engine):
+    response = make_client(engine, expose_headers=False).get("/api/farmers")
+
+    assert response.status_code == 200
+    assert "X-DB-Queries" not in response.headers
+    assert "Server-Timing" not in response.headers
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.core.replica import ReadRouter, get_read_db, last_write_at, read_router
+from app.models.user import User
+
+
+def test_recent_write_keeps_reads_on_the_primary():
+    router = ReadRouter(enabled=True, max_lag_seconds=5, sticky_seconds=10)
+    router.lag_seconds = 0
+    now = datetime.now(timezone.utc)
+
+    assert router.use_replica(None)
+    assert router.use_replica(now - timedelta(seconds=30))
+    assert not router.use_replica(now - timedelta(seconds=2))
+
+
+def test_reads_on_the_primary_reuse_the_request_session(db, make_user):
+    # A second primary session per read would hold two pool connections per request
+    reads = get_read_db(current_user=make_user(), primary=db)
+    assert next(reads) is db
+
+
+@pytest.fixture
+def primary(migrated_db, monkeypatch):
+    """A primary session (with the stamping listeners) for a user, rolled back after the test"""
+    monkeypatch.setattr(read_router, "enabled", True)
+    monkeypatch.setattr(read_router, "lag_seconds", 0)
+    connection = migrated_db.connect()
+    transaction = connection.begin()
+    session = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    user = User(name="Writer", phone="9000000000", email="writer@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    session.info["user_id"] = user.user_id
+    try:
+        yield session, user
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+def test_commit_that_wrote_stamps_the_writer_for_every_worker(primary):
+    session, user = primary
+
+    user.phone = "9111111111"
+    session.commit()
+
+    stamp = last_write_at(session, user.user_id)
+    assert stamp is not None
+    assert not read_router.use_replica(stamp)
+
+
+def test_commit_without_writes_leaves_no_stamp(primary):
+    session, user = primary
+
+    session.query(User).filter(User.user_id == user.user_id).first()
+    user.phone = user.phone  # No net change
+    session.commit()
+
+    assert last_write_at(session, user.user_id) is None
+
+
+def test_bulk_update_stamps_the_writer(primary):
+    session, user = primary
+
+    session.query(User).filter(User.user_id == user.user_id).update({"phone": "9222222222"})
+    session.commit()
+
+    assert last_write_at(session, user.user_id) is not None
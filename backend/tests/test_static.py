@@ -0,0 +1,50 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.core.static import UploadFiles
+
+SHA256 = "cd" * 32
+CONTENT = bytes(range(256)) * 8
+
+
+@pytest.fixture
+def client(tmp_path):
+    blob_dir = tmp_path / "blobs" / "cd"
+    blob_dir.mkdir(parents=True)
+    (blob_dir / f"{SHA256}.pdf").write_bytes(CONTENT)
+    app = Starlette(routes=[Mount("/uploads", UploadFiles(directory=str(tmp_path)))])
+    return TestClient(app)
+
+
+URL = f"/uploads/blobs/cd/{SHA256}.pdf"
+
+
+def test_revalidation_with_the_strong_etag_sends_no_body(client):
+    first = client.get(URL)
+    assert first.status_code == 200
+    assert first.headers["etag"] == f'"{SHA256}"'
+    assert "immutable" in first.headers["cache-control"]
+
+    revalidated = client.get(URL, headers={"If-None-Match": first.headers["etag"]})
+
+    assert revalidated.status_code == 304
+    assert len(revalidated.content) == 0
+    assert revalidated.headers["etag"] == first.headers["etag"]
+
+
+def test_range_request_returns_only_the_range(client):
+    response = client.get(URL, headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert response.content == CONTENT[100:200]
+
+    # A stale If-Range falls back to the whole file
+    stale = client.get(URL, headers={"Range": "bytes=100-199", "If-Range": '"other"'})
+    assert stale.status_code == 200
+    assert stale.content == CONTENT
+
+    unsatisfiable = client.get(URL, headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert unsatisfiable.status_code == 416
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.api.sync import push_changes
+from app.core.pagination import encode_cursor
+from app.models.farmer import Farmer
+from app.models.task import Task
+from app.models.tombstone import Tombstone
+from app.models.user import UserRole
+from app.schemas.sync import SyncPushRequest
+from app.services.sync import after_position, decode_sync_token, purge_tombstones
+
+
+@pytest.mark.parametrize("payload", [
+    {"d": 5},
+    {"r": ["not a timestamp", None]},
+    {"r": [20240101, None]},
+    {"r": ["2024-01-01T00:00:00", None, "extra"]},
+    {"d": ["2024-01-01T00:00:00", {"id": 1}]},
+])
+def test_malformed_token_is_rejected(payload):
+    with pytest.raises(HTTPException) as error:
+        decode_sync_token(encode_cursor(payload))
+    assert error.value.status_code == 400
+
+
+def test_list_payload_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        decode_sync_token("WzEsMl0")  # base64 of [1,2]
+    assert error.value.status_code == 400
+
+
+def test_key_of_the_wrong_type_is_rejected(db):
+    position = ["2024-01-01T00:00:00", "BEN-1"]
+    after_position(db.query(Farmer), Farmer.updated_at, Farmer.beneficiary_id, position)
+    with pytest.raises(HTTPException) as error:
+        after_position(db.query(Task), Task.updated_at, Task.task_id, position)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_push_reports_each_rows_own_updated_at(db, make_user):
+    admin = make_user(role=UserRole.ADMIN)
+    old = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for beneficiary_id in ("BEN-SAME", "BEN-EDIT"):
+        db.add(Farmer(beneficiary_id=beneficiary_id, beneficiary_name="Farmer", scheme="MTS", updated_at=old))
+    db.flush()
+
+    batch = SyncPushRequest(farmers=[
+        {"beneficiary_id": "BEN-SAME", "base_updated_at": old, "changes": {"beneficiary_name": "Farmer"}},
+        {"beneficiary_id": "BEN-EDIT", "base_updated_at": old, "changes": {"beneficiary_name": "Renamed"}},
+    ])
+    result = await push_changes(batch, db=db, current_user=admin)
+
+    applied = {row.id: row.updated_at for row in result.applied}
+    # An edit that changed nothing issued no UPDATE, so the client's next base is still the old one
+    assert applied["BEN-SAME"] == old
+    assert applied["BEN-EDIT"] == db.scalar(select(func.now()))
+
+
+def test_purge_drops_only_expired_tombstones(db):
+    now = datetime.utcnow()
+    db.add(Tombstone(entity_type="farmer", entity_id="BEN-OLD", deleted_at=now - timedelta(days=365)))
+    db.add(Tombstone(entity_type="farmer", entity_id="BEN-NEW", deleted_at=now))
+    db.flush()
+
+    assert purge_tombstones(db) == 1
+    assert [t.entity_id for t in db.query(Tombstone)] == ["BEN-NEW"]
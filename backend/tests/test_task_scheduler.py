@@ -0,0 +1,143 @@
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.query_stats import RequestQueryStats, current_query_stats
+from app.services import task_scheduler as task_scheduler_module
+from app.models.task import Task, TaskStatus
+from app.services.task_scheduler import OVERDUE, TaskDeadlineScheduler, deadline_for
+
+
+def window_row(task_id: int, due_date: date):
+    return SimpleNamespace(
+        task_id=task_id, assigned_to_user_id=1, assigned_by_user_id=2, title=f"Task {task_id}", due_date=due_date
+    )
+
+
+def test_overdue_tasks_in_the_first_window_escalate_immediately():
+    scheduler = TaskDeadlineScheduler(horizon_hours=24, reminder_lead_hours=24)
+    today = date.today()
+    scheduler.apply_window(today + timedelta(days=2), [
+        window_row(1, today - timedelta(days=3)),
+        window_row(2, today + timedelta(days=2)),
+    ])
+
+    assert [(kind, task_id) for kind, task_id, _ in scheduler.pop_due(time.time())] == [(OVERDUE, 1)]
+    assert len(scheduler) == 1
+
+
+def test_finished_tasks_leave_no_version_behind():
+    scheduler = TaskDeadlineScheduler(horizon_hours=24, reminder_lead_hours=24)
+    today = date.today()
+    scheduler.apply_window(today + timedelta(days=2), [window_row(task_id, today) for task_id in range(1, 4)])
+
+    scheduler.forget(1)  # Completed or deleted
+    scheduler.apply_window(today + timedelta(days=2), [window_row(1, today + timedelta(days=1))])
+    scheduler.forget(1)
+    fired = scheduler.pop_due(time.time() + 2 * 86400)  # Past every deadline
+
+    assert sorted((kind, task_id) for kind, task_id, _ in fired) == [(OVERDUE, 2), (OVERDUE, 3)]
+    assert scheduler._versions == {}
+
+
+def insert_open_tasks(db, user_id: int, count: int, days: int) -> None:
+    """count pending tasks with due dates spread over the next days"""
+    db.execute(text("""
+        INSERT INTO tasks (title, assigned_to_user_id, assigned_by_user_id, status, priority, due_date)
+        SELECT 'Task ' || n, :user_id, :user_id, 'PENDING', 'MEDIUM', CURRENT_DATE + (n % :days)
+        FROM generate_series(1, :count) AS n
+    """), {"user_id": user_id, "count": count, "days": days})
+
+
+async def statements_for_a_week(db, monkeypatch) -> int:
+    """SQL statements a fresh scheduler issues while a week of deadlines pass"""
+    monkeypatch.setattr(
+        task_scheduler_module, "SessionLocal",
+        lambda: Session(bind=db.connection(), join_transaction_mode="create_savepoint")
+    )
+    scheduler = TaskDeadlineScheduler(horizon_hours=24, reminder_lead_hours=24)
+    stats = RequestQueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        now = time.time()
+        for day in range(7):
+            at = now + day * 86400
+            await scheduler.load_window(scheduler.window_end_date(at))
+            scheduler.pop_due(at)
+    finally:
+        current_query_stats.reset(token)
+    assert scheduler.windows_loaded == 7
+    return stats.count
+
+
+@pytest.mark.asyncio
+async def test_database_load_does_not_grow_with_open_tasks(db, make_user, monkeypatch):
+    assignee = make_user()
+
+    insert_open_tasks(db, assignee.user_id, 100, days=30)
+    small = await statements_for_a_week(db, monkeypatch)
+
+    insert_open_tasks(db, assignee.user_id, 100_000 - 100, days=30)
+    large = await statements_for_a_week(db, monkeypatch)
+
+    assert small == large
+
+
+def use_test_db(db, monkeypatch):
+    monkeypatch.setattr(
+        task_scheduler_module, "SessionLocal",
+        lambda: Session(bind=db.connection(), join_transaction_mode="create_savepoint")
+    )
+
+
+def add_task(db, user_id: int, due_date: date, status: TaskStatus = TaskStatus.PENDING) -> Task:
+    task = Task(title="Survey", assigned_to_user_id=user_id, assigned_by_user_id=user_id, status=status, due_date=due_date)
+    db.add(task)
+    db.flush()
+    return task
+
+
+@pytest.mark.asyncio
+async def test_tasks_changed_in_another_worker_are_rechecked_before_firing(db, make_user, monkeypatch):
+    use_test_db(db, monkeypatch)
+    user = make_user()
+    today = date.today()
+    completed, rescheduled, still_open = (add_task(db, user.user_id, today) for _ in range(3))
+    scheduler = TaskDeadlineScheduler(horizon_hours=24, reminder_lead_hours=24)
+    scheduler.apply_window(today + timedelta(days=2), [
+        window_row(task.task_id, today) for task in (completed, rescheduled, still_open)
+    ])
+
+    # Written by another worker: this scheduler never saw track() for them
+    completed.status = TaskStatus.COMPLETED
+    rescheduled.due_date = today + timedelta(days=1)
+    db.flush()
+
+    fired = await scheduler.recheck(scheduler.pop_due(deadline_for(today) + 1))
+
+    assert [(kind, task_id) for kind, task_id, _ in fired] == [(OVERDUE, still_open.task_id)]
+    assert scheduler._tasks[rescheduled.task_id]["due_date"] == today + timedelta(days=1)
+    assert completed.task_id not in scheduler._tasks
+
+
+@pytest.mark.asyncio
+async def test_polling_picks_up_tasks_created_elsewhere(db, make_user, monkeypatch):
+    use_test_db(db, monkeypatch)
+    user = make_user()
+    today = date.today()
+    scheduler = TaskDeadlineScheduler(horizon_hours=24, reminder_lead_hours=24)
+    await scheduler.load_window(today + timedelta(days=2))
+    await scheduler.poll_changes()
+
+    task = add_task(db, user.user_id, today + timedelta(days=1))
+    await scheduler.poll_changes()
+    assert task.task_id in scheduler._tasks
+
+    task.status = TaskStatus.CANCELLED
+    db.flush()
+    await scheduler.poll_changes()
+    assert task.task_id not in scheduler._tasks
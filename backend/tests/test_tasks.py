@@ -0,0 +1,55 @@
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.api.tasks import get_my_queue
+from app.core.pagination import encode_cursor
+from app.models.task import Task, TaskCounter, TaskStatus
+from app.schemas.task import TaskUpdate
+from app.services.tasks import adjust_task_counters, ensure_task_counters, get_task_count, record_status_change
+
+
+def test_update_rejects_null_status():
+    with pytest.raises(ValidationError):
+        TaskUpdate(status=None)
+    assert TaskUpdate().model_dump(exclude_unset=True) == {}
+
+
+def test_ensure_task_counters_is_idempotent(db, make_user):
+    admin = make_user()
+    for status in (TaskStatus.PENDING, TaskStatus.PENDING, TaskStatus.COMPLETED):
+        db.add(Task(title="Survey", assigned_to_user_id=admin.user_id, assigned_by_user_id=admin.user_id, status=status))
+    db.query(TaskCounter).delete()
+    db.flush()
+
+    # A second worker starting up must neither fail nor double the totals
+    ensure_task_counters(db)
+    ensure_task_counters(db)
+
+    assert get_task_count(db, TaskStatus.PENDING) == 2
+    assert get_task_count(db, TaskStatus.COMPLETED) == 1
+    assert get_task_count(db, TaskStatus.CANCELLED) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("position", [{"id": 5}, {"due": "someday", "id": 5}, {"due": 20260101, "id": 5}, {"due": None, "id": "5"}])
+async def test_queue_rejects_malformed_cursor(db, make_user, position):
+    with pytest.raises(HTTPException) as error:
+        await get_my_queue(
+            status_filter=TaskStatus.PENDING, cursor=encode_cursor(position), limit=10, db=db, current_user=make_user()
+        )
+    assert error.value.status_code == 400
+
+
+def test_counters_sum_over_slots(db, make_user):
+    ensure_task_counters(db)
+    before = get_task_count(db, TaskStatus.PENDING)
+
+    # Two sessions' worth of writes land in different slots
+    db.info["task_counter_slot"] = 1
+    adjust_task_counters(db, {TaskStatus.PENDING.value: 3})
+    db.info["task_counter_slot"] = 2
+    record_status_change(db, TaskStatus.PENDING, TaskStatus.COMPLETED)
+
+    assert get_task_count(db, TaskStatus.PENDING) == before + 2
+    assert db.query(TaskCounter).filter(TaskCounter.status == TaskStatus.PENDING.value).count() >= 2
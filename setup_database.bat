@@ -17,6 +17,8 @@ if %errorlevel% neq 0 (
     )
 )
 
+echo.
+echo Make sure backend\.env has DATABASE_URL set for these credentials.
 echo.
 echo This script will create the Project Moriarty database with:
 echo - All required tables (users, farmers, inventory, tasks, messages)
@@ -54,10 +56,21 @@ set PGPASSWORD=%PGPASSWORD%
 echo Creating database and tables...
 echo.
 
-REM Run the SQL script
+REM Run the SQL script (creates the database only)
 psql -h %PGHOST% -p %PGPORT% -U %PGUSER% -d postgres -f "database_setup.sql"
+set SETUP_RESULT=%errorlevel%
+if %SETUP_RESULT% neq 0 goto done
+
+REM Create tables and indexes from the migrations, then load sample data
+REM (backend\.env must point DATABASE_URL at the new database)
+echo Running migrations and seeding sample data...
+pushd backend
+alembic upgrade head && python scripts\seed.py
+set SETUP_RESULT=%errorlevel%
+popd
 
-if %errorlevel% equ 0 (
+:done
+if %SETUP_RESULT% equ 0 (
     echo.
     echo ==========================================
     echo ✅ DATABASE SETUP COMPLETED SUCCESSFULLY!
@@ -76,9 +89,8 @@ if %errorlevel% equ 0 (
     echo 🔑 Password: installer123
     echo.
     echo Next Steps:
-    echo 1. Update your .env file with database credentials
-    echo 2. Start the FastAPI backend: python main.py
-    echo 3. Access API docs: http://localhost:8000/docs
+    echo 1. Start the FastAPI backend: python main.py
+    echo 2. Access API docs: http://localhost:8000/docs
     echo.
     echo The database includes sample inventory data with:
     echo - Motors (3HP, 5HP, 7.5HP with different pump heads)
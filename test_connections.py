@@ -105,7 +105,7 @@ def test_database_connection():
                         print_error(f"Table '{table}' missing")
                 
                 if missing_tables:
-                    print_warning("Some required tables are missing. Run database_setup.sql first.")
+                    print_warning("Some required tables are missing. Run database_setup.sql, then 'alembic upgrade head' in backend/.")
                     return False
                 
                 # Check sample data